@@ -0,0 +1,90 @@
+"""
+IVF 근사 검색 recall 벤치마크 (services.expert_ann)
+
+군집 구조가 있는 합성 어휘 임베딩으로 IVF 인덱스를 만들고, nprobe별로
+정확 검색(전체 행렬 곱) 대비 임계값 이상 매칭의 recall과 질의당 p95 지연 시간을 비교합니다.
+EXPERT_ANN_NPROBE를 정할 때 사용합니다.
+
+사용법:
+    python benchmarks/bench_expert_ann.py
+    python benchmarks/bench_expert_ann.py --items 500000 --dim 1536 --nprobes 4,8,16,32
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.expert_ann import IVFIndex  # noqa: E402
+from services.expert_index import l2_normalize  # noqa: E402
+
+
+def evaluate_recall(index: IVFIndex, queries: np.ndarray, similarity_threshold: float,
+                    nprobes: List[int]) -> List[Dict]:
+    """
+    정확 검색 대비 IVF 검색의 recall과 지연 시간을 비교합니다 (질의 하나씩 측정).
+
+    Returns:
+        [{"nprobe", "recall", "p95_ms", "exact_p95_ms"}, ...]
+    """
+    queries = l2_normalize(queries)
+    exact_hits, exact_times = [], []
+    for query in queries:
+        start = time.perf_counter()
+        sims = np.asarray(index.matrix, dtype=np.float32) @ query
+        exact_hits.append(set(np.nonzero(sims >= similarity_threshold)[0].tolist()))
+        exact_times.append(time.perf_counter() - start)
+
+    results = []
+    for nprobe in nprobes:
+        found, total, times = 0, 0, []
+        for query, expected in zip(queries, exact_hits):
+            start = time.perf_counter()
+            _, item_idx, _ = index.search(query[None, :], similarity_threshold, nprobe)
+            times.append(time.perf_counter() - start)
+            found += len(expected & set(item_idx.tolist()))
+            total += len(expected)
+        results.append({
+            "nprobe": nprobe,
+            "recall": round(found / total, 4) if total else 1.0,
+            "p95_ms": round(float(np.percentile(times, 95)) * 1000, 3),
+            "exact_p95_ms": round(float(np.percentile(exact_times, 95)) * 1000, 3),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=200000, help="어휘(고유 항목) 수")
+    parser.add_argument("--dim", type=int, default=256, help="임베딩 차원")
+    parser.add_argument("--topics", type=int, default=2000, help="합성 데이터의 주제(군집) 수")
+    parser.add_argument("--noise", type=float, default=0.64, help="주제 벡터에 더할 잡음 벡터의 노름")
+    parser.add_argument("--queries", type=int, default=200, help="평가 질의 수")
+    parser.add_argument("--threshold", type=float, default=0.5, help="유사도 임계값")
+    parser.add_argument("--nlist", type=int, default=None, help="클러스터 수 (기본값 sqrt(어휘 수))")
+    parser.add_argument("--nprobes", default="1,4,8,16,32", help="비교할 nprobe 값 (쉼표 구분)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    topics = l2_normalize(rng.standard_normal((args.topics, args.dim)).astype(np.float32))
+
+    def sample(count: int) -> np.ndarray:
+        noise = args.noise / np.sqrt(args.dim) * rng.standard_normal((count, args.dim)).astype(np.float32)
+        return l2_normalize(topics[rng.integers(0, args.topics, count)] + noise)
+
+    matrix, queries = sample(args.items), sample(args.queries)
+    start = time.perf_counter()
+    index = IVFIndex(matrix, nlist=args.nlist)
+    print(f"어휘 {args.items} × {args.dim}, nlist {index.nlist}, 인덱스 생성 {time.perf_counter() - start:.2f}s")
+    for result in evaluate_recall(index, queries, args.threshold, [int(n) for n in args.nprobes.split(",")]):
+        print(f"nprobe {result['nprobe']:>4}: recall {result['recall']:.4f}, "
+              f"p95 {result['p95_ms']:.3f}ms (정확 검색 p95 {result['exact_p95_ms']:.3f}ms)")
+
+
+if __name__ == "__main__":
+    main()
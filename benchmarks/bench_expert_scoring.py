@@ -0,0 +1,100 @@
+"""
+키워드 × 전문가 항목 스코어링 전/후 벤치마크 (services.expert_index)
+
+- 이전: 전문가마다 (키워드, 항목) 쌍별로 sklearn cosine_similarity를 호출하던 루프
+  (ExpertIndex 도입 전 ExpertMatcher.semantic_keyword_matching과 같은 계산).
+  너무 느려 --legacy-experts명만 측정한 뒤 전체 전문가 수로 환산합니다.
+- 이후: ExpertItemIndex.score (전체 항목 행렬과 한 번의 행렬 곱 + 구간 집계)
+
+같은 전문가 구간에서 매칭 개수, 상세 순서, 유사도가 같은지도 확인합니다.
+
+사용법:
+    python benchmarks/bench_expert_scoring.py
+    python benchmarks/bench_expert_scoring.py --experts 50000 --legacy-experts 100
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from sklearn.metrics.pairwise import cosine_similarity
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.expert_index import ExpertItemIndex, l2_normalize  # noqa: E402
+
+
+def legacy_score(keyword_embeddings, item_embeddings, offsets, similarity_threshold):
+    """이전 구현: 전문가별 (키워드, 항목) 쌍마다 cosine_similarity 호출"""
+    expert_scores = []
+    for expert_idx in range(len(offsets) - 1):
+        match_count, match_details = 0, []
+        for keyword_idx, keyword_emb in enumerate(keyword_embeddings):
+            for item_idx in range(offsets[expert_idx], offsets[expert_idx + 1]):
+                similarity = cosine_similarity(
+                    np.array(keyword_emb).reshape(1, -1),
+                    np.array(item_embeddings[item_idx]).reshape(1, -1)
+                )[0][0]
+                if similarity >= similarity_threshold:
+                    match_count += 1
+                    match_details.append((keyword_idx, item_idx, float(similarity)))
+        expert_scores.append((expert_idx, match_count, match_details))
+    expert_scores.sort(key=lambda score: score[1], reverse=True)
+    return expert_scores
+
+
+def matched(scores):
+    return [(expert, count, [(hit[0], hit[1]) for hit in hits]) for expert, count, hits in scores if count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--experts", type=int, default=10000, help="전문가 수")
+    parser.add_argument("--items-per-expert", type=int, default=5, help="전문가당 평균 항목 수")
+    parser.add_argument("--dim", type=int, default=1536, help="임베딩 차원")
+    parser.add_argument("--keywords", type=int, default=10, help="키워드 수")
+    parser.add_argument("--threshold", type=float, default=0.5, help="유사도 임계값")
+    parser.add_argument("--legacy-experts", type=int, default=300, help="이전 구현으로 측정할 전문가 수")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    lengths = rng.integers(0, 2 * args.items_per_expert, args.experts)
+    offsets = np.cumsum(np.r_[0, lengths])
+    num_items = int(offsets[-1])
+    topics = rng.standard_normal((200, args.dim)).astype(np.float32)
+    noise = 0.6 * rng.standard_normal((num_items, args.dim)).astype(np.float32)
+    items = l2_normalize(topics[rng.integers(0, 200, num_items)] + noise)
+    keywords = l2_normalize(
+        topics[:args.keywords] + 0.6 * rng.standard_normal((args.keywords, args.dim)).astype(np.float32)
+    ).tolist()
+    print(f"전문가 {args.experts}명, 항목 {num_items}개, 차원 {args.dim}, 키워드 {args.keywords}개")
+
+    index = ExpertItemIndex(items, offsets, np.arange(num_items))
+    index.score(keywords, args.threshold)
+    start = time.perf_counter()
+    index.score(keywords, args.threshold)
+    vectorized = time.perf_counter() - start
+
+    sample = min(args.legacy_experts, args.experts)
+    start = time.perf_counter()
+    legacy = legacy_score(keywords, items, offsets[:sample + 1], args.threshold)
+    legacy_estimate = (time.perf_counter() - start) * args.experts / sample
+
+    subset = ExpertItemIndex(items[:offsets[sample]], offsets[:sample + 1], np.arange(offsets[sample]))
+    vectorized_subset = subset.score(keywords, args.threshold)
+    identical = matched(legacy) == matched(vectorized_subset)
+    max_diff = max((
+        abs(a[2] - b[2])
+        for (_, _, legacy_hits), (_, _, new_hits) in zip(legacy, vectorized_subset)
+        for a, b in zip(legacy_hits, new_hits)
+    ), default=0.0)
+
+    print(f"이전 (쌍별 cosine_similarity, 전문가 {sample}명 측정 후 환산): {legacy_estimate:.1f}s")
+    print(f"이후 (ExpertItemIndex.score): {vectorized * 1000:.1f}ms  → x{legacy_estimate / vectorized:.0f}")
+    print(f"결과 일치 (전문가 {sample}명): {identical}, 최대 유사도 차이 {max_diff:.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+샤드 병렬 검색 벤치마크 (services.expert_shards)
+
+단일 프로세스 정확 검색(ExpertItemIndex.score)과 작업 프로세스 수별 샤드 검색의
+지연 시간(중앙값)과 결과 일치 여부를 비교합니다. 합성 어휘 행렬을 디스크에 만들어
+memory-map으로 사용하므로 실제 카탈로그와 같은 경로로 검색합니다.
+
+EXPERT_SHARD_WORKERS는 기본값 0(비활성)입니다. 배포할 호스트에서 이 스크립트를 실행해
+단일 프로세스보다 빠른 작업 프로세스 수가 있을 때만 설정하세요.
+(코어가 1개인 환경에서는 샤드 검색이 항상 느립니다)
+
+사용법:
+    python benchmarks/bench_expert_shards.py
+    python benchmarks/bench_expert_shards.py --vocab 300000 --workers 2,4,8 --repeat 5
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.expert_index import ExpertItemIndex, l2_normalize  # noqa: E402
+from services.expert_shards import ShardedSearch, shutdown_shard_pool  # noqa: E402
+
+WRITE_CHUNK_ROWS = 50000
+
+
+def build_matrix(path: Path, vocab: int, dim: int, rng: np.random.Generator) -> np.ndarray:
+    matrix = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=(vocab, dim))
+    for start in range(0, vocab, WRITE_CHUNK_ROWS):
+        rows = min(WRITE_CHUNK_ROWS, vocab - start)
+        matrix[start:start + rows] = l2_normalize(rng.standard_normal((rows, dim)).astype(np.float32))
+    matrix.flush()
+    del matrix
+    return np.load(path, mmap_mode="r")
+
+
+def timed(index: ExpertItemIndex, keywords: np.ndarray, threshold: float, repeat: int):
+    index.score(keywords, threshold)  # 작업 프로세스 기동 + 페이지 캐시 준비
+    timings, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = index.score(keywords, threshold)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+
+def same_result(a, b) -> bool:
+    return [(expert, count) for expert, count, _ in a] == [(expert, count) for expert, count, _ in b] and all(
+        x[2] == y[2] for x, y in zip(a, b)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vocab", type=int, default=300000, help="어휘(고유 항목) 수")
+    parser.add_argument("--dim", type=int, default=1536, help="임베딩 차원")
+    parser.add_argument("--experts", type=int, default=100000, help="전문가 수")
+    parser.add_argument("--items-per-expert", type=int, default=20, help="전문가당 항목 수")
+    parser.add_argument("--keywords", type=int, default=10, help="키워드 수")
+    parser.add_argument("--threshold", type=float, default=0.08, help="유사도 임계값")
+    parser.add_argument("--workers", default="1,2,4", help="비교할 작업 프로세스 수 (쉼표 구분)")
+    parser.add_argument("--repeat", type=int, default=3, help="측정 반복 횟수 (중앙값 사용)")
+    args = parser.parse_args()
+
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count()
+    workers = [int(value) for value in args.workers.split(",") if value.strip()]
+    print(f"코어 {cores}개, 어휘 {args.vocab} × {args.dim}, 전문가 {args.experts} × 항목 {args.items_per_expert}, "
+          f"키워드 {args.keywords}")
+    if max(workers) > cores:
+        print(f"주의: 작업 프로세스 수({max(workers)})가 코어 수보다 많아 확장성을 측정할 수 없습니다.")
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        matrix = build_matrix(Path(tmp) / "vocab.npy", args.vocab, args.dim, rng)
+        item_vocab = rng.integers(0, args.vocab, args.experts * args.items_per_expert)
+        offsets = np.arange(0, args.experts * args.items_per_expert + 1, args.items_per_expert)
+        index = ExpertItemIndex(matrix, offsets, item_vocab)
+        noise = 0.01 * rng.standard_normal((args.keywords, args.dim)).astype(np.float32)
+        keywords = matrix[rng.integers(0, args.vocab, args.keywords)] + noise
+
+        try:
+            base, reference = timed(index, keywords, args.threshold, args.repeat)
+            print(f"단일 프로세스: {base * 1000:.0f}ms")
+            for count in workers:
+                index.shards = ShardedSearch(matrix, count)
+                elapsed, result = timed(index, keywords, args.threshold, args.repeat)
+                print(f"샤드 작업 프로세스 {count}개: {elapsed * 1000:.0f}ms "
+                      f"(x{base / elapsed:.2f}, 결과 일치: {same_result(result, reference)})")
+                index.shards = None
+        finally:
+            shutdown_shard_pool()
+
+
+if __name__ == "__main__":
+    main()
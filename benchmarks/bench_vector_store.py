@@ -0,0 +1,99 @@
+"""
+압축 벡터 저장소 벤치마크 (services.vector_store)
+
+저장 형식(float16, int8)별로 메모리 사용량과 float32 검색 대비 결과 차이를 비교합니다.
+재채점(rescore) 여부마다 임계값 이상 매칭의 recall/precision, 최대 유사도 오차,
+상위 k 일치율, 검색 시간을 출력합니다. EXPERT_VECTOR_DTYPE/EXPERT_VECTOR_RESCORE를 정할 때 사용합니다.
+
+사용법:
+    python benchmarks/bench_vector_store.py
+    python benchmarks/bench_vector_store.py --rows 200000 --dim 1536 --threshold 0.5
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.expert_index import l2_normalize  # noqa: E402
+from services.vector_store import VectorStore  # noqa: E402
+
+
+def evaluate_deviation(matrix: np.ndarray, queries: np.ndarray, similarity_threshold: float,
+                       dtypes: List[str] = ("float16", "int8"), top_k: int = 10) -> List[Dict]:
+    """
+    압축 형식별 메모리와 float32 대비 검색 결과 차이를 비교합니다.
+
+    Returns:
+        [{"dtype", "rescore", "vector_bytes", "expected_hits", "hit_recall", "hit_precision",
+          "max_similarity_error", "top_k_overlap", "ms"}, ...]
+    """
+    queries = np.asarray(queries, dtype=np.float32)
+    reference = VectorStore(matrix, "float32")
+    ref_q, ref_r, ref_s = reference.search(queries, similarity_threshold)
+    expected = set(zip(ref_q.tolist(), ref_r.tolist()))
+    expected_sims = dict(zip(zip(ref_q.tolist(), ref_r.tolist()), ref_s.tolist()))
+    ref_rows = reference.rows(0, len(reference))
+    ref_top = [set(np.argsort(-(query @ ref_rows.T))[:top_k].tolist()) for query in queries]
+
+    results = []
+    for dtype in dtypes:
+        store = VectorStore(matrix, dtype)
+        all_rows = store.rows(0, len(store))
+        top = [set(np.argsort(-(query @ all_rows.T))[:top_k].tolist()) for query in queries]
+        for rescore in (False, True):
+            start = time.perf_counter()
+            q, r, s = store.search(queries, similarity_threshold, rescore=rescore)
+            elapsed = time.perf_counter() - start
+            found = set(zip(q.tolist(), r.tolist()))
+            errors = [abs(sim - expected_sims[pair]) for pair, sim in zip(zip(q.tolist(), r.tolist()), s.tolist())
+                      if pair in expected_sims]
+            results.append({
+                "dtype": dtype,
+                "rescore": rescore,
+                "vector_bytes": store.memory_footprint()["vector_bytes"],
+                "expected_hits": len(expected),
+                "hit_recall": round(len(found & expected) / len(expected), 4) if expected else 1.0,
+                "hit_precision": round(len(found & expected) / len(found), 4) if found else 1.0,
+                "max_similarity_error": round(max(errors, default=0.0), 6),
+                "top_k_overlap": round(float(np.mean([len(a & b) / top_k for a, b in zip(ref_top, top)])), 4),
+                "ms": round(elapsed * 1000, 3),
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000, help="어휘(행) 수")
+    parser.add_argument("--dim", type=int, default=1536, help="임베딩 차원")
+    parser.add_argument("--topics", type=int, default=1000, help="합성 데이터의 주제(군집) 수")
+    parser.add_argument("--noise", type=float, default=0.7, help="주제 벡터에 더할 잡음 벡터의 노름")
+    parser.add_argument("--queries", type=int, default=10, help="질의 수 (매칭 요청의 키워드 수)")
+    parser.add_argument("--threshold", type=float, default=0.5, help="유사도 임계값")
+    parser.add_argument("--top-k", type=int, default=10, help="상위 순위 일치율을 계산할 개수")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    topics = l2_normalize(rng.standard_normal((args.topics, args.dim)).astype(np.float32))
+
+    def sample(count: int) -> np.ndarray:
+        noise = args.noise / np.sqrt(args.dim) * rng.standard_normal((count, args.dim)).astype(np.float32)
+        return l2_normalize(topics[rng.integers(0, args.topics, count)] + noise)
+
+    matrix, queries = sample(args.rows), sample(args.queries)
+    float32_mb = matrix.nbytes / 2 ** 20
+    print(f"어휘 {args.rows} × {args.dim} (float32 {float32_mb:.1f}MB), 질의 {args.queries}개, 임계값 {args.threshold}")
+    for result in evaluate_deviation(matrix, queries, args.threshold, top_k=args.top_k):
+        print(f"{result['dtype']:>7} rescore={str(result['rescore']):<5} "
+              f"벡터 {result['vector_bytes'] / 2 ** 20:.1f}MB, float32 매칭 {result['expected_hits']}건, recall {result['hit_recall']:.4f}, "
+              f"precision {result['hit_precision']:.4f}, 최대 오차 {result['max_similarity_error']:.6f}, "
+              f"상위 {args.top_k} 일치 {result['top_k_overlap']:.4f}, {result['ms']:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+진단 API 부하 테스트 (POST /api/diagnosis/)
+
+진단 N건을 동시에 보내면서 /health를 주기적으로 호출하여
+진단 전체 소요 시간과 /health 응답 지연(예정 시각부터 응답까지)을 측정합니다.
+
+- 기본: 앱을 프로세스 안에서 실행(httpx ASGITransport)하고 모델 호출과 Supabase insert를
+  지연(--model-delay, --insert-delay)만 있는 가짜 클라이언트로 대체합니다.
+  --blocking을 주면 모델 호출이 이벤트 루프를 막는 경우(동기 클라이언트를 async 엔드포인트에서
+  호출하던 이전 구현)를 흉내 내어 비교할 수 있습니다.
+- --url: 실행 중인 서버에 실제로 요청합니다 (실제 모델 호출, 비용 발생에 주의).
+
+사용법:
+    python benchmarks/load_test_diagnosis.py
+    python benchmarks/load_test_diagnosis.py --blocking
+    python benchmarks/load_test_diagnosis.py --url http://localhost:8000 --concurrency 5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("OPENAI_API_KEY", "load-test")
+
+
+class StubResponses:
+    """평가 기준의 모든 항목에 75점을 매기는 가짜 Responses API"""
+
+    def __init__(self, delay: float, blocking: bool):
+        self.delay = delay
+        self.blocking = blocking
+
+    async def create(self, model, input):
+        criteria = json.loads(input[input.index("["):input.index("\n\n제공된")])
+        if self.blocking:
+            time.sleep(self.delay)
+        else:
+            await asyncio.sleep(self.delay)
+        categories = [
+            {"id": category["id"], "name": category["name"],
+             "items": [{"id": item["id"], "title": item["title"], "score": 75} for item in category["items"]]}
+            for category in criteria
+        ]
+        return type("Response", (), {"output_text": json.dumps({"categories": categories}, ensure_ascii=False)})()
+
+
+class StubSupabase:
+    """insert마다 delay초 걸리는 가짜 Supabase (동기, 스레드에서 호출됨)"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.payload = None
+
+    def table(self, name):
+        return self
+
+    def insert(self, payload):
+        self.payload = payload
+        return self
+
+    def execute(self):
+        time.sleep(self.delay)
+        return type("Response", (), {"data": self.payload if isinstance(self.payload, list) else [self.payload]})()
+
+
+def in_process_app(args):
+    from main import app
+    from services import cache, diagnosis
+
+    client = type("Client", (), {"responses": StubResponses(args.model_delay, args.blocking)})()
+    supabase = StubSupabase(args.insert_delay)
+    cache.get_redis_client = lambda: None
+    diagnosis.get_openai_client = lambda: client
+    diagnosis.get_supabase_client = lambda: supabase
+    diagnosis.DIAGNOSIS_WRITE_BEHIND = False  # insert 완료까지 응답에 포함하여 측정
+    return app
+
+
+async def run(args):
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+    else:
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=in_process_app(args)), base_url="http://load-test", timeout=args.timeout
+        )
+
+    async with client:
+        start = time.perf_counter()
+        done = asyncio.Event()
+
+        async def diagnose(i: int):
+            request_start = time.perf_counter()
+            response = await client.post("/api/diagnosis/", json={
+                "input": [{"contents": f"부하 테스트 사업계획서 {i}: AI 기반 헬스케어 플랫폼"}], "use_cache": False
+            })
+            body = response.json() if response.status_code == 200 else {}
+            return time.perf_counter() - request_start, bool(body.get("success"))
+
+        async def diagnose_all():
+            try:
+                return await asyncio.gather(*[diagnose(i) for i in range(args.concurrency)])
+            finally:
+                done.set()
+
+        async def poll_health():
+            # 예정 시각 기준으로 측정 (이벤트 루프가 막히면 요청을 보내는 것 자체가 늦어짐)
+            latencies = []
+            scheduled = time.perf_counter()
+            while not done.is_set():
+                await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+                await client.get("/health")
+                latencies.append(time.perf_counter() - scheduled)
+                scheduled = max(scheduled + args.health_interval, time.perf_counter())
+            return latencies
+
+        results, health = await asyncio.gather(diagnose_all(), poll_health())
+        total = time.perf_counter() - start
+
+    durations = sorted(duration for duration, _ in results)
+    print(f"진단 {args.concurrency}건 동시 요청: 전체 {total:.2f}s, 성공 {sum(ok for _, ok in results)}/{len(results)}, "
+          f"요청 p50 {statistics.median(durations):.2f}s / 최대 {durations[-1]:.2f}s")
+    if health:
+        print(f"/health {len(health)}회: p50 {statistics.median(health) * 1000:.1f}ms, 최대 {max(health) * 1000:.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="실행 중인 서버 주소 (지정하지 않으면 가짜 클라이언트로 프로세스 내 실행)")
+    parser.add_argument("--concurrency", type=int, default=20, help="동시 진단 요청 수")
+    parser.add_argument("--model-delay", type=float, default=2.0, help="가짜 모델 호출 지연(초)")
+    parser.add_argument("--insert-delay", type=float, default=0.2, help="가짜 Supabase insert 지연(초)")
+    parser.add_argument("--blocking", action="store_true", help="모델 호출이 이벤트 루프를 막는 경우를 흉내")
+    parser.add_argument("--health-interval", type=float, default=0.1, help="/health 호출 간격(초)")
+    parser.add_argument("--timeout", type=float, default=600, help="요청 타임아웃(초)")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -21,7 +21,7 @@ celery_app = Celery(
     "report_tasks",
     broker=REDIS_URL,
     backend=REDIS_URL,
-    include=["tasks.report_tasks"]
+    include=["tasks.report_tasks", "tasks.diagnosis_tasks"]
 )
 
 # Celery 설정
@@ -59,4 +59,5 @@ celery_app.conf.update(
 celery_app.conf.task_routes = {
     "tasks.report_tasks.generate_report_task": {"queue": "report_generation"},
     "tasks.report_tasks.embed_report_task": {"queue": "report_embedding"},
+    "tasks.diagnosis_tasks.bulk_diagnosis_task": {"queue": "diagnosis_bulk"},
 }
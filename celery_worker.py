@@ -2,7 +2,7 @@
 Celery 워커 실행 파일
 
 사용법:
-    celery -A celery_worker worker --loglevel=info --concurrency=2 -Q report_generation,report_embedding
+    celery -A celery_worker worker --loglevel=info --concurrency=2 -Q report_generation,report_embedding,diagnosis_bulk
 """
 
 from celery_config import celery_app
@@ -1,5 +1,6 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 import os
 
 # 라우터 import
@@ -53,6 +54,27 @@ app.include_router(reports.router)
 app.include_router(jobs.router)
 
 
+@app.on_event("startup")
+async def start_expert_catalog_warm_up():
+    """전문가 카탈로그 로드(스냅샷 → Supabase 재검증) 및 백그라운드 갱신을 시작합니다."""
+    from services.expert import matcher
+    from services.diagnosis import diagnosis_writer
+    matcher.start_warm_up()
+    # 이전 실행에서 스풀된 진단 결과 재전송
+    diagnosis_writer.start()
+
+
+@app.on_event("shutdown")
+async def stop_expert_catalog_refresher():
+    """전문가 카탈로그 백그라운드 갱신과 샤드 검색 프로세스를 중지하고, 진단 저장 큐를 비웁니다."""
+    from services.expert import matcher
+    from services.expert_shards import shutdown_shard_pool
+    from services.diagnosis import diagnosis_writer
+    matcher.stop_refresher()
+    shutdown_shard_pool()
+    diagnosis_writer.stop()
+
+
 @app.get("/", tags=["Root"])
 async def root():
     """
@@ -67,6 +89,9 @@ async def root():
                 "prefix": "/api/diagnosis",
                 "endpoints": [
                     "POST /api/diagnosis/ - 사업계획서 진단 및 평가",
+                    "POST /api/diagnosis/stream - 카테고리별 진단 결과 스트리밍 (SSE)",
+                    "POST /api/diagnosis/report/{report_uuid} - 저장된 보고서 소목차 단위 증분 진단",
+                    "POST /api/diagnosis/bulk - 여러 보고서 대량 진단 (비동기)",
                     "GET /api/diagnosis/criteria - 기본 평가 기준 조회"
                 ]
             },
@@ -74,7 +99,12 @@ async def root():
                 "prefix": "/api/expert",
                 "endpoints": [
                     "POST /api/expert/match - 전문가 매칭",
+                    "POST /api/expert/match/rerank - 저장된 매칭 결과를 새 임계값으로 재랭킹",
+                    "GET /api/expert/match/{details_id}/details - 매칭 결과의 전체 매칭 상세 조회",
+                    "POST /api/expert/match/batch - 여러 보고서 일괄 전문가 매칭",
+                    "POST /api/expert/keywords/compare - 로컬/LLM 키워드 일치율 비교",
                     "GET /api/expert/list - 전체 전문가 목록 조회",
+                    "GET /api/expert/{expert_id}/related - 비슷한 전문가 조회",
                     "GET /api/expert/{expert_name} - 특정 전문가 정보 조회"
                 ]
             },
@@ -103,18 +133,39 @@ async def health_check():
     시스템 상태 및 설정 확인을 위한 엔드포인트입니다.
     """
     from services.expert import matcher
+    from services.diagnosis import diagnosis_writer
     
     openai_key_exists = bool(os.getenv("OPENAI_API_KEY"))
     supabase_configured = bool(os.getenv("SUPABASE_URL")) and bool(os.getenv("SUPABASE_KEY"))
     
     return {
         "status": "healthy",
+        "ready": matcher.is_ready,
         "openai_api_key_configured": openai_key_exists,
         "supabase_configured": supabase_configured,
-        "total_experts": len(matcher.experts)
+        "total_experts": len(matcher.experts),
+        "expert_catalog_version": matcher.catalog.version if matcher.catalog else None,
+        "expert_catalog_refreshed_at": matcher.last_refreshed_at,
+        "expert_vector_store": matcher.catalog.index.store.memory_footprint() if matcher.catalog else None,
+        "diagnosis_write_queue": diagnosis_writer.stats()
     }
 
 
+@app.get("/health/ready", tags=["System"])
+async def readiness_check():
+    """
+    준비 상태 확인 엔드포인트
+    
+    전문가 카탈로그 로드가 끝나기 전에는 503을 반환합니다.
+    로드 밸런서의 헬스 체크 경로로 사용하면 준비된 인스턴스로만 트래픽이 전달됩니다.
+    """
+    from services.expert import matcher
+    
+    if not matcher.is_ready:
+        return JSONResponse(status_code=503, content={"ready": False})
+    return {"ready": True}
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -4,11 +4,22 @@
 사업보고서 기반 전문가 매칭 및 전문가 정보 조회 기능을 제공합니다.
 """
 
-from fastapi import APIRouter
+from typing import List, Optional
+
+from fastapi import APIRouter, Header, Query
 from services.expert import (
     ExpertMatchRequest,
     ExpertMatchResponse,
+    ExpertBatchMatchRequest,
+    ExpertBatchMatchResponse,
+    ExpertRerankRequest,
+    ExpertKeywordCompareRequest,
     match_experts,
+    rerank_match_result,
+    get_match_details,
+    get_related_experts,
+    match_experts_batch,
+    compare_keyword_modes,
     get_all_experts,
     get_expert_by_name
 )
@@ -27,7 +38,7 @@ async def match_experts_endpoint(request: ExpertMatchRequest):
     사업보고서를 기반으로 전문가 매칭 수행
     
     **주요 기능:**
-    - 사업보고서 내용에서 키워드 추출
+    - 사업보고서 내용에서 키워드 추출 (`keyword_mode: "local"`이면 LLM 없이 로컬 TF-IDF 추출)
     - 전문가 경력 및 분야와 유사도 매칭
     - 유사도 임계값 기반 필터링
     - 매칭 점수 기준 정렬
@@ -51,17 +62,155 @@ async def match_experts_endpoint(request: ExpertMatchRequest):
     return await match_experts(request)
 
 
+@router.post("/match/rerank", response_model=ExpertMatchResponse)
+async def rerank_match_result_endpoint(request: ExpertRerankRequest):
+    """
+    저장된 매칭 결과를 새 유사도 임계값으로 다시 랭킹
+    
+    `similarity_floor`를 지정한 `/match` 응답의 `result_id`로 호출하면
+    키워드 추출과 유사도 계산 없이 저장된 유사도만으로 순위를 다시 매깁니다.
+    (임계값 슬라이더 조작 등에 사용)
+    
+    **사용 예시:**
+    ```json
+    {
+        "result_id": "3f2c...",
+        "similarity_threshold": 0.65,
+        "top_k": 10
+    }
+    ```
+    
+    Args:
+        request: 임계값 재조정 요청 데이터
+        
+    Returns:
+        매칭 결과 (404: 결과 만료, 409: 하한 미만 임계값 또는 카탈로그 갱신)
+    """
+    return await rerank_match_result(request)
+
+
+@router.get("/match/{details_id}/details")
+async def get_match_details_endpoint(
+    details_id: str,
+    rank: Optional[int] = Query(None, ge=1, description="지정하면 해당 순위 전문가의 상세만 반환")
+):
+    """
+    매칭 결과의 전체 매칭 상세 조회
+    
+    `max_details_per_expert`로 상세 개수를 제한한 매칭(또는 재랭킹) 응답의 `details_id`로
+    생략된 상세까지 포함한 전체 (키워드, 항목, 유사도) 목록을 조회합니다.
+    `/match` 응답의 `details_id`는 `result_id`와 같고, `/match/rerank` 응답은 임계값마다 새 `details_id`를 받습니다.
+    
+    Args:
+        details_id: 매칭 응답의 details_id
+        rank: 전문가 순위 (선택)
+        
+    Returns:
+        전문가별 전체 매칭 상세
+        
+    Raises:
+        HTTPException 404: 결과가 없거나 만료된 경우
+    """
+    return await get_match_details(details_id, rank)
+
+
+@router.post("/match/batch", response_model=ExpertBatchMatchResponse)
+async def match_experts_batch_endpoint(request: ExpertBatchMatchRequest):
+    """
+    여러 사업보고서에 대해 전문가 매칭을 한 번에 수행
+    
+    **주요 기능:**
+    - 보고서별 키워드 동시 추출
+    - 전체 키워드 합집합을 한 번에 임베딩
+    - 모든 보고서를 한 번의 행렬 곱으로 스코어링
+    - `stream: true`면 완료되는 순서대로 NDJSON(한 줄에 보고서 하나) 스트리밍
+    
+    **사용 예시:**
+    ```json
+    {
+        "reports": [
+            {"report_id": "r-1", "business_report": "AI 기반 헬스케어 솔루션..."},
+            {"report_id": "r-2", "business_report": "스마트팜 자동화 플랫폼..."}
+        ],
+        "num_keywords": 10,
+        "top_k": 10,
+        "similarity_threshold": 0.5
+    }
+    ```
+    
+    Args:
+        request: 배치 전문가 매칭 요청 데이터
+        
+    Returns:
+        보고서별 매칭 결과 (입력 순서 유지, 실패한 보고서는 success=false)
+    """
+    return await match_experts_batch(request)
+
+
+@router.post("/keywords/compare")
+async def compare_keyword_modes_endpoint(request: ExpertKeywordCompareRequest):
+    """
+    로컬 키워드 추출(keyword_mode="local")과 LLM 키워드 추출 결과 비교
+    
+    **반환 지표 (보고서별 및 평균):**
+    - precision / recall / f1: LLM 키워드 대비 일치율 (공백·대소문자 무시, 포함 관계도 일치로 봄)
+    - local_ms: 로컬 추출 시간 (ms)
+    
+    Args:
+        request: 비교할 사업보고서 목록과 키워드 개수
+        
+    Returns:
+        보고서별 로컬/LLM 키워드와 일치율, 평균 지표, 코퍼스 통계
+    """
+    return await compare_keyword_modes(request)
+
+
 @router.get("/list")
-async def get_experts_list():
+async def get_experts_list(
+    page: int = Query(1, ge=1, description="페이지 번호 (1부터 시작)"),
+    page_size: Optional[int] = Query(None, ge=1, le=1000, description="페이지 크기 (미지정 시 전체)"),
+    field: Optional[List[str]] = Query(None, description="분야 필터 (반복 지정 시 모두 만족)"),
+    career: Optional[List[str]] = Query(None, description="경력 필터 (반복 지정 시 모두 만족)"),
+    if_none_match: Optional[str] = Header(None)
+):
     """
     전체 전문가 목록 조회
     
-    시스템에 등록된 모든 전문가의 정보를 반환합니다.
+    시스템에 등록된 전문가의 정보를 반환합니다.
+    
+    **주요 기능:**
+    - `page`, `page_size`로 페이지 단위 조회
+    - `field`, `career`로 분야/경력 용어 필터 (예: `?field=AI&field=헬스케어`)
+    - 응답의 `ETag`를 `If-None-Match`로 보내면 카탈로그가 바뀌지 않은 경우 304 반환
     
     Returns:
-        전문가 목록 및 총 인원수
+        전문가 목록 및 (필터 적용 후) 총 인원수
+    """
+    return await get_all_experts(page, page_size, field, career, if_none_match)
+
+
+@router.get("/{expert_id}/related")
+async def get_related_experts_endpoint(
+    expert_id: str,
+    limit: int = Query(10, ge=1, le=100, description="반환할 최대 인원 (EXPERT_RELATED_TOP_K 이하)")
+):
+    """
+    비슷한 전문가 조회
+    
+    카탈로그 갱신 시 미리 계산해 둔 전문가 간 유사도 목록에서 바로 반환합니다.
+    (경력/분야 항목 임베딩 평균의 코사인 유사도 기준, 패널 구성 등에 사용)
+    
+    Args:
+        expert_id: 전문가 id
+        limit: 반환할 최대 인원
+        
+    Returns:
+        전문가 정보와 유사도 순 비슷한 전문가 목록
+        
+    Raises:
+        HTTPException 404: 전문가를 찾을 수 없는 경우
     """
-    return await get_all_experts()
+    return await get_related_experts(expert_id, limit)
 
 
 @router.get("/{expert_name}")
@@ -178,7 +178,7 @@ async def list_jobs():
             redis_client = redis.from_url(redis_url)
             
             # 각 큐에서 대기 중인 작업 조회
-            for queue_name in ["celery", "report_generation", "report_embedding"]:
+            for queue_name in ["celery", "report_generation", "report_embedding", "diagnosis_bulk"]:
                 queue_length = redis_client.llen(queue_name)
                 if queue_length > 0:
                     # 큐의 모든 작업 가져오기
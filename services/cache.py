@@ -0,0 +1,288 @@
+"""
+공용 캐시 유틸리티
+
+- TieredCache: 프로세스 내 LRU 캐시와 Redis 캐시(TTL)를 계층으로 묶은 JSON 값 캐시
+- EmbeddingCache: 문자열 → 임베딩 벡터 캐시 (Redis에 float16 바이트로 저장하여 레플리카 간 공유)
+
+Redis를 사용할 수 없으면 프로세스 내 캐시만으로 동작합니다.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import redis
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Redis URL 설정 (celery_config.py와 동일한 규칙)
+REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
+REDIS_PORT = os.getenv("REDIS_PORT", "6379")
+REDIS_URL = os.getenv("REDIS_URL", f"redis://{REDIS_HOST}:{REDIS_PORT}/0")
+
+# Redis 장애 시 재시도를 건너뛸 시간(초)
+REDIS_RETRY_INTERVAL = 30
+
+_redis_client: Optional[redis.Redis] = None
+_redis_lock = threading.Lock()
+_redis_unavailable_until = 0.0
+
+
+def get_redis_client() -> Optional[redis.Redis]:
+    """
+    캐시용 Redis 클라이언트를 반환합니다.
+
+    Returns:
+        Redis 클라이언트 인스턴스 또는 None (연결 실패 또는 장애 대기 중)
+    """
+    global _redis_client
+    if time.monotonic() < _redis_unavailable_until:
+        return None
+    if _redis_client is not None:
+        return _redis_client
+    with _redis_lock:
+        if _redis_client is None:
+            try:
+                # 캐시 장애가 요청 지연으로 번지지 않도록 짧은 타임아웃 사용
+                _redis_client = redis.from_url(REDIS_URL, socket_timeout=0.5, socket_connect_timeout=0.5)
+            except Exception as e:
+                print(f"Redis 클라이언트 초기화 실패: {str(e)}")
+                return None
+    return _redis_client
+
+
+def mark_redis_unavailable(error: Exception):
+    """Redis 오류 발생 시 일정 시간 동안 Redis 접근을 건너뜁니다."""
+    global _redis_unavailable_until
+    _redis_unavailable_until = time.monotonic() + REDIS_RETRY_INTERVAL
+    print(f"Redis 사용 불가 ({REDIS_RETRY_INTERVAL}초 후 재시도): {str(error)}")
+
+
+def make_cache_key(*parts: Any) -> str:
+    """여러 값을 묶어 SHA-256 캐시 키를 만듭니다."""
+    content = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class TieredCache:
+    """프로세스 내 LRU + Redis(TTL) 2계층 캐시 (값은 JSON 직렬화 가능해야 함)"""
+
+    def __init__(self, namespace: str, maxsize: int = 1024, ttl: int = 86400):
+        """
+        Args:
+            namespace: Redis 키 접두사
+            maxsize: 프로세스 내 LRU 최대 항목 수
+            ttl: Redis 항목 만료 시간(초)
+        """
+        self.namespace = namespace
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._local: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _set_local(self, key: str, value: Any):
+        with self._lock:
+            self._local[key] = value
+            self._local.move_to_end(key)
+            while len(self._local) > self.maxsize:
+                self._local.popitem(last=False)
+
+    def lookup(self, key: str) -> tuple:
+        """
+        캐시를 조회합니다.
+
+        Returns:
+            (값 또는 None, "local_hit" | "redis_hit" | "miss")
+        """
+        with self._lock:
+            if key in self._local:
+                self._local.move_to_end(key)
+                self.local_hits += 1
+                return self._local[key], "local_hit"
+
+        client = get_redis_client()
+        if client is not None:
+            try:
+                raw = client.get(self._redis_key(key))
+                if raw is not None:
+                    value = json.loads(raw)
+                    self._set_local(key, value)
+                    with self._lock:
+                        self.redis_hits += 1
+                    return value, "redis_hit"
+            except Exception as e:
+                mark_redis_unavailable(e)
+
+        with self._lock:
+            self.misses += 1
+        return None, "miss"
+
+    def get(self, key: str) -> Optional[Any]:
+        """캐시 값을 반환합니다 (없으면 None)."""
+        return self.lookup(key)[0]
+
+    def set(self, key: str, value: Any):
+        """프로세스 내 캐시와 Redis에 값을 저장합니다."""
+        self._set_local(key, value)
+        client = get_redis_client()
+        if client is not None:
+            try:
+                client.set(self._redis_key(key), json.dumps(value, ensure_ascii=False), ex=self.ttl)
+            except Exception as e:
+                mark_redis_unavailable(e)
+
+    def stats(self) -> Dict[str, Any]:
+        """누적 적중/미스 통계"""
+        with self._lock:
+            hits = self.local_hits + self.redis_hits
+            total = hits + self.misses
+            return {
+                "local_hits": self.local_hits,
+                "redis_hits": self.redis_hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / total, 4) if total else 0.0,
+                "size": len(self._local),
+            }
+
+
+class EmbeddingCache:
+    """
+    문자열 → 임베딩 벡터 캐시
+
+    벡터는 float16 바이트로 Redis에 저장되어 모든 API 레플리카가 공유합니다.
+    레플리카 간 결과가 같도록 프로세스 내 캐시에도 float16으로 반올림한 값을 보관하며,
+    캐시 미스 문자열만 모아 임베딩 API를 한 번만 호출합니다.
+    """
+
+    def __init__(self, embeddings, model: str, namespace: str = "embedding",
+                 maxsize: int = 4096, ttl: int = 2592000):
+        """
+        Args:
+            embeddings: embed_documents()를 제공하는 임베딩 객체 (예: OpenAIEmbeddings)
+            model: 임베딩 모델명 (캐시 키에 포함)
+            namespace: Redis 키 접두사
+            maxsize: 프로세스 내 LRU 최대 항목 수
+            ttl: Redis 항목 만료 시간(초)
+        """
+        self.embeddings = embeddings
+        self.prefix = f"{namespace}:{model}"
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._local: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    def _redis_key(self, text: str) -> str:
+        return f"{self.prefix}:{hashlib.sha1(text.encode('utf-8')).hexdigest()}"
+
+    def _set_local(self, text: str, vector: np.ndarray):
+        with self._lock:
+            self._local[text] = vector
+            self._local.move_to_end(text)
+            while len(self._local) > self.maxsize:
+                self._local.popitem(last=False)
+
+    def _lookup(self, texts: List[str]) -> Tuple[Dict[str, np.ndarray], List[str]]:
+        """프로세스 내 캐시 → Redis 순으로 조회하여 (찾은 벡터, 미스 문자열)을 반환합니다."""
+        vectors: Dict[str, np.ndarray] = {}
+        with self._lock:
+            for text in texts:
+                if text in self._local and text not in vectors:
+                    self._local.move_to_end(text)
+                    vectors[text] = self._local[text]
+                    self.local_hits += 1
+
+        pending = [text for text in dict.fromkeys(texts) if text not in vectors]
+
+        # Redis에서 한 번에 조회
+        client = get_redis_client() if pending else None
+        if client is not None:
+            try:
+                raws = client.mget([self._redis_key(text) for text in pending])
+                for text, raw in zip(pending, raws):
+                    if raw is not None:
+                        vector = np.frombuffer(raw, dtype=np.float16).astype(np.float32)
+                        vectors[text] = vector
+                        self._set_local(text, vector)
+                with self._lock:
+                    self.redis_hits += sum(raw is not None for raw in raws)
+            except Exception as e:
+                mark_redis_unavailable(e)
+
+        missing = [text for text in pending if text not in vectors]
+        with self._lock:
+            self.misses += len(missing)
+        return vectors, missing
+
+    def _store(self, vectors: Dict[str, np.ndarray], missing: List[str], embedded: List[List[float]]):
+        """새로 임베딩한 벡터를 float16으로 반올림하여 프로세스 내 캐시와 Redis에 저장합니다."""
+        embedded = np.asarray(embedded, dtype=np.float16)
+        for text, vector in zip(missing, embedded):
+            vectors[text] = vector.astype(np.float32)
+            self._set_local(text, vectors[text])
+
+        client = get_redis_client()
+        if client is not None:
+            try:
+                pipe = client.pipeline(transaction=False)
+                for text, vector in zip(missing, embedded):
+                    pipe.set(self._redis_key(text), vector.tobytes(), ex=self.ttl)
+                pipe.execute()
+            except Exception as e:
+                mark_redis_unavailable(e)
+
+    @staticmethod
+    def _stack(texts: List[str], vectors: Dict[str, np.ndarray]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.stack([vectors[text] for text in texts])
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        문자열 리스트의 임베딩을 반환합니다.
+
+        캐시 미스 문자열만 모아 임베딩 API를 한 번 호출합니다.
+
+        Returns:
+            (문자열 수, 차원) float32 행렬 (입력 순서 유지)
+        """
+        vectors, missing = self._lookup(texts)
+        if missing:
+            self._store(vectors, missing, self.embeddings.embed_documents(missing))
+        return self._stack(texts, vectors)
+
+    async def aembed(self, texts: List[str]) -> np.ndarray:
+        """embed()의 비동기 버전 (Redis 입출력은 스레드에서, 임베딩 API는 비동기 클라이언트로 호출)"""
+        vectors, missing = await asyncio.to_thread(self._lookup, texts)
+        if missing:
+            embedded = await self.embeddings.aembed_documents(missing)
+            await asyncio.to_thread(self._store, vectors, missing, embedded)
+        return self._stack(texts, vectors)
+
+    def stats(self) -> Dict[str, Any]:
+        """누적 적중/미스 통계 (문자열 단위)"""
+        with self._lock:
+            hits = self.local_hits + self.redis_hits
+            total = hits + self.misses
+            return {
+                "local_hits": self.local_hits,
+                "redis_hits": self.redis_hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / total, 4) if total else 0.0,
+                "size": len(self._local),
+            }
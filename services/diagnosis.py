@@ -1,49 +1,133 @@
-from fastapi import HTTPException
-from pydantic import BaseModel, Field
-from typing import List, Optional
+"""
+사업계획서 진단(Diagnosis) 서비스
+
+평가 기준별 GPT-5 점수 산출과 진단 결과 저장을 담당합니다.
+
+GPT-5 추론은 수십 초가 걸리므로 비동기 OpenAI 클라이언트로 호출하고,
+동기 Supabase 저장은 스레드에서 실행하여 이벤트 루프를 막지 않습니다.
+(진단 중에도 같은 워커가 다른 진단과 요청을 동시에 처리)
+
+mode="per_category"이면 평가 카테고리마다 별도 요청을 동시에 보내고(fan-out)
+결과를 하나의 응답으로 합칩니다. 실패한 카테고리는 그 카테고리만 다시 요청합니다.
+
+stream_diagnosis()는 카테고리별 결과를 완료되는 순서대로 Server-Sent Events로 보냅니다.
+
+같은 콘텐츠 + 같은 평가 기준의 진단 결과는 캐시(프로세스 내 LRU + Redis TTL,
+선택적으로 diagnosis 테이블)에서 바로 반환하여 GPT-5 호출을 반복하지 않습니다.
+
+진단 결과 저장은 write-behind 큐(services.write_behind)로 넘기고 점수를 바로 반환합니다.
+DB 장애 시에는 로컬 스풀 파일에 기록했다가 복구되면 다시 저장합니다.
+"""
+
+import asyncio
 import json
-from openai import OpenAI
 import os
-
+import threading
+import time
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from fastapi.responses import StreamingResponse
+from openai import AsyncOpenAI
+from pydantic import BaseModel, Field, ValidationError
+from supabase import create_client, Client
+
+from services.cache import TieredCache, make_cache_key
+from services.write_behind import WriteBehindQueue
+
+# 진단 모델 및 결과 저장 테이블
+DIAGNOSIS_MODEL = "gpt-5"
+DIAGNOSIS_TABLE = "diagnosis"
+
+# 카테고리별 동시 진단(mode="per_category") 설정
+DIAGNOSIS_FAN_OUT_CONCURRENCY = int(os.getenv("DIAGNOSIS_FAN_OUT_CONCURRENCY", "8"))  # 동시 요청 수
+DIAGNOSIS_CATEGORY_RETRIES = int(os.getenv("DIAGNOSIS_CATEGORY_RETRIES", "2"))  # 카테고리별 재시도 횟수
+DIAGNOSIS_RETRY_BACKOFF = 1.0  # 재시도 대기 시간(초, 시도마다 배수로 증가)
+
+# 진단 결과 캐시 (콘텐츠 해시 + 평가 기준 해시 → categories/score_average)
+DIAGNOSIS_CACHE_SIZE = int(os.getenv("DIAGNOSIS_CACHE_SIZE", "256"))  # 프로세스 내 LRU 항목 수
+DIAGNOSIS_CACHE_TTL = int(os.getenv("DIAGNOSIS_CACHE_TTL", "604800"))  # Redis 만료 시간(초)
+# Redis에 없을 때 diagnosis 테이블에 저장된 같은 캐시 키의 결과를 조회할지 여부
+DIAGNOSIS_CACHE_DB_FALLBACK = os.getenv("DIAGNOSIS_CACHE_DB_FALLBACK", "false").lower() == "true"
+
+# 진단 결과 write-behind 저장 (false면 저장이 끝날 때까지 기다린 뒤 응답)
+DIAGNOSIS_WRITE_BEHIND = os.getenv("DIAGNOSIS_WRITE_BEHIND", "true").lower() == "true"
+DIAGNOSIS_WRITE_BATCH_SIZE = int(os.getenv("DIAGNOSIS_WRITE_BATCH_SIZE", "50"))  # insert 1회당 최대 레코드 수
+DIAGNOSIS_WRITE_FLUSH_INTERVAL = float(os.getenv("DIAGNOSIS_WRITE_FLUSH_INTERVAL", "0.5"))  # 배치 대기 최대 시간(초)
+DIAGNOSIS_WRITE_RETRIES = int(os.getenv("DIAGNOSIS_WRITE_RETRIES", "3"))  # 배치 저장 재시도 횟수
+# 저장 실패 시 레코드를 보관할 로컬 스풀 디렉터리
+DIAGNOSIS_SPOOL_DIR = Path(os.getenv(
+    "DIAGNOSIS_SPOOL_DIR",
+    str(Path(__file__).parent.parent / "data" / "diagnosis_spool")
+))
+
+
+# ==================== Pydantic 모델 정의 ====================
 
 class EvaluationCriteriaItem(BaseModel):
+    """평가 항목 개별 아이템"""
     id: int
     내용: str
 
 
 class EvaluationCriteriaCategory(BaseModel):
+    """평가 카테고리 (여러 평가 항목 포함)"""
     id: int
     카테고리: str
     평가항목: List[EvaluationCriteriaItem]
 
 
 class RequestItem(BaseModel):
+    """진단 요청 개별 아이템"""
     query: Optional[str] = None
     contents: Optional[str] = Field(None, min_length=1)
 
 
 class DiagnosisRequest(BaseModel):
+    """
+    진단 요청 모델
+    
+    - input: 평가할 콘텐츠 리스트 (query 또는 contents 중 하나 이상 필수)
+    - evaluation: 평가 기준 (선택사항, 미제공 시 기본 평가 기준 사용)
+    """
     input: List[RequestItem]
     evaluation: Optional[List[EvaluationCriteriaCategory]] = None
+    use_cache: bool = Field(True, description="false면 캐시를 무시하고 다시 진단")
+    mode: str = Field("single", description="진단 방식 (single: 전체 기준 한 번에 평가, per_category: 카테고리별 동시 평가 후 병합)", pattern="^(single|per_category)$")
 
 
 class EvaluationItem(BaseModel):
+    """평가 결과 개별 아이템"""
     id: int
     title: str
-    score: int = Field(..., ge=1, le=100)
+    score: int = Field(..., ge=1, le=100, description="1-100 사이의 점수")
 
 
 class EvaluationCategory(BaseModel):
+    """평가 결과 카테고리"""
     id: int
     name: str
     items: List[EvaluationItem]
 
 
 class DiagnosisResponse(BaseModel):
+    """
+    진단 응답 모델
+    
+    - categories: 카테고리별 평가 결과 리스트
+    - score_average: 전체 항목의 평균 점수
+    - success: 저장 성공 여부
+    - message: 결과 메시지
+    """
     categories: List[EvaluationCategory]
     score_average: float = Field(..., description="전체 항목의 평균 점수")
+    success: bool = Field(..., description="진단 및 저장 성공 여부")
+    message: str = Field(..., description="처리 결과 메시지")
+    cached: bool = Field(False, description="캐시된 진단 결과를 반환했는지 여부")
 
 
+# ==================== 기본 평가 기준 ====================
+
 DEFAULT_EVALUATION_CRITERIA = [
     EvaluationCriteriaCategory(
         id=1,
@@ -108,16 +192,69 @@ DEFAULT_EVALUATION_CRITERIA = [
 ]
 
 
-def get_openai_client():
-    """OpenAI 클라이언트를 반환합니다."""
+# ==================== 헬퍼 함수 ====================
+
+diagnosis_cache = TieredCache("diagnosis:results", DIAGNOSIS_CACHE_SIZE, DIAGNOSIS_CACHE_TTL)
+
+_openai_client: Optional[AsyncOpenAI] = None
+_supabase_client: Optional[Client] = None
+_client_lock = threading.Lock()
+
+
+def get_openai_client() -> Optional[AsyncOpenAI]:
+    """
+    비동기 OpenAI 클라이언트를 반환합니다.
+    
+    연결 풀을 재사용하도록 프로세스에서 하나만 만듭니다.
+    
+    Returns:
+        AsyncOpenAI 클라이언트 인스턴스 또는 None (API 키가 없는 경우)
+    """
+    global _openai_client
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         return None
-    return OpenAI(api_key=api_key)
+    with _client_lock:
+        if _openai_client is None:
+            _openai_client = AsyncOpenAI(api_key=api_key)
+    return _openai_client
+
+
+def get_supabase_client() -> Optional[Client]:
+    """
+    Supabase 클라이언트를 반환합니다.
+    
+    Returns:
+        Supabase 클라이언트 인스턴스 또는 None (환경변수가 없거나 초기화 실패)
+    """
+    global _supabase_client
+    supabase_url = os.getenv("SUPABASE_URL")
+    supabase_key = os.getenv("SUPABASE_KEY")
+    
+    if not supabase_url or not supabase_key:
+        print("Supabase 환경변수가 설정되지 않았습니다.")
+        return None
+    
+    with _client_lock:
+        if _supabase_client is None:
+            try:
+                _supabase_client = create_client(supabase_url, supabase_key)
+            except Exception as e:
+                print(f"Supabase 클라이언트 초기화 실패: {str(e)}")
+                return None
+    return _supabase_client
 
 
 def convert_evaluation_criteria(criteria: List[EvaluationCriteriaCategory]) -> List[dict]:
-    """사용자가 제공한 한국어 키 구조를 영어 키 구조로 변환"""
+    """
+    사용자가 제공한 한국어 키 구조를 영어 키 구조로 변환합니다.
+    
+    Args:
+        criteria: 한국어 키를 가진 평가 기준 리스트
+        
+    Returns:
+        영어 키로 변환된 평가 기준 리스트
+    """
     converted = []
     for category in criteria:
         converted_category = {
@@ -133,6 +270,16 @@ def convert_evaluation_criteria(criteria: List[EvaluationCriteriaCategory]) -> L
 
 
 def build_prompt(content: str, criteria: List[EvaluationCriteriaCategory]) -> str:
+    """
+    GPT 모델에 전달할 프롬프트를 생성합니다.
+    
+    Args:
+        content: 평가할 콘텐츠
+        criteria: 평가 기준
+        
+    Returns:
+        생성된 프롬프트 문자열
+    """
     converted_criteria = convert_evaluation_criteria(criteria)
     criteria_text = json.dumps(converted_criteria, ensure_ascii=False, indent=2)
     return (
@@ -148,50 +295,521 @@ def build_prompt(content: str, criteria: List[EvaluationCriteriaCategory]) -> st
     )
 
 
-async def run_diagnosis(request: DiagnosisRequest) -> DiagnosisResponse:
-    client = get_openai_client()
-    print("시작하기")
-    if not client:
-        raise HTTPException(status_code=500, detail="OPENAI_API_KEY가 설정되지 않았습니다.")
+# ==================== 진단 실행 ====================
 
-    criteria = request.evaluation if request.evaluation else DEFAULT_EVALUATION_CRITERIA
-
-    combined_content = "\n\n".join(
+def combine_contents(request: DiagnosisRequest) -> str:
+    """입력 콘텐츠를 하나의 평가 대상 텍스트로 병합합니다 (contents 우선, 없으면 query)."""
+    return "\n\n".join(
         (item.contents if item.contents else item.query or "")
         for item in request.input
         if item.contents or item.query
     ).strip()
 
-    if not combined_content:
-        raise HTTPException(status_code=400, detail="유효한 content 또는 query가 필요합니다.")
-
-    prompt = build_prompt(combined_content, criteria)
-    response = client.responses.create(model="gpt-5", input=prompt)
-    output_text = getattr(response, "output_text", None)
 
+def parse_categories(output_text: Optional[str]) -> Tuple[Optional[Dict], Optional[List[Dict]], str]:
+    """
+    모델 응답을 해석합니다.
+    
+    Returns:
+        (파싱된 응답, categories 리스트, 오류 메시지). 성공 시 오류 메시지는 빈 문자열
+    """
     if not output_text:
-        raise HTTPException(status_code=502, detail="모델 응답이 비어 있습니다.")
-
+        return None, None, "모델 응답이 비어 있습니다."
     try:
         parsed = json.loads(output_text)
-    except json.JSONDecodeError as exc:
-        raise HTTPException(status_code=502, detail="모델 응답을 JSON으로 해석할 수 없습니다.") from exc
-
+    except json.JSONDecodeError:
+        return None, None, "모델 응답을 JSON으로 해석할 수 없습니다."
+    
     categories = parsed.get("categories") if isinstance(parsed, dict) else None
-
     if not isinstance(categories, list):
-        raise HTTPException(status_code=502, detail="categories 형식이 올바르지 않습니다.")
+        return parsed, None, "categories 형식이 올바르지 않습니다."
+    try:
+        # 점수 범위 등 응답 모델 형식 검증 (형식이 틀린 결과가 캐시되지 않도록)
+        categories = [EvaluationCategory.model_validate(category).model_dump() for category in categories]
+    except ValidationError:
+        return parsed, None, "categories 형식이 올바르지 않습니다."
+    return parsed, categories, ""
 
-    # 전체 항목의 평균 점수 계산
+
+def calculate_score_average(categories: List[Dict]) -> Tuple[float, int]:
+    """
+    전체 항목의 평균 점수를 계산합니다.
+    
+    Returns:
+        (평균 점수(소수점 2자리), 전체 항목 수)
+    """
     total_score = 0
     total_count = 0
     for category in categories:
-        items = category.get("items", [])
-        for item in items:
-            score = item.get("score", 0)
-            total_score += score
+        for item in category.get("items", []):
+            total_score += item.get("score", 0)
             total_count += 1
-    
     score_average = round(total_score / total_count, 2) if total_count > 0 else 0.0
+    return score_average, total_count
+
+
+def criteria_fingerprint(criteria: List[EvaluationCriteriaCategory]) -> str:
+    """평가 기준 집합의 해시 (기본 평가 기준이든 사용자 지정 기준이든 내용이 같으면 같은 값)"""
+    return make_cache_key(convert_evaluation_criteria(criteria))
+
+
+def diagnosis_cache_key(combined_content: str, criteria: List[EvaluationCriteriaCategory]) -> str:
+    """
+    진단 결과 캐시 키를 만듭니다.
+    
+    공백만 다른 콘텐츠는 같은 키를 갖도록 정규화한 콘텐츠 해시와 평가 기준 해시,
+    모델명을 묶어 해시합니다.
+    """
+    normalized_content = " ".join(combined_content.split())
+    return make_cache_key(DIAGNOSIS_MODEL, make_cache_key(normalized_content), criteria_fingerprint(criteria))
+
+
+def load_stored_diagnosis(cache_key: str) -> Optional[Dict]:
+    """
+    diagnosis 테이블에서 같은 캐시 키로 저장된 진단 결과를 조회합니다 (동기, 스레드에서 호출).
+    
+    Returns:
+        {"categories", "score_average"} 또는 None
+    """
+    supabase = get_supabase_client()
+    if not supabase:
+        return None
+    try:
+        result = (
+            supabase.table(DIAGNOSIS_TABLE)
+            .select("diagnosis_result")
+            .eq("diagnosis_result->>cache_key", cache_key)
+            .limit(1)
+            .execute()
+        )
+    except Exception as e:
+        print(f"저장된 진단 결과 조회 실패: {str(e)}")
+        return None
+    if not result.data:
+        return None
+    
+    _, categories, error = parse_categories(json.dumps(result.data[0]["diagnosis_result"].get("evaluation_result")))
+    if error:
+        return None
+    # 테이블의 score_average는 정수로 저장되므로 항목 점수로 다시 계산
+    score_average, _ = calculate_score_average(categories)
+    return {"categories": categories, "score_average": score_average}
+
+
+def has_linked_diagnosis(report_uuid: str, cache_key: str) -> bool:
+    """
+    보고서에 같은 캐시 키의 진단 행이 이미 연결되어 있는지 확인합니다 (동기, 스레드에서 호출).
+    
+    조회에 실패하면 연결 행이 없는 것으로 봅니다 (보고서의 진단 행이 빠지는 것보다 중복 저장이 나음).
+    """
+    supabase = get_supabase_client()
+    if not supabase:
+        return False
+    try:
+        result = (
+            supabase.table(DIAGNOSIS_TABLE)
+            .select("id")
+            .eq("report_uuid", report_uuid)
+            .eq("diagnosis_result->>cache_key", cache_key)
+            .limit(1)
+            .execute()
+        )
+    except Exception as e:
+        print(f"보고서 진단 행 조회 실패: {str(e)}")
+        return False
+    return bool(result.data)
+
+
+def lookup_cached_diagnosis(cache_key: str) -> Tuple[Optional[Dict], str]:
+    """
+    캐시된 진단 결과를 조회합니다 (프로세스 내 LRU → Redis → 선택적으로 diagnosis 테이블).
+    
+    Returns:
+        ({"categories", "score_average"} 또는 None, "local_hit" | "redis_hit" | "db_hit" | "miss")
+    """
+    cached, status = diagnosis_cache.lookup(cache_key)
+    if cached is not None or not DIAGNOSIS_CACHE_DB_FALLBACK:
+        return cached, status
+    cached = load_stored_diagnosis(cache_key)
+    if cached is None:
+        return None, "miss"
+    diagnosis_cache.set(cache_key, cached)
+    return cached, "db_hit"
+
+
+def build_diagnosis_record(combined_content: str, parsed: Dict, categories: List[Dict], total_count: int,
+                           score_average: float, duration_seconds: int, report_uuid: Optional[str] = None,
+                           cache_key: Optional[str] = None) -> Dict:
+    """diagnosis 테이블에 저장할 레코드를 만듭니다."""
+    return {
+        "report_uuid": report_uuid,  # None이면 standalone diagnosis
+        "diagnosis_result": {
+            "input_content": combined_content,
+            "evaluation_result": parsed,
+            "categories_count": len(categories),
+            "total_items": total_count,
+            # 같은 콘텐츠/평가 기준 재진단 시 조회용 (DIAGNOSIS_CACHE_DB_FALLBACK)
+            "cache_key": cache_key
+        },
+        "score_average": int(score_average),
+        "duration_seconds": duration_seconds
+    }
+
+
+def write_diagnosis_records(records: List[Dict]):
+    """
+    진단 레코드들을 diagnosis 테이블에 한 번의 insert로 저장합니다 (동기, 실패 시 예외).
+    """
+    supabase = get_supabase_client()
+    if not supabase:
+        raise RuntimeError("Supabase 클라이언트를 사용할 수 없습니다.")
+    result = supabase.table(DIAGNOSIS_TABLE).insert(records).execute()
+    if not result.data:
+        raise RuntimeError("diagnosis insert 결과가 비어 있습니다.")
+
+
+def insert_diagnosis_records(records: List[Dict]) -> bool:
+    """
+    진단 레코드들을 diagnosis 테이블에 한 번의 insert로 저장합니다 (동기, 스레드에서 호출).
+    
+    Returns:
+        저장 성공 여부
+    """
+    try:
+        write_diagnosis_records(records)
+        return True
+    except Exception as e:
+        print(f"Supabase 저장 중 오류: {str(e)}")
+        return False
+
 
-    return DiagnosisResponse(categories=categories, score_average=score_average)
+def is_transient_write_error(error: Exception) -> bool:
+    """
+    저장 오류가 일시적인지 판별합니다 (write-behind 큐의 재시도/스풀 대상).
+    
+    PostgREST 오류 코드가 데이터/제약 조건/스키마 오류(SQLSTATE 22, 23, 42 클래스,
+    PGRST1xx 요청 오류, PGRST2xx 스키마 오류)이면 같은 레코드를 다시 보내도 실패하므로 영구 오류로 봅니다.
+    연결 실패, 타임아웃, DB 연결 풀 오류(PGRST0xx) 등 그 밖의 오류는 일시적 오류입니다.
+    """
+    code = str(getattr(error, "code", None) or "")
+    if code.startswith(("22", "23", "42")) and len(code) == 5:
+        return False
+    if code.startswith(("PGRST1", "PGRST2")):
+        return False
+    return True
+
+
+diagnosis_writer = WriteBehindQueue(
+    "diagnosis-writer",
+    write_diagnosis_records,
+    DIAGNOSIS_SPOOL_DIR,
+    batch_size=DIAGNOSIS_WRITE_BATCH_SIZE,
+    flush_interval=DIAGNOSIS_WRITE_FLUSH_INTERVAL,
+    max_retries=DIAGNOSIS_WRITE_RETRIES,
+    is_transient=is_transient_write_error
+)
+
+
+async def evaluate_category(client: AsyncOpenAI, content: str, category: EvaluationCriteriaCategory
+                            ) -> Tuple[Optional[Dict], str]:
+    """
+    평가 카테고리 하나를 진단합니다.
+    
+    호출 실패나 응답 형식 오류 시 DIAGNOSIS_CATEGORY_RETRIES회까지 이 카테고리만 다시 요청합니다.
+    
+    Returns:
+        (평가 결과 카테고리, 오류 메시지). 성공 시 오류 메시지는 빈 문자열
+    """
+    error = ""
+    for attempt in range(DIAGNOSIS_CATEGORY_RETRIES + 1):
+        if attempt:
+            await asyncio.sleep(DIAGNOSIS_RETRY_BACKOFF * attempt)
+            print(f"카테고리 '{category.카테고리}' 재시도 {attempt}/{DIAGNOSIS_CATEGORY_RETRIES}: {error}")
+        try:
+            response = await client.responses.create(model=DIAGNOSIS_MODEL, input=build_prompt(content, [category]))
+        except Exception as e:
+            error = f"모델 호출 실패: {str(e)}"
+            continue
+        _, categories, error = parse_categories(getattr(response, "output_text", None))
+        if error:
+            continue
+        matched = [result for result in categories if result["id"] == category.id]
+        if matched:
+            return matched[0], ""
+        error = "응답에 해당 카테고리가 없습니다."
+    return None, error
+
+
+async def evaluate_per_category(client: AsyncOpenAI, content: str, criteria: List[EvaluationCriteriaCategory]
+                                ) -> Tuple[Optional[Dict], Optional[List[Dict]], str]:
+    """
+    카테고리별로 동시에 진단한 뒤 평가 기준 순서대로 병합합니다.
+    
+    Returns:
+        parse_categories()와 같은 (병합 응답, categories 리스트, 오류 메시지)
+    """
+    semaphore = asyncio.Semaphore(DIAGNOSIS_FAN_OUT_CONCURRENCY)
+    
+    async def evaluate(category: EvaluationCriteriaCategory) -> Tuple[Optional[Dict], str]:
+        async with semaphore:
+            return await evaluate_category(client, content, category)
+    
+    results = await asyncio.gather(*[evaluate(category) for category in criteria])
+    failed = [f"{category.카테고리}({error})" for category, (_, error) in zip(criteria, results) if error]
+    if failed:
+        return None, None, f"카테고리 진단에 실패했습니다: {', '.join(failed)}"
+    categories = [result for result, _ in results]
+    return {"categories": categories}, categories, ""
+
+
+async def evaluate_content(client: AsyncOpenAI, content: str, criteria: List[EvaluationCriteriaCategory],
+                           mode: str = "single") -> Tuple[Optional[Dict], Optional[List[Dict]], str]:
+    """
+    콘텐츠를 평가 기준으로 진단합니다 (응답 대기 중 이벤트 루프 양보).
+    
+    Args:
+        client: 비동기 OpenAI 클라이언트
+        content: 평가할 콘텐츠
+        criteria: 평가 기준
+        mode: "single"(전체 기준 한 번에 평가) 또는 "per_category"(카테고리별 동시 평가)
+    
+    Returns:
+        parse_categories()와 같은 (파싱된 응답, categories 리스트, 오류 메시지)
+    """
+    if mode == "per_category":
+        return await evaluate_per_category(client, content, criteria)
+    response = await client.responses.create(model=DIAGNOSIS_MODEL, input=build_prompt(content, criteria))
+    return parse_categories(getattr(response, "output_text", None))
+
+
+async def complete_diagnosis(combined_content: str, parsed: Dict, categories: List[Dict], cache_key: str,
+                            start_time: float, report_uuid: Optional[str] = None,
+                            cache_result: bool = True) -> Tuple[float, bool]:
+    """
+    평균 점수를 계산하고 결과를 캐시 및 Supabase에 저장합니다 (동기 입출력은 스레드에서 실행).
+    
+    DIAGNOSIS_WRITE_BEHIND이면 저장 레코드를 write-behind 큐에 넣고 바로 반환합니다.
+    cache_result=False이면 전체 문서 진단 캐시(diagnosis_cache)에는 넣지 않습니다.
+    
+    Returns:
+        (평균 점수, 저장 성공 여부 (write-behind이면 저장 큐 접수 여부))
+    """
+    score_average, total_count = calculate_score_average(categories)
+    if cache_result:
+        await asyncio.to_thread(
+            diagnosis_cache.set, cache_key, {"categories": categories, "score_average": score_average}
+        )
+    record = build_diagnosis_record(
+        combined_content, parsed, categories, total_count, score_average,
+        int(time.perf_counter() - start_time), report_uuid=report_uuid, cache_key=cache_key
+    )
+    if not DIAGNOSIS_WRITE_BEHIND:
+        return score_average, await asyncio.to_thread(insert_diagnosis_records, [record])
+    if not get_supabase_client():
+        return score_average, False
+    diagnosis_writer.enqueue(record)
+    return score_average, True
+
+
+def save_result_message(saved: bool) -> str:
+    """저장 결과에 따른 진단 완료 메시지"""
+    if not saved:
+        return "진단 결과 저장에 실패했습니다."
+    if DIAGNOSIS_WRITE_BEHIND:
+        return "진단이 완료되었습니다. 결과는 백그라운드에서 저장됩니다."
+    return "진단이 완료되고 결과가 성공적으로 저장되었습니다."
+
+
+def _failure(message: str) -> DiagnosisResponse:
+    return DiagnosisResponse(categories=[], score_average=0.0, success=False, message=message)
+
+
+async def run_diagnosis(request: DiagnosisRequest) -> DiagnosisResponse:
+    """
+    사업계획서 진단 및 평가를 수행하고 Supabase에 저장합니다.
+    
+    Args:
+        request: 진단 요청 데이터
+    
+    Returns:
+        DiagnosisResponse: 카테고리별 평가 결과 및 저장 상태
+        (오류 시 success=false와 메시지를 담아 반환)
+    """
+    start_time = time.perf_counter()
+    client = get_openai_client()
+    if not client:
+        return _failure("OPENAI_API_KEY가 설정되지 않았습니다.")
+    
+    # 평가 기준 설정 (제공되지 않으면 기본값 사용)
+    criteria = request.evaluation if request.evaluation else DEFAULT_EVALUATION_CRITERIA
+    
+    combined_content = combine_contents(request)
+    if not combined_content:
+        return _failure("유효한 content 또는 query가 필요합니다.")
+    
+    cache_key = diagnosis_cache_key(combined_content, criteria)
+    if request.use_cache:
+        cached, status = await asyncio.to_thread(lookup_cached_diagnosis, cache_key)
+        if cached is not None:
+            print(f"진단 결과 캐시 적중 ({status})")
+            return DiagnosisResponse(
+                categories=cached["categories"],
+                score_average=cached["score_average"],
+                success=True,
+                message="같은 콘텐츠의 진단 결과를 반환했습니다.",
+                cached=True
+            )
+    
+    try:
+        parsed, categories, error = await evaluate_content(client, combined_content, criteria, request.mode)
+        if error:
+            return _failure(error)
+        
+        score_average, saved = await complete_diagnosis(
+            combined_content, parsed, categories, cache_key, start_time
+        )
+        return DiagnosisResponse(
+            categories=categories,
+            score_average=score_average,
+            success=saved,
+            message=save_result_message(saved)
+        )
+    
+    except Exception as e:
+        print(f"진단 중 오류: {str(e)}")
+        return _failure("진단 처리 중 오류가 발생했습니다.")
+
+
+def get_default_criteria() -> Dict:
+    """
+    기본 평가 기준을 조회합니다.
+    
+    Returns:
+        카테고리 수, 항목 수, 평가 기준 리스트
+    """
+    return {
+        "total_categories": len(DEFAULT_EVALUATION_CRITERIA),
+        "total_items": sum(len(cat.평가항목) for cat in DEFAULT_EVALUATION_CRITERIA),
+        "criteria": [
+            {
+                "id": cat.id,
+                "카테고리": cat.카테고리,
+                "평가항목": [
+                    {"id": item.id, "내용": item.내용}
+                    for item in cat.평가항목
+                ]
+            }
+            for cat in DEFAULT_EVALUATION_CRITERIA
+        ]
+    }
+
+
+# ==================== 스트리밍 진단 ====================
+
+def _sse(event: str, data: Dict) -> str:
+    """Server-Sent Events 메시지 한 건"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def aiter_diagnosis_events(request: DiagnosisRequest) -> AsyncIterator[str]:
+    """
+    카테고리별 진단 결과를 완료되는 순서대로 SSE 메시지로 반환합니다.
+    
+    - category: 카테고리 하나의 평가 결과 ({"category", "completed", "total"})
+    - category_error: 재시도 후에도 실패한 카테고리 ({"id", "name", "message"})
+    - done: 전체 평균과 저장 결과 ({"score_average", "success", "message", "cached"})
+    - error: 진단을 시작할 수 없는 경우 ({"message"})
+    
+    클라이언트 연결이 끊겨 제너레이터가 닫히면 아직 끝나지 않은 카테고리 요청을 취소합니다.
+    """
+    start_time = time.perf_counter()
+    client = get_openai_client()
+    if not client:
+        yield _sse("error", {"message": "OPENAI_API_KEY가 설정되지 않았습니다."})
+        return
+    
+    criteria = request.evaluation if request.evaluation else DEFAULT_EVALUATION_CRITERIA
+    combined_content = combine_contents(request)
+    if not combined_content:
+        yield _sse("error", {"message": "유효한 content 또는 query가 필요합니다."})
+        return
+    
+    cache_key = diagnosis_cache_key(combined_content, criteria)
+    if request.use_cache:
+        cached, status = await asyncio.to_thread(lookup_cached_diagnosis, cache_key)
+        if cached is not None:
+            print(f"진단 결과 캐시 적중 ({status})")
+            for completed, category in enumerate(cached["categories"], 1):
+                yield _sse("category", {"category": category, "completed": completed, "total": len(cached["categories"])})
+            yield _sse("done", {
+                "score_average": cached["score_average"],
+                "success": True,
+                "message": "같은 콘텐츠의 진단 결과를 반환했습니다.",
+                "cached": True
+            })
+            return
+    
+    semaphore = asyncio.Semaphore(DIAGNOSIS_FAN_OUT_CONCURRENCY)
+    
+    async def evaluate(position: int, category: EvaluationCriteriaCategory) -> Tuple[int, Optional[Dict], str]:
+        async with semaphore:
+            return (position, *await evaluate_category(client, combined_content, category))
+    
+    tasks = [asyncio.create_task(evaluate(position, category)) for position, category in enumerate(criteria)]
+    results: List[Optional[Dict]] = [None] * len(criteria)
+    failed = []
+    try:
+        for completed, next_done in enumerate(asyncio.as_completed(tasks), 1):
+            position, result, error = await next_done
+            if error:
+                failed.append(f"{criteria[position].카테고리}({error})")
+                yield _sse("category_error", {
+                    "id": criteria[position].id, "name": criteria[position].카테고리, "message": error
+                })
+                continue
+            results[position] = result
+            yield _sse("category", {"category": result, "completed": completed, "total": len(criteria)})
+    finally:
+        for task in tasks:
+            task.cancel()
+    
+    if failed:
+        yield _sse("done", {
+            "score_average": 0.0,
+            "success": False,
+            "message": f"카테고리 진단에 실패했습니다: {', '.join(failed)}",
+            "cached": False
+        })
+        return
+    
+    try:
+        score_average, saved = await complete_diagnosis(
+            combined_content, {"categories": results}, results, cache_key, start_time
+        )
+    except Exception as e:
+        print(f"진단 결과 저장 중 오류: {str(e)}")
+        score_average, saved = calculate_score_average(results)[0], False
+    yield _sse("done", {
+        "score_average": score_average,
+        "success": saved,
+        "message": save_result_message(saved),
+        "cached": False
+    })
+
+
+async def stream_diagnosis(request: DiagnosisRequest) -> StreamingResponse:
+    """
+    카테고리별 진단 결과를 Server-Sent Events로 스트리밍합니다 (request.mode와 관계없이 카테고리별 동시 평가).
+    
+    Args:
+        request: 진단 요청 데이터
+    
+    Returns:
+        text/event-stream 스트리밍 응답
+    """
+    return StreamingResponse(
+        aiter_diagnosis_events(request),
+        media_type="text/event-stream",
+        # 프록시 버퍼링 없이 이벤트를 바로 전달
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
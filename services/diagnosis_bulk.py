@@ -0,0 +1,390 @@
+"""
+대량(코호트) 사업계획서 진단
+
+공모 회차 전체처럼 수백 건의 보고서를 한 번의 요청으로 진단합니다 (Celery 태스크에서 실행).
+
+- 동시성 제한: 한 작업 안에서 동시에 진단하는 보고서 수 (DIAGNOSIS_BULK_CONCURRENCY)
+- 공유 속도 제한: 모든 워커/작업이 Redis 카운터를 공유하는 분당 모델 호출 수 제한
+  (Redis를 사용할 수 없으면 프로세스 내 카운터로 제한)
+- 배치 저장: 진단 결과를 모아 diagnosis 테이블에 DIAGNOSIS_BULK_INSERT_BATCH건씩 한 번에 insert
+  (실패한 배치는 write-behind 큐로 넘겨 재시도/스풀)
+- 진행 상황: 항목별 상태(pending/running/done/cached/failed)를 Celery PROGRESS 메타로 전달
+  (GET /api/jobs/status/{task_id}에서 조회)
+
+평가, 캐시 키, 저장 레코드 형식은 단건 진단(services.diagnosis)과 같습니다.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from openai import AsyncOpenAI
+from pydantic import BaseModel, Field
+
+from services.cache import get_redis_client, mark_redis_unavailable
+from services.diagnosis import (
+    DEFAULT_EVALUATION_CRITERIA,
+    EvaluationCriteriaCategory,
+    build_diagnosis_record,
+    calculate_score_average,
+    diagnosis_cache,
+    diagnosis_cache_key,
+    diagnosis_writer,
+    evaluate_content,
+    has_linked_diagnosis,
+    insert_diagnosis_records,
+    lookup_cached_diagnosis,
+)
+from services.diagnosis_sections import combine_sections, fetch_report_sections
+
+# 대량 진단 설정
+DIAGNOSIS_BULK_MAX_ITEMS = int(os.getenv("DIAGNOSIS_BULK_MAX_ITEMS", "1000"))  # 요청당 최대 항목 수
+DIAGNOSIS_BULK_CONCURRENCY = int(os.getenv("DIAGNOSIS_BULK_CONCURRENCY", "8"))  # 작업당 동시 진단 수
+DIAGNOSIS_BULK_INSERT_BATCH = int(os.getenv("DIAGNOSIS_BULK_INSERT_BATCH", "50"))  # insert 1회당 레코드 수
+# 모든 워커가 공유하는 분당 모델 호출 수 (0이면 제한 없음)
+DIAGNOSIS_RATE_LIMIT_PER_MINUTE = int(os.getenv("DIAGNOSIS_RATE_LIMIT_PER_MINUTE", "120"))
+DIAGNOSIS_BULK_PROGRESS_INTERVAL = 1.0  # 진행 상황 갱신 최소 간격(초)
+
+# 워커 프로세스에서 대량 진단 이벤트 루프는 한 번에 하나만 실행
+# (gevent 풀의 태스크들은 OS 스레드 하나를 공유하므로 asyncio.run()을 동시에 호출할 수 없음.
+#  gevent가 threading을 패치하므로 기다리는 태스크는 다른 태스크에 실행을 양보함)
+_bulk_run_lock = threading.Lock()
+
+
+# ==================== Pydantic 모델 정의 ====================
+
+class BulkDiagnosisItem(BaseModel):
+    """
+    대량 진단 개별 항목
+
+    - report_uuid만 있으면 report_sections의 본문을 생성 순서대로 합쳐 진단
+    - contents가 있으면 contents를 진단 (report_uuid가 함께 있으면 저장 레코드에 연결)
+    """
+    report_uuid: Optional[str] = None
+    contents: Optional[str] = None
+
+
+class BulkDiagnosisRequest(BaseModel):
+    """대량 진단 요청 모델"""
+    items: List[BulkDiagnosisItem] = Field(..., min_length=1, max_length=DIAGNOSIS_BULK_MAX_ITEMS)
+    evaluation: Optional[List[EvaluationCriteriaCategory]] = None
+    use_cache: bool = Field(True, description="false면 캐시를 무시하고 다시 진단")
+    mode: str = Field("single", description="진단 방식 (single, per_category)", pattern="^(single|per_category)$")
+
+
+class BulkDiagnosisStartResponse(BaseModel):
+    """대량 진단 시작 응답 모델"""
+    success: bool
+    message: str
+    task_id: str
+    total: int = Field(..., description="진단할 항목 수")
+
+
+# ==================== 공유 속도 제한 ====================
+
+class SharedRateLimiter:
+    """
+    고정 구간(window) 호출 수 제한
+
+    구간마다 Redis 카운터(INCR)를 두어 여러 워커 프로세스가 같은 한도를 나눠 씁니다.
+    한도를 넘으면 다음 구간이 시작될 때까지 기다립니다.
+    """
+
+    def __init__(self, name: str, limit: int, window: float = 60.0):
+        """
+        Args:
+            name: Redis 키 이름
+            limit: 구간당 최대 호출 수 (0 이하이면 제한 없음)
+            window: 구간 길이(초)
+        """
+        self.name = name
+        self.limit = limit
+        self.window = window
+        self._local_counts: Dict[int, int] = {}
+        self._local_lock = threading.Lock()
+
+    def _count(self, window_id: int) -> int:
+        redis_client = get_redis_client()
+        if redis_client is not None:
+            try:
+                key = f"ratelimit:{self.name}:{window_id}"
+                pipe = redis_client.pipeline()
+                pipe.incr(key)
+                pipe.expire(key, int(self.window) * 2)
+                return int(pipe.execute()[0])
+            except Exception as e:
+                mark_redis_unavailable(e)
+        with self._local_lock:
+            for stale in [w for w in self._local_counts if w < window_id]:
+                del self._local_counts[stale]
+            self._local_counts[window_id] = self._local_counts.get(window_id, 0) + 1
+            return self._local_counts[window_id]
+
+    def try_acquire(self) -> float:
+        """
+        호출 한 건을 예약합니다 (동기).
+
+        Returns:
+            0이면 호출 가능, 양수이면 다시 시도하기까지 기다릴 시간(초)
+        """
+        if self.limit <= 0:
+            return 0.0
+        now = time.time()
+        window_id = int(now // self.window)
+        if self._count(window_id) <= self.limit:
+            return 0.0
+        return (window_id + 1) * self.window - now
+
+    async def acquire(self):
+        """한도 안에서 호출할 수 있을 때까지 기다립니다."""
+        while True:
+            wait = await asyncio.to_thread(self.try_acquire)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+
+diagnosis_rate_limiter = SharedRateLimiter("diagnosis:model_calls", DIAGNOSIS_RATE_LIMIT_PER_MINUTE)
+
+
+class _RateLimitedResponses:
+    def __init__(self, responses, limiter: SharedRateLimiter):
+        self._responses = responses
+        self._limiter = limiter
+
+    async def create(self, **kwargs):
+        await self._limiter.acquire()
+        return await self._responses.create(**kwargs)
+
+
+class RateLimitedClient:
+    """모델 호출(재시도, 카테고리별 요청 포함)마다 속도 제한을 거치는 OpenAI 클라이언트 래퍼"""
+
+    def __init__(self, client: AsyncOpenAI, limiter: SharedRateLimiter):
+        self.responses = _RateLimitedResponses(client.responses, limiter)
+
+
+# ==================== 보고서 본문 조회 ====================
+
+def load_report_contents(report_uuids: List[str]) -> Dict[str, str]:
+    """
+    report_sections에서 보고서별 본문을 조회합니다 (동기).
+
+    소목차 본문의 HTML 태그를 제거하고 생성 순서대로 합칩니다.
+
+    Returns:
+        report_uuid → 본문 (소목차가 없는 보고서는 포함되지 않음)
+    """
+    return {
+        report_uuid: combine_sections(sections)
+        for report_uuid, sections in fetch_report_sections(report_uuids).items()
+    }
+
+
+# ==================== 대량 진단 실행 ====================
+
+class BulkProgress:
+    """항목별 진단 상태와 집계 (진행 상황 콜백은 DIAGNOSIS_BULK_PROGRESS_INTERVAL 간격으로 호출)"""
+
+    def __init__(self, items: List[BulkDiagnosisItem], on_progress: Optional[Callable[[Dict], None]] = None):
+        self.items = [
+            {"index": index, "report_uuid": item.report_uuid, "status": "pending",
+             "score_average": None, "saved": None, "error": None}
+            for index, item in enumerate(items)
+        ]
+        self.on_progress = on_progress
+        self._last_reported = 0.0
+
+    def update(self, index: int, **fields):
+        self.items[index].update(fields)
+        self.report()
+
+    def counts(self) -> Dict[str, int]:
+        statuses = [item["status"] for item in self.items]
+        return {
+            "total": len(statuses),
+            "current": sum(status in ("done", "cached", "failed") for status in statuses),
+            "succeeded": statuses.count("done"),
+            "cached": statuses.count("cached"),
+            "failed": statuses.count("failed"),
+            "saved": sum(item["saved"] is True for item in self.items),
+            "unsaved": sum(item["saved"] is False for item in self.items),
+        }
+
+    def snapshot(self) -> Dict:
+        counts = self.counts()
+        return {
+            "status": f"대량 진단 중... ({counts['current']}/{counts['total']})",
+            **counts,
+            "items": [dict(item) for item in self.items],
+        }
+
+    def report(self, force: bool = False):
+        if self.on_progress is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_reported < DIAGNOSIS_BULK_PROGRESS_INTERVAL:
+            return
+        self._last_reported = now
+        try:
+            self.on_progress(self.snapshot())
+        except Exception as e:
+            print(f"대량 진단 진행 상황 갱신 실패: {str(e)}")
+
+
+class DiagnosisBatchWriter:
+    """진단 레코드를 모아 DIAGNOSIS_BULK_INSERT_BATCH건씩 diagnosis 테이블에 저장"""
+
+    def __init__(self, progress: BulkProgress, batch_size: int = DIAGNOSIS_BULK_INSERT_BATCH):
+        self.progress = progress
+        self.batch_size = max(1, batch_size)
+        self.pending: List[tuple] = []
+
+    async def add(self, index: int, record: Dict):
+        self.pending.append((index, record))
+        if len(self.pending) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self):
+        batch, self.pending = self.pending, []
+        if not batch:
+            return
+        saved = await asyncio.to_thread(insert_diagnosis_records, [record for _, record in batch])
+        if not saved:
+            # 재시도와 스풀은 write-behind 큐에 맡김 (저장 여부는 saved=false로 표시)
+            print(f"진단 결과 {len(batch)}건 저장 실패, 저장 큐로 넘김")
+            for _, record in batch:
+                diagnosis_writer.enqueue(record)
+        for index, _ in batch:
+            self.progress.items[index]["saved"] = saved
+        self.progress.report()
+
+
+async def run_bulk_diagnosis(client: AsyncOpenAI, request: BulkDiagnosisRequest,
+                             on_progress: Optional[Callable[[Dict], None]] = None) -> Dict:
+    """
+    여러 보고서/콘텐츠를 제한된 동시성과 공유 속도 제한 아래에서 진단합니다.
+
+    Args:
+        client: 비동기 OpenAI 클라이언트
+        request: 대량 진단 요청
+        on_progress: 진행 상황 스냅샷을 받을 콜백 (동기)
+
+    Returns:
+        집계(total, succeeded, cached, failed, saved, unsaved)와 항목별 결과(items)
+    """
+    start_time = time.perf_counter()
+    criteria = request.evaluation if request.evaluation else DEFAULT_EVALUATION_CRITERIA
+    progress = BulkProgress(request.items, on_progress)
+    writer = DiagnosisBatchWriter(progress)
+    limited_client = RateLimitedClient(client, diagnosis_rate_limiter)
+    semaphore = asyncio.Semaphore(max(1, DIAGNOSIS_BULK_CONCURRENCY))
+
+    missing = [item.report_uuid for item in request.items if not item.contents and item.report_uuid]
+    try:
+        report_contents = await asyncio.to_thread(load_report_contents, missing)
+    except Exception as e:
+        print(f"보고서 본문 조회 실패: {str(e)}")
+        report_contents = {}
+    progress.report(force=True)
+
+    async def diagnose(index: int, item: BulkDiagnosisItem):
+        content = (item.contents or report_contents.get(item.report_uuid) or "").strip()
+        if not content:
+            progress.update(index, status="failed", error="진단할 본문이 없습니다.")
+            return
+        async with semaphore:
+            progress.update(index, status="running")
+            item_start = time.perf_counter()
+            cache_key = diagnosis_cache_key(content, criteria)
+            cached = None
+            if request.use_cache:
+                cached, _ = await asyncio.to_thread(lookup_cached_diagnosis, cache_key)
+            if cached is not None:
+                progress.update(index, status="cached", score_average=cached["score_average"])
+                # 캐시 적중이어도 이 보고서에 연결된 행이 없으면 캐시된 결과로 연결 행을 저장
+                if not item.report_uuid or await asyncio.to_thread(
+                    has_linked_diagnosis, item.report_uuid, cache_key
+                ):
+                    return
+                parsed, categories = {"categories": cached["categories"]}, cached["categories"]
+                score_average, total_count = calculate_score_average(categories)
+            else:
+                try:
+                    parsed, categories, error = await evaluate_content(
+                        limited_client, content, criteria, request.mode
+                    )
+                except Exception as e:
+                    parsed, categories, error = None, None, f"모델 호출 실패: {str(e)}"
+                if error:
+                    progress.update(index, status="failed", error=error)
+                    return
+                score_average, total_count = calculate_score_average(categories)
+                await asyncio.to_thread(
+                    diagnosis_cache.set, cache_key, {"categories": categories, "score_average": score_average}
+                )
+                progress.update(index, status="done", score_average=score_average)
+        # 저장 대기는 동시성 슬롯 밖에서 (배치 insert 중에도 다음 항목 진단)
+        await writer.add(index, build_diagnosis_record(
+            content, parsed, categories, total_count, score_average,
+            int(time.perf_counter() - item_start), report_uuid=item.report_uuid, cache_key=cache_key
+        ))
+
+    await asyncio.gather(*[diagnose(index, item) for index, item in enumerate(request.items)])
+    await writer.flush()
+
+    counts = progress.counts()
+    progress.report(force=True)
+    return {
+        "success": counts["failed"] == 0 and counts["unsaved"] == 0,
+        "message": (
+            f"{counts['total']}건 중 {counts['succeeded']}건 진단, {counts['cached']}건 캐시 적중, "
+            f"{counts['failed']}건 실패 ({counts['saved']}건 저장)"
+        ),
+        **counts,
+        "items": progress.items,
+        "elapsed_time": time.perf_counter() - start_time,
+    }
+
+
+def process_bulk_diagnosis(request: BulkDiagnosisRequest,
+                           on_progress: Optional[Callable[[Dict], None]] = None) -> Dict:
+    """
+    대량 진단을 실행합니다 (동기, Celery 태스크에서 호출).
+
+    태스크마다 새 이벤트 루프를 만들므로 OpenAI 클라이언트도 실행마다 새로 만들어 닫습니다.
+    같은 워커 프로세스의 대량 진단은 순서대로 실행됩니다 (모델 호출 한도는 어차피 모든 작업이 공유).
+    """
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        return {"success": False, "message": "OPENAI_API_KEY가 설정되지 않았습니다.", "items": []}
+
+    async def run() -> Dict:
+        client = AsyncOpenAI(api_key=api_key)
+        try:
+            return await run_bulk_diagnosis(client, request, on_progress)
+        finally:
+            await client.close()
+
+    with _bulk_run_lock:
+        return asyncio.run(run())
+
+
+async def start_bulk_diagnosis(request: BulkDiagnosisRequest) -> BulkDiagnosisStartResponse:
+    """
+    대량 진단을 Celery 태스크로 시작하고 task_id를 바로 반환합니다.
+    """
+    from tasks.diagnosis_tasks import bulk_diagnosis_task
+
+    task = bulk_diagnosis_task.apply_async(
+        args=[request.model_dump()],
+        queue="diagnosis_bulk"
+    )
+    return BulkDiagnosisStartResponse(
+        success=True,
+        message=f"bulk diagnosis started (task_id: {task.id})",
+        task_id=task.id,
+        total=len(request.items)
+    )
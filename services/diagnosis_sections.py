@@ -0,0 +1,328 @@
+"""
+저장된 보고서의 섹션 단위 증분 진단
+
+report_sections의 소목차를 평가 카테고리별로 나누어 진단하고, 카테고리 결과를
+"카테고리 평가 기준 + 그 카테고리에 배정된 소목차 내용 해시"로 캐시합니다.
+소목차 하나를 고친 뒤 다시 진단하면 그 소목차가 배정된 카테고리만 다시 평가하고
+나머지 카테고리는 캐시된 중간 결과를 재사용합니다.
+
+- 소목차 → 카테고리 배정: 카테고리명/평가항목과 소목차 제목/본문의 글자 2-gram 유사도
+  (소목차마다 상위 SECTION_CATEGORY_TOP_K개 카테고리, 카테고리마다 최소 SECTION_MIN_PER_CATEGORY개 소목차)
+- 소목차 해시: 소목차 id + 제목 + HTML을 제거하고 공백을 정리한 본문의 SHA-256
+- 보고서별 이전 소목차 해시를 보관하여 응답에 변경(추가/수정/삭제)된 소목차를 표시
+- 다시 평가한 카테고리가 없고 마지막으로 저장한 결과와 같으면 diagnosis 행을 새로 만들지 않음
+"""
+
+import asyncio
+import math
+import os
+import time
+from typing import Dict, List, Optional, Set
+
+from pydantic import BaseModel, Field
+
+from services.cache import TieredCache, make_cache_key
+from services.diagnosis import (
+    DEFAULT_EVALUATION_CRITERIA,
+    DIAGNOSIS_CACHE_SIZE,
+    DIAGNOSIS_CACHE_TTL,
+    DIAGNOSIS_FAN_OUT_CONCURRENCY,
+    DIAGNOSIS_MODEL,
+    DiagnosisResponse,
+    EvaluationCriteriaCategory,
+    calculate_score_average,
+    complete_diagnosis,
+    convert_evaluation_criteria,
+    criteria_fingerprint,
+    evaluate_category,
+    get_openai_client,
+    get_supabase_client,
+    save_result_message,
+)
+from services.text_utils import compact, ngrams, strip_html
+
+# 소목차 → 카테고리 배정
+SECTION_CATEGORY_TOP_K = int(os.getenv("DIAGNOSIS_SECTION_CATEGORY_TOP_K", "2"))  # 소목차당 카테고리 수
+SECTION_MIN_PER_CATEGORY = int(os.getenv("DIAGNOSIS_SECTION_MIN_PER_CATEGORY", "3"))  # 카테고리당 최소 소목차 수
+SECTION_HEADING_WEIGHT = 0.5  # 유사도에서 소목차 제목 비중 (나머지는 본문)
+# 소목차의 최고 유사도 대비 이 비율 이상인 카테고리만 추가 배정 (상위 1개는 항상 배정)
+SECTION_RELEVANCE_RATIO = 0.6
+
+# 보고서 본문 조회 (report_sections)
+REPORT_SECTIONS_TABLE = "report_sections"
+REPORT_UUID_CHUNK_SIZE = 50  # in 필터 1회당 보고서 수
+REPORT_SECTIONS_PAGE_SIZE = 1000  # 페이지당 소목차 수
+
+# 카테고리별 중간 진단 결과 (카테고리 평가 기준 + 배정된 소목차 해시 → 카테고리 결과)
+category_cache = TieredCache("diagnosis:category", DIAGNOSIS_CACHE_SIZE * 8, DIAGNOSIS_CACHE_TTL)
+# 보고서별 마지막 진단 시점의 소목차 해시와 저장한 결과 키 (변경된 소목차 표시, 중복 저장 방지용)
+report_state_cache = TieredCache("diagnosis:report_state", DIAGNOSIS_CACHE_SIZE, DIAGNOSIS_CACHE_TTL)
+
+
+# ==================== Pydantic 모델 정의 ====================
+
+class ReportDiagnosisRequest(BaseModel):
+    """저장된 보고서 진단 요청 모델"""
+    evaluation: Optional[List[EvaluationCriteriaCategory]] = None
+    use_cache: bool = Field(True, description="false면 모든 카테고리를 다시 진단")
+
+
+class ReportDiagnosisResponse(DiagnosisResponse):
+    """
+    저장된 보고서 진단 응답 모델
+
+    - changed_sections: 마지막 진단 이후 바뀐(또는 새로 생기거나 삭제된) 소목차 id
+    - reevaluated_categories: 이번에 다시 평가한 카테고리 id
+    - reused_categories: 캐시된 중간 결과를 재사용한 카테고리 id
+    """
+    report_uuid: str
+    changed_sections: List[str] = Field(default_factory=list)
+    reevaluated_categories: List[int] = Field(default_factory=list)
+    reused_categories: List[int] = Field(default_factory=list)
+
+
+# ==================== 소목차 조회 ====================
+
+def fetch_report_sections(report_uuids: List[str]) -> Dict[str, List[Dict]]:
+    """
+    report_sections에서 보고서별 소목차를 생성 순서대로 조회합니다 (동기).
+
+    Returns:
+        report_uuid → 소목차 행 리스트 (소목차가 없는 보고서는 포함되지 않음)
+    """
+    supabase = get_supabase_client()
+    if not supabase or not report_uuids:
+        return {}
+    sections: Dict[str, List[Dict]] = {}
+    unique_uuids = list(dict.fromkeys(report_uuids))
+    for chunk_start in range(0, len(unique_uuids), REPORT_UUID_CHUNK_SIZE):
+        chunk = unique_uuids[chunk_start:chunk_start + REPORT_UUID_CHUNK_SIZE]
+        start = 0
+        while True:
+            response = (
+                supabase.table(REPORT_SECTIONS_TABLE)
+                .select("report_uuid, subsection_id, subsection_name, content, generation_order")
+                .in_("report_uuid", chunk)
+                .order("report_uuid")
+                .order("generation_order")
+                .range(start, start + REPORT_SECTIONS_PAGE_SIZE - 1)
+                .execute()
+            )
+            for row in response.data:
+                if row.get("content"):
+                    sections.setdefault(row["report_uuid"], []).append(row)
+            if len(response.data) < REPORT_SECTIONS_PAGE_SIZE:
+                break
+            start += REPORT_SECTIONS_PAGE_SIZE
+    return sections
+
+
+def section_heading(section: Dict) -> str:
+    """소목차 제목 (id + 이름)"""
+    return f"{section.get('subsection_id') or ''} {section.get('subsection_name') or ''}".strip()
+
+
+def section_body(section: Dict) -> str:
+    """HTML 태그를 제거하고 공백을 정리한 소목차 본문"""
+    return " ".join(strip_html(section.get("content") or "").split())
+
+
+def section_text(section: Dict) -> str:
+    """진단에 사용할 소목차 텍스트 (제목 + 본문)"""
+    return f"{section_heading(section)}\n{section_body(section)}"
+
+
+def combine_sections(sections: List[Dict]) -> str:
+    """소목차들을 하나의 평가 대상 텍스트로 병합합니다."""
+    return "\n\n".join(section_text(section) for section in sections).strip()
+
+
+def section_hash(section: Dict) -> str:
+    """소목차 내용 해시 (HTML/공백 차이는 무시)"""
+    return make_cache_key(section.get("subsection_id"), section.get("subsection_name"), section_body(section))
+
+
+# ==================== 소목차 → 카테고리 배정 ====================
+
+def _gram_set(text: str) -> Set[str]:
+    return set(ngrams(compact(text)))
+
+
+def _overlap(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / math.sqrt(len(a) * len(b))
+
+
+def assign_sections(criteria: List[EvaluationCriteriaCategory], sections: List[Dict]) -> Dict[int, List[int]]:
+    """
+    소목차를 관련된 평가 카테고리에 배정합니다.
+
+    소목차의 유사도는 그 소목차 내용만으로 정해지므로, 소목차 하나를 고쳐도
+    다른 소목차의 배정은 (카테고리 최소 소목차 보충을 제외하면) 바뀌지 않습니다.
+
+    Returns:
+        카테고리 id → 소목차 번호 리스트 (소목차 순서)
+    """
+    category_grams = [
+        _gram_set(" ".join([category.카테고리] + [item.내용 for item in category.평가항목]))
+        for category in criteria
+    ]
+    scores = []
+    for section in sections:
+        heading, body = _gram_set(section_heading(section)), _gram_set(section_body(section))
+        scores.append([
+            SECTION_HEADING_WEIGHT * _overlap(grams, heading) + (1 - SECTION_HEADING_WEIGHT) * _overlap(grams, body)
+            for grams in category_grams
+        ])
+
+    assigned: Dict[int, Set[int]] = {category.id: set() for category in criteria}
+    for section_idx, section_scores in enumerate(scores):
+        ranked = sorted(range(len(criteria)), key=lambda c: (-section_scores[c], c))
+        best = section_scores[ranked[0]] if ranked else 0.0
+        for rank, category_idx in enumerate(ranked[:max(1, SECTION_CATEGORY_TOP_K)]):
+            if rank == 0 or (best > 0 and section_scores[category_idx] >= best * SECTION_RELEVANCE_RATIO):
+                assigned[criteria[category_idx].id].add(section_idx)
+
+    # 배정된 소목차가 적은 카테고리는 유사도가 높은 소목차로 보충
+    min_sections = min(SECTION_MIN_PER_CATEGORY, len(sections))
+    for category_idx, category in enumerate(criteria):
+        ranked = sorted(range(len(sections)), key=lambda s: (-scores[s][category_idx], s))
+        for section_idx in ranked:
+            if len(assigned[category.id]) >= min_sections:
+                break
+            assigned[category.id].add(section_idx)
+    return {category_id: sorted(section_ids) for category_id, section_ids in assigned.items()}
+
+
+def category_cache_key(category: EvaluationCriteriaCategory, section_hashes: List[str]) -> str:
+    """카테고리 중간 결과 캐시 키 (모델 + 카테고리 평가 기준 + 배정된 소목차 해시)"""
+    return make_cache_key(DIAGNOSIS_MODEL, convert_evaluation_criteria([category]), section_hashes)
+
+
+def report_result_key(report_uuid: str, category_keys: List[str]) -> str:
+    """
+    보고서 진단 결과 키 (diagnosis 레코드의 cache_key)
+
+    카테고리 점수는 배정된 소목차만으로 평가한 값이므로 전체 문서 진단 키(diagnosis_cache_key)와
+    겹치지 않도록 별도 네임스페이스를 사용합니다. 같은 텍스트의 /api/diagnosis/나 대량 진단이
+    이 결과를 전체 문서 진단으로 재사용하지 않습니다.
+    """
+    return make_cache_key("report_sections", report_uuid, category_keys)
+
+
+# ==================== 보고서 진단 실행 ====================
+
+def _report_failure(report_uuid: str, message: str) -> ReportDiagnosisResponse:
+    return ReportDiagnosisResponse(
+        categories=[], score_average=0.0, success=False, message=message, report_uuid=report_uuid
+    )
+
+
+async def run_report_diagnosis(report_uuid: str, request: ReportDiagnosisRequest) -> ReportDiagnosisResponse:
+    """
+    저장된 보고서를 소목차 단위 증분 방식으로 진단합니다.
+
+    Args:
+        report_uuid: report_sections의 보고서 UUID
+        request: 평가 기준, 캐시 사용 여부
+
+    Returns:
+        ReportDiagnosisResponse: 카테고리별 결과와 변경된 소목차/재평가 카테고리
+    """
+    start_time = time.perf_counter()
+    client = get_openai_client()
+    if not client:
+        return _report_failure(report_uuid, "OPENAI_API_KEY가 설정되지 않았습니다.")
+
+    try:
+        sections = (await asyncio.to_thread(fetch_report_sections, [report_uuid])).get(report_uuid, [])
+    except Exception as e:
+        print(f"보고서 소목차 조회 실패: {str(e)}")
+        return _report_failure(report_uuid, "보고서 소목차를 조회하지 못했습니다.")
+    if not sections:
+        return _report_failure(report_uuid, "보고서 소목차를 찾을 수 없습니다.")
+
+    criteria = request.evaluation if request.evaluation else DEFAULT_EVALUATION_CRITERIA
+    hashes = [section_hash(section) for section in sections]
+    section_ids = [str(section.get("subsection_id") or index) for index, section in enumerate(sections)]
+
+    # 이전 진단 시점과 비교하여 바뀐 소목차 표시
+    fingerprint = criteria_fingerprint(criteria)
+    state_key = make_cache_key(report_uuid, fingerprint)
+    previous = await asyncio.to_thread(report_state_cache.get, state_key) or {}
+    previous_hashes = previous.get("sections", {})
+    current_hashes = dict(zip(section_ids, hashes))
+    changed_sections = [
+        section_id for section_id, digest in current_hashes.items() if previous_hashes.get(section_id) != digest
+    ] + [section_id for section_id in previous_hashes if section_id not in current_hashes]
+
+    assignment = assign_sections(criteria, sections)
+    keys = {
+        category.id: category_cache_key(category, [hashes[i] for i in assignment[category.id]])
+        for category in criteria
+    }
+    results: Dict[int, Dict] = {}
+    if request.use_cache:
+        for category in criteria:
+            cached = await asyncio.to_thread(category_cache.get, keys[category.id])
+            if cached is not None:
+                results[category.id] = cached
+    reused = [category.id for category in criteria if category.id in results]
+    pending = [category for category in criteria if category.id not in results]
+
+    semaphore = asyncio.Semaphore(DIAGNOSIS_FAN_OUT_CONCURRENCY)
+
+    async def evaluate(category: EvaluationCriteriaCategory):
+        content = combine_sections([sections[i] for i in assignment[category.id]])
+        async with semaphore:
+            return await evaluate_category(client, content, category)
+
+    evaluated = await asyncio.gather(*[evaluate(category) for category in pending])
+    failed = []
+    for category, (result, error) in zip(pending, evaluated):
+        if error:
+            failed.append(f"{category.카테고리}({error})")
+            continue
+        results[category.id] = result
+        await asyncio.to_thread(category_cache.set, keys[category.id], result)
+    if failed:
+        # 성공한 카테고리는 캐시되어 다음 요청에서 다시 평가하지 않음
+        return _report_failure(report_uuid, f"카테고리 진단에 실패했습니다: {', '.join(failed)}")
+
+    categories = [results[category.id] for category in criteria]
+    combined_content = combine_sections(sections)
+    result_key = report_result_key(report_uuid, [keys[category.id] for category in criteria])
+    if not pending and previous.get("result_key") == result_key:
+        # 다시 평가한 카테고리가 없고 마지막으로 저장한 결과와 같으면 새 행을 만들지 않음
+        score_average, _ = calculate_score_average(categories)
+        saved, message = True, "변경된 내용이 없어 저장된 진단 결과를 반환했습니다."
+    else:
+        try:
+            # 부분 텍스트 기반 점수이므로 전체 문서 진단 캐시에는 넣지 않음
+            score_average, saved = await complete_diagnosis(
+                combined_content, {"categories": categories}, categories,
+                result_key, start_time, report_uuid=report_uuid, cache_result=False
+            )
+        except Exception as e:
+            print(f"진단 결과 저장 중 오류: {str(e)}")
+            return _report_failure(report_uuid, "진단 처리 중 오류가 발생했습니다.")
+        message = save_result_message(saved)
+    if saved:
+        await asyncio.to_thread(
+            report_state_cache.set, state_key, {"sections": current_hashes, "result_key": result_key}
+        )
+
+    print(f"보고서 {report_uuid} 진단: 소목차 {len(changed_sections)}개 변경 (현재 {len(sections)}개), "
+          f"카테고리 {len(pending)}개 재평가, {len(reused)}개 재사용")
+    return ReportDiagnosisResponse(
+        categories=categories,
+        score_average=score_average,
+        success=saved,
+        message=message,
+        cached=not pending,
+        report_uuid=report_uuid,
+        changed_sections=changed_sections,
+        reevaluated_categories=[category.id for category in pending],
+        reused_categories=reused
+    )
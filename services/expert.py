@@ -1,62 +1,625 @@
+import asyncio
+import hashlib
 import json
 import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
 from supabase import create_client, Client
-from typing import List, Dict, Tuple
+from typing import AsyncIterator, Iterator, List, Dict, Optional, Tuple
 
 from fastapi import HTTPException
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
 from langchain_openai import OpenAIEmbeddings, ChatOpenAI
 from dotenv import load_dotenv
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
+
+from services.cache import EmbeddingCache, TieredCache, make_cache_key
+from services.expert_ann import IVFIndex
+from services.expert_directory import ExpertDirectory, normalize_to_string_list
+from services.expert_index import ExpertItemIndex
+from services.expert_keywords import LocalKeywordExtractor, evaluate_keyword_overlap
+from services.expert_lexical import LexicalIndex
+from services.expert_related import expert_profiles, top_k_neighbours
+from services.expert_shards import ShardedSearch
 
 load_dotenv()
 
+# 임베딩 모델 및 전문가 항목 임베딩 캐시 위치
+EMBEDDING_MODEL = "text-embedding-3-small"
+EXPERT_CACHE_DIR = Path(os.getenv(
+    "EXPERT_CACHE_DIR",
+    str(Path(__file__).parent.parent / "data" / "expert_cache")
+))
+
+# 전문가 카탈로그 갱신 설정
+EXPERT_TABLE = "expert_informations"
+EXPERT_VERSION_COLUMN = os.getenv("EXPERT_VERSION_COLUMN", "updated_at")  # 변경 감지 컬럼
+EXPERT_REFRESH_INTERVAL = int(os.getenv("EXPERT_REFRESH_INTERVAL", "300"))  # 초 단위, 0이면 비활성
+EXPERT_REFRESH_OVERLAP = int(os.getenv("EXPERT_REFRESH_OVERLAP", "600"))  # 증분 갱신 시 기준값보다 이만큼(초) 앞에서부터 다시 조회 (늦게 커밋된 행 대비)
+WARM_UP_RETRY_INTERVAL = 10  # 초기 로드 실패 시 재시도 간격(초)
+CATALOG_SNAPSHOT_PATH = EXPERT_CACHE_DIR / "catalog_snapshot.json"
+
+# 키워드 추출 설정 (LLM 결과 캐시)
+KEYWORD_MODEL = "gpt-4o-mini"
+KEYWORD_CACHE_SIZE = int(os.getenv("KEYWORD_CACHE_SIZE", "1024"))  # 프로세스 내 LRU 항목 수
+KEYWORD_CACHE_TTL = int(os.getenv("KEYWORD_CACHE_TTL", "86400"))  # Redis 만료 시간(초)
+KEYWORD_EMBEDDING_CACHE_SIZE = int(os.getenv("KEYWORD_EMBEDDING_CACHE_SIZE", "4096"))  # 키워드 임베딩 LRU 항목 수
+KEYWORD_EMBEDDING_CACHE_TTL = int(os.getenv("KEYWORD_EMBEDDING_CACHE_TTL", "2592000"))  # Redis 만료 시간(초)
+
+# 로컬 키워드 추출(keyword_mode="local")용 코퍼스 문서 빈도 (저장된 사업계획서 본문으로 생성)
+KEYWORD_CORPUS_TABLE = "report_sections"
+KEYWORD_CORPUS_PATH = EXPERT_CACHE_DIR / "keyword_corpus.json"
+KEYWORD_CORPUS_MAX_AGE = int(os.getenv("KEYWORD_CORPUS_MAX_AGE", "86400"))  # 코퍼스 재생성 주기(초), 0이면 저장된 코퍼스 계속 사용
+KEYWORD_CORPUS_MAX_DOCUMENTS = int(os.getenv("KEYWORD_CORPUS_MAX_DOCUMENTS", "20000"))  # 코퍼스 최대 문서 수
+KEYWORD_CORPUS_PAGE_SIZE = 1000  # Supabase 페이지 크기
+
+# 비슷한 전문가 이웃 목록 (카탈로그 갱신 시 계산, 0이면 비활성)
+EXPERT_RELATED_TOP_K = int(os.getenv("EXPERT_RELATED_TOP_K", "20"))
+
+MATCH_RESULT_CACHE_SIZE = int(os.getenv("MATCH_RESULT_CACHE_SIZE", "256"))  # 프로세스 내 LRU 최대 항목 수
+MATCH_RESULT_TTL = int(os.getenv("MATCH_RESULT_TTL", "3600"))  # 임계값 재조정용 매칭 결과 보관 시간(초)
+# 배치 매칭 시 동시 키워드 추출 수
+EXPERT_BATCH_CONCURRENCY = int(os.getenv("EXPERT_BATCH_CONCURRENCY", "8"))
+# 비동기 경로에서 스코어링(CPU 작업)을 실행할 스레드 수
+EXPERT_SCORING_WORKERS = int(os.getenv("EXPERT_SCORING_WORKERS", "4"))
+
+# 근사 최근접 이웃(ANN) 인덱스 설정
+EXPERT_ANN_MIN_ITEMS = int(os.getenv("EXPERT_ANN_MIN_ITEMS", "20000"))  # 고유 항목(어휘) 수가 이 값 이상이면 IVF 인덱스 생성, 0이면 비활성
+EXPERT_ANN_NLIST = int(os.getenv("EXPERT_ANN_NLIST", "0"))  # 클러스터 수, 0이면 sqrt(어휘 수)
+EXPERT_ANN_NPROBE = int(os.getenv("EXPERT_ANN_NPROBE", "8"))  # 기본 검색 클러스터 수
+
+# 어휘 사전 필터 설정 (키워드와 글자를 공유하는 어휘만 의미 검색)
+EXPERT_PREFILTER_MIN_VOCAB = int(os.getenv("EXPERT_PREFILTER_MIN_VOCAB", "50000"))  # 어휘 수가 이 값 이상이면 기본 prefilter, 0이면 비활성
+EXPERT_PREFILTER_MIN_CANDIDATES = int(os.getenv("EXPERT_PREFILTER_MIN_CANDIDATES", "256"))  # 후보가 이보다 적으면 전체 검색으로 대체
+
+# 어휘 임베딩 저장 형식 (float32: 디스크 캐시 memory-map 그대로, float16/int8: 압축 행렬 디스크 캐시 memory-map)
+EXPERT_VECTOR_DTYPE = os.getenv("EXPERT_VECTOR_DTYPE", "float32")
+EXPERT_VECTOR_RESCORE = os.getenv("EXPERT_VECTOR_RESCORE", "true").lower() == "true"  # 압축 형식일 때 float32 재채점 (false면 검색에 float32 행렬 미사용)
+
+# 대규모 카탈로그용 다중 프로세스 샤드 검색 (float32 정확 검색에 적용, memory-mapped 어휘 행렬 공유)
+# 기본 비활성: 배포 호스트에서 benchmarks/bench_expert_shards.py로 단일 프로세스보다 빠른지 확인한 뒤 설정
+EXPERT_SHARD_WORKERS = int(os.getenv("EXPERT_SHARD_WORKERS", "0"))  # 작업 프로세스 수, 0이면 비활성
+EXPERT_SHARD_COUNT = int(os.getenv("EXPERT_SHARD_COUNT", "0"))  # 샤드 수, 0이면 작업 프로세스 수
+EXPERT_SHARD_MIN_VOCAB = int(os.getenv("EXPERT_SHARD_MIN_VOCAB", "200000"))  # 어휘 수가 이 값 이상일 때만 사용
+
+
+def normalize_item(item: str) -> str:
+    """어휘 키로 사용할 항목 문자열 정규화 (앞뒤/중복 공백 제거)"""
+    return " ".join(item.split())
+
+
+def _utcnow_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _refresh_since(watermark: str) -> str:
+    """
+    증분 조회 기준값: watermark에서 EXPERT_REFRESH_OVERLAP초 이전
+
+    갱신 조회 뒤에 커밋되었지만 updated_at이 watermark 이하인 행도 다음 조회에서 다시 읽도록 겹쳐서 조회합니다.
+    변경 감지 컬럼이 타임스탬프가 아니면 watermark를 그대로 사용합니다.
+    """
+    try:
+        return (datetime.fromisoformat(watermark) - timedelta(seconds=EXPERT_REFRESH_OVERLAP)).isoformat()
+    except ValueError:
+        return watermark
+
+
+class ExpertCatalog:
+    """
+    전문가 카탈로그 스냅샷 (전문가 목록 + 항목 임베딩 행렬 + 스코어링 인덱스)
+    
+    생성 후에는 변경하지 않으며, 갱신 시 새 스냅샷을 만들어 참조를 통째로 교체합니다.
+    매칭 요청은 시작 시점의 스냅샷 하나만 사용하므로 갱신 도중에도 일관된 상태를 봅니다.
+    """
+    
+    def __init__(self, experts: List[Dict], expert_items: List[List[str]], vocab: List[str],
+                 vocab_embeddings: np.ndarray):
+        self.experts = experts
+        self.expert_items = expert_items
+        self.item_offsets = np.cumsum([0] + [len(items) for items in expert_items])
+        self.all_items = [item for items in expert_items for item in items]
+        # 고유 항목 문자열(어휘)과 항목별 어휘 번호
+        self.vocab = vocab
+        self.vocab_embeddings = vocab_embeddings
+        vocab_rows = self.vocab_rows()
+        item_vocab = np.array([vocab_rows[normalize_item(item)] for item in self.all_items], dtype=np.int64)
+        self.index = ExpertItemIndex(vocab_embeddings, self.item_offsets, item_vocab,
+                                     EXPERT_VECTOR_DTYPE, EXPERT_VECTOR_RESCORE)
+        if EXPERT_ANN_MIN_ITEMS > 0 and len(vocab) >= EXPERT_ANN_MIN_ITEMS:
+            self.index.ann = IVFIndex(self.index.matrix, nlist=EXPERT_ANN_NLIST or None)
+        if (EXPERT_SHARD_WORKERS > 0 and len(vocab) >= EXPERT_SHARD_MIN_VOCAB
+                and isinstance(self.index.matrix, np.memmap)):
+            self.index.shards = ShardedSearch(self.index.matrix, EXPERT_SHARD_WORKERS, EXPERT_SHARD_COUNT or None)
+        # 문자열 일치/사전 필터용 n-gram 역색인
+        self.lexicon = LexicalIndex(vocab)
+        # 이름/분야/경력 조회용 인덱스
+        self.directory = ExpertDirectory(experts)
+        # 비슷한 전문가 이웃 목록 ((전문가 수, K) 이웃 번호/유사도, ExpertMatcher._load_related에서 설정)
+        self.related_neighbours: Optional[np.ndarray] = None
+        self.related_scores: Optional[np.ndarray] = None
+        
+        # 변경 감지 기준값 (가장 최근 updated_at)
+        versions = [str(e[EXPERT_VERSION_COLUMN]) for e in experts if e.get(EXPERT_VERSION_COLUMN)]
+        self.watermark = max(versions) if versions else None
+        # 카탈로그 내용 해시 (동일 데이터면 레플리카 간에도 같은 값)
+        content = json.dumps(experts, ensure_ascii=False, sort_keys=True, default=str)
+        self.version = hashlib.sha256(content.encode("utf-8")).hexdigest()[:12]
+        self.loaded_at = _utcnow_iso()
+    
+    def vocab_rows(self) -> Dict[str, int]:
+        """어휘 문자열 → 임베딩 행 번호 매핑 (갱신 시 기존 임베딩 재사용용)"""
+        return {item: row for row, item in enumerate(self.vocab)}
+
 
 class ExpertMatcher:
     """전문가 매칭 클래스"""
     
     def __init__(self):
-        """초기화: Supabase에서 전문가 정보를 로드합니다."""
-        # Supabase 클라이언트 초기화 (환경변수에서 URL과 KEY를 읽음)
-        supabase_url = os.getenv("SUPABASE_URL")
-        supabase_key = os.getenv("SUPABASE_KEY")
-        if not supabase_url or not supabase_key:
-            raise ValueError("Supabase URL or ANON KEY not set in environment variables.")
-        self.supabase: Client = create_client(supabase_url, supabase_key)
-        # 전문가 데이터 로드
-        self.experts = self._load_experts()
-        self.embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
-        self.llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+        """
+        초기화: 네트워크 호출 없이 객체만 구성합니다.
+        
+        전문가 데이터는 warm_up()(FastAPI 시작 시 백그라운드 실행)에서 로드하며,
+        로드가 끝나기 전까지 is_ready는 False입니다.
+        """
+        self._supabase: Optional[Client] = None
+        self.embeddings = OpenAIEmbeddings(model=EMBEDDING_MODEL)
+        self.llm = ChatOpenAI(model=KEYWORD_MODEL, temperature=0)
+        self.keyword_cache = TieredCache("expert:keywords", KEYWORD_CACHE_SIZE, KEYWORD_CACHE_TTL)
+        # 로컬 키워드 추출기 (코퍼스 로드 전에는 보고서 내 빈도만 사용)
+        self.local_keywords = LocalKeywordExtractor()
+        # 키워드 임베딩 캐시 (레플리카 간 공유)
+        self.keyword_embeddings = EmbeddingCache(
+            self.embeddings, EMBEDDING_MODEL, "expert:keyword_embedding",
+            KEYWORD_EMBEDDING_CACHE_SIZE, KEYWORD_EMBEDDING_CACHE_TTL
+        )
+        # 임계값 재조정용 매칭 결과 (result_id → 하한 임계값 이상 매칭)
+        self.match_results = TieredCache("expert:match_results", MATCH_RESULT_CACHE_SIZE, MATCH_RESULT_TTL)
+        # 상세 개수를 제한한 응답의 전체 매칭 상세 (details_id → 전문가별 전체 상세)
+        self.match_details = TieredCache("expert:match_details", MATCH_RESULT_CACHE_SIZE, MATCH_RESULT_TTL)
+        
+        # 비동기 매칭용 스코어링 스레드 풀 (NumPy 행렬 연산은 GIL을 해제함)
+        self._scoring_executor = ThreadPoolExecutor(
+            max_workers=EXPERT_SCORING_WORKERS, thread_name_prefix="expert-scoring"
+        )
+        
+        # 백그라운드 카탈로그 갱신 상태
+        self._refresh_lock = threading.Lock()
+        self._refresh_stop = threading.Event()
+        self._refresh_thread = None
+        
+        # 전문가 카탈로그 (warm_up 전에는 None)
+        self.catalog: Optional[ExpertCatalog] = None
+        self.last_refreshed_at: Optional[str] = None
+        self._warm_up_thread = None
+    
+    @property
+    def supabase(self) -> Client:
+        """Supabase 클라이언트 (처음 사용할 때 생성)"""
+        if self._supabase is None:
+            # 환경변수에서 URL과 KEY를 읽음
+            supabase_url = os.getenv("SUPABASE_URL")
+            supabase_key = os.getenv("SUPABASE_KEY")
+            if not supabase_url or not supabase_key:
+                raise ValueError("Supabase URL or ANON KEY not set in environment variables.")
+            self._supabase = create_client(supabase_url, supabase_key)
+        return self._supabase
+    
+    @property
+    def is_ready(self) -> bool:
+        """카탈로그가 로드되어 매칭 요청을 처리할 수 있는지 여부"""
+        return self.catalog is not None
+    
+    @property
+    def experts(self) -> List[Dict]:
+        """현재 카탈로그의 전문가 목록 (로드 전에는 빈 리스트)"""
+        return self.catalog.experts if self.catalog is not None else []
+    
+    def warm_up(self):
+        """
+        카탈로그를 준비합니다.
+        
+        1. 로컬 스냅샷(전문가 목록 + 디스크 임베딩 캐시)이 있으면 먼저 로드하여 즉시 준비 상태가 되고
+        2. 이어서 Supabase와 비교하여 변경분을 반영합니다.
+        스냅샷이 없으면 Supabase에서 전체를 로드하며, 실패 시 재시도합니다.
+        """
+        if self.catalog is None:
+            experts = self._load_snapshot()
+            if experts is not None:
+                try:
+                    self._set_catalog(self._build_catalog(experts), save_snapshot=False)
+                    print(f"스냅샷에서 전문가 카탈로그 로드 완료 (버전: {self.catalog.version})")
+                except Exception as e:
+                    print(f"스냅샷 카탈로그 구성 실패: {str(e)}")
+        
+        while not self._refresh_stop.is_set():
+            try:
+                self.refresh_catalog()
+                print(f"전문가 카탈로그 준비 완료 (버전: {self.catalog.version})")
+                return
+            except Exception as e:
+                print(f"전문가 카탈로그 로드 실패: {str(e)}")
+                if self.catalog is not None:
+                    # 스냅샷으로 서비스 가능 — 이후 갱신은 백그라운드 갱신 스레드에 맡김
+                    return
+                self._refresh_stop.wait(WARM_UP_RETRY_INTERVAL)
+    
+    def start_warm_up(self):
+        """백그라운드에서 warm_up()을 실행한 뒤 카탈로그 갱신 스레드를 시작합니다."""
+        if self._warm_up_thread and self._warm_up_thread.is_alive():
+            return
+        self._refresh_stop.clear()
+        
+        def run():
+            self.warm_up()
+            if not self._refresh_stop.is_set():
+                self.refresh_keyword_corpus()
+                self.start_refresher()
+        
+        self._warm_up_thread = threading.Thread(target=run, name="expert-catalog-warm-up", daemon=True)
+        self._warm_up_thread.start()
+    
+    def _load_snapshot(self) -> Optional[List[Dict]]:
+        """로컬 카탈로그 스냅샷의 전문가 목록을 읽습니다 (없거나 손상되면 None)."""
+        if not CATALOG_SNAPSHOT_PATH.exists():
+            return None
+        try:
+            with open(CATALOG_SNAPSHOT_PATH, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            return snapshot["experts"]
+        except Exception as e:
+            print(f"카탈로그 스냅샷 로드 실패: {str(e)}")
+            return None
+    
+    def _save_snapshot(self, catalog: ExpertCatalog):
+        """카탈로그 스냅샷을 저장합니다 (항목 임베딩은 디스크 임베딩 캐시에 이미 저장되어 있음)."""
+        try:
+            EXPERT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_path = CATALOG_SNAPSHOT_PATH.with_name(f"{CATALOG_SNAPSHOT_PATH.name}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "version": catalog.version,
+                    "embedding_model": EMBEDDING_MODEL,
+                    "loaded_at": catalog.loaded_at,
+                    "experts": catalog.experts
+                }, f, ensure_ascii=False, default=str)
+            os.replace(tmp_path, CATALOG_SNAPSHOT_PATH)
+        except Exception as e:
+            print(f"카탈로그 스냅샷 저장 실패: {str(e)}")
+    
+    def _set_catalog(self, catalog: ExpertCatalog, save_snapshot: bool = True):
+        """카탈로그 참조를 교체합니다 (진행 중인 매칭은 이전 스냅샷을 계속 사용)."""
+        self.catalog = catalog
+        if save_snapshot:
+            self._save_snapshot(catalog)
     
     def _load_experts(self) -> List[Dict]:
-        """Supabase 테이블에서 전문가 정보를 로드합니다."""
-        response = self.supabase.table("expert_informations").select("*").eq("is_visible", True).execute()
+        """Supabase 테이블에서 노출 중인 전문가 정보를 로드합니다."""
+        response = self.supabase.table(EXPERT_TABLE).select("*").eq("is_visible", True).execute()
         if hasattr(response, 'error') and response.error:
             raise RuntimeError(f"Supabase 로드 오류: {response.error.message}")
         # response.data는 리스트 형태이며, 각 항목은 dict
         return response.data
     
-    def _normalize_to_string_list(self, data) -> List[str]:
-        """딕셔너리 또는 리스트를 문자열 리스트로 정규화합니다."""
-        if isinstance(data, dict):
-            data = list(data.values()) if data else []
-        if not isinstance(data, list):
-            return []
-        return [str(item) for item in data if item]
+    def _load_changed_experts(self, since: str) -> List[Dict]:
+        """변경 감지 컬럼 기준으로 since 이후(같은 값 포함) 변경된 전문가 행을 로드합니다 (비노출 행 포함)."""
+        response = self.supabase.table(EXPERT_TABLE).select("*").gte(EXPERT_VERSION_COLUMN, since).execute()
+        if hasattr(response, 'error') and response.error:
+            raise RuntimeError(f"Supabase 로드 오류: {response.error.message}")
+        return response.data
     
-    def extract_keywords(self, business_report: str, num_keywords: int = 5) -> List[str]:
+    def _load_visible_ids(self) -> set:
+        """노출 중인 전문가 id 집합을 로드합니다 (삭제/비노출 감지용)."""
+        response = self.supabase.table(EXPERT_TABLE).select("id").eq("is_visible", True).execute()
+        if hasattr(response, 'error') and response.error:
+            raise RuntimeError(f"Supabase 로드 오류: {response.error.message}")
+        return {row.get("id") for row in response.data}
+    
+    def _build_catalog(self, experts: List[Dict], previous: ExpertCatalog = None) -> ExpertCatalog:
         """
-        사업보고서에서 키워드 추출
+        전문가 목록으로 카탈로그 스냅샷을 만듭니다.
+        
+        같은 문자열은 전문가가 달라도 한 번만 임베딩하며(어휘),
+        전문가 i의 항목은 item_offsets[i]:item_offsets[i + 1] 구간의 어휘 번호로 표현됩니다.
+        """
+        expert_items = [self._get_expert_items(expert) for expert in experts]
+        vocab = list(dict.fromkeys(
+            normalize_item(item) for items in expert_items for item in items
+        ))
+        vocab_embeddings = self._load_item_embeddings(vocab, previous)
+        catalog = ExpertCatalog(experts, expert_items, vocab, vocab_embeddings)
+        print(f"전문가 {len(experts)}명, 항목 {len(catalog.all_items)}개 "
+              f"(고유 {len(vocab)}개) 임베딩 준비 완료 (버전: {catalog.version})")
+        if EXPERT_RELATED_TOP_K > 0:
+            self._load_related(catalog)
+        return catalog
+    
+    def _load_related(self, catalog: ExpertCatalog):
+        """
+        비슷한 전문가 이웃 목록을 디스크 캐시에서 로드하거나, 없으면 계산하여 저장합니다.
+        
+        캐시 파일명은 임베딩 모델, 카탈로그 버전, K로 결정되므로
+        재시작 시에는 다시 계산하지 않고 카탈로그가 바뀌었을 때만 새로 계산합니다.
+        """
+        content = json.dumps([EMBEDDING_MODEL, catalog.version, EXPERT_RELATED_TOP_K])
+        digest = hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+        cache_path = EXPERT_CACHE_DIR / f"related_{digest}.npz"
+        
+        if cache_path.exists():
+            try:
+                with np.load(cache_path) as cached:
+                    catalog.related_neighbours = cached["neighbours"]
+                    catalog.related_scores = cached["scores"]
+                if len(catalog.related_neighbours) == len(catalog.experts):
+                    print(f"비슷한 전문가 캐시 사용: {cache_path.name}")
+                    return
+            except Exception as e:
+                print(f"비슷한 전문가 캐시 로드 실패 (재계산): {str(e)}")
+        
+        print(f"비슷한 전문가 계산 중: 전문가 {len(catalog.experts)}명, 상위 {EXPERT_RELATED_TOP_K}명")
+        neighbours, scores = top_k_neighbours(expert_profiles(catalog.index), EXPERT_RELATED_TOP_K)
+        catalog.related_neighbours, catalog.related_scores = neighbours, scores
+        
+        try:
+            EXPERT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_name(f"{cache_path.stem}.tmp.npz")
+            np.savez(tmp_path, neighbours=neighbours, scores=scores)
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            print(f"비슷한 전문가 캐시 저장 실패: {str(e)}")
+    
+    def get_related_experts(self, expert_id: str, limit: int = 10) -> Optional[Dict]:
+        """
+        미리 계산한 비슷한 전문가 목록을 반환합니다.
         
         Args:
-            business_report: 사업보고서 내용
-            num_keywords: 추출할 키워드 개수
+            expert_id: 전문가 id
+            limit: 반환할 최대 인원 (EXPERT_RELATED_TOP_K 이하)
             
         Returns:
-            추출된 키워드 리스트
+            {"expert", "related": [{"이름", "similarity", "expert"}, ...]} (id가 없으면 None)
         """
-        prompt = f"""다음 사업보고서 내용을 분석하여 핵심 키워드 {num_keywords}개를 추출해주세요.
+        catalog = self.catalog
+        position = catalog.directory.position_of(expert_id)
+        if position is None:
+            return None
+        if catalog.related_neighbours is None:
+            raise ValueError("비슷한 전문가 목록이 비활성화되어 있습니다. (EXPERT_RELATED_TOP_K)")
+        
+        neighbours = catalog.related_neighbours[position, :limit].tolist()
+        scores = catalog.related_scores[position, :limit].tolist()
+        return {
+            "expert": catalog.experts[position],
+            "catalog_version": catalog.version,
+            "related": [
+                {
+                    "이름": catalog.experts[neighbour]["name"],
+                    "similarity": round(score, 4),
+                    "expert": catalog.experts[neighbour]
+                }
+                for neighbour, score in zip(neighbours, scores)
+            ]
+        }
+    
+    def refresh_catalog(self) -> bool:
+        """
+        Supabase의 변경분을 반영하여 카탈로그를 갱신합니다.
+        
+        변경 감지 컬럼 이후로 바뀐 행만 가져와 새로 추가/수정된 전문가의 항목만 임베딩하고,
+        완성된 새 스냅샷으로 참조를 교체합니다.
+        변경 감지 컬럼을 쓸 수 없으면 전체 목록을 다시 로드합니다.
+        
+        Returns:
+            카탈로그가 교체되었는지 여부
+        """
+        with self._refresh_lock:
+            current = self.catalog
+            experts = None
+            
+            if current is not None and current.watermark is not None:
+                try:
+                    changed = self._load_changed_experts(_refresh_since(current.watermark))
+                    visible_ids = self._load_visible_ids()
+                    experts = self._merge_changed_experts(current.experts, changed, visible_ids)
+                except Exception as e:
+                    print(f"증분 갱신 실패 (전체 로드로 대체): {str(e)}")
+            
+            if experts is None:
+                experts = self._load_experts()
+            
+            self.last_refreshed_at = _utcnow_iso()
+            if current is not None and experts is current.experts:
+                return False
+            
+            catalog = self._build_catalog(experts, previous=current)
+            if current is not None and catalog.version == current.version and catalog.watermark == current.watermark:
+                return False
+            
+            self._set_catalog(catalog)
+            return True
+    
+    def _merge_changed_experts(self, experts: List[Dict], changed: List[Dict], visible_ids: set) -> List[Dict]:
+        """
+        기존 전문가 목록에 변경 행을 반영합니다.
+        
+        기존 순서를 유지하고 새 전문가는 뒤에 추가합니다.
+        변경 행은 watermark 이전 구간까지 겹쳐서 조회하므로 현재 스냅샷과 같은 행은 변경으로 보지 않으며,
+        변경이 없으면 기존 리스트 객체를 그대로 반환합니다.
+        """
+        current_ids = [expert.get("id") for expert in experts]
+        experts_by_id = {expert.get("id"): expert for expert in experts}
+        # 겹쳐 조회한 구간의 그대로인 행(내용이 같은 노출 행, 이미 빠진 비노출 행)은 제외
+        changed = [
+            row for row in changed
+            if (experts_by_id.get(row.get("id")) != row if row.get("is_visible") else row.get("id") in experts_by_id)
+        ]
+        if not changed and set(current_ids) <= visible_ids:
+            return experts
+        
+        order = list(current_ids)
+        for row in changed:
+            row_id = row.get("id")
+            if row.get("is_visible"):
+                if row_id not in experts_by_id:
+                    order.append(row_id)
+                experts_by_id[row_id] = row
+            else:
+                experts_by_id.pop(row_id, None)
+        
+        return [experts_by_id[row_id] for row_id in order
+                if row_id in experts_by_id and row_id in visible_ids]
+    
+    def start_refresher(self, interval: int = EXPERT_REFRESH_INTERVAL):
+        """백그라운드 카탈로그 갱신 스레드를 시작합니다."""
+        if interval <= 0 or (self._refresh_thread and self._refresh_thread.is_alive()):
+            return
+        self._refresh_stop.clear()
+        self._refresh_thread = threading.Thread(
+            target=self._refresh_loop,
+            args=(interval,),
+            name="expert-catalog-refresher",
+            daemon=True
+        )
+        self._refresh_thread.start()
+        print(f"전문가 카탈로그 갱신 스레드 시작 (주기: {interval}초)")
+    
+    def stop_refresher(self):
+        """백그라운드 카탈로그 준비/갱신 스레드를 중지합니다."""
+        self._refresh_stop.set()
+        if self._warm_up_thread:
+            self._warm_up_thread.join(timeout=5)
+            self._warm_up_thread = None
+        if self._refresh_thread:
+            self._refresh_thread.join(timeout=5)
+            self._refresh_thread = None
+    
+    def _refresh_loop(self, interval: int):
+        while not self._refresh_stop.wait(interval):
+            try:
+                if self.refresh_catalog():
+                    print(f"전문가 카탈로그 갱신 완료 (버전: {self.catalog.version})")
+            except Exception as e:
+                print(f"전문가 카탈로그 갱신 중 오류: {str(e)}")
+            self.refresh_keyword_corpus()
+    
+    def refresh_keyword_corpus(self):
+        """
+        로컬 키워드 추출용 코퍼스 통계를 준비합니다.
+        
+        디스크의 코퍼스 파일이 KEYWORD_CORPUS_MAX_AGE보다 오래되지 않았으면 그대로 사용하고,
+        없거나 오래되었으면 report_sections 본문으로 다시 만듭니다.
+        실패해도 기존 통계(또는 보고서 내 빈도만 사용하는 기본 추출기)로 계속 동작합니다.
+        """
+        if self.local_keywords.built_at is None and KEYWORD_CORPUS_PATH.exists():
+            try:
+                self.local_keywords = LocalKeywordExtractor.load(KEYWORD_CORPUS_PATH)
+                print(f"키워드 코퍼스 로드 완료: {self.local_keywords.stats()}")
+            except Exception as e:
+                print(f"키워드 코퍼스 로드 실패 (재생성): {str(e)}")
+        if self.local_keywords.built_at is not None and not self._keyword_corpus_expired():
+            return
+        
+        try:
+            extractor = LocalKeywordExtractor.from_documents(self._load_corpus_documents(), _utcnow_iso())
+            extractor.save(KEYWORD_CORPUS_PATH)
+            self.local_keywords = extractor
+            print(f"키워드 코퍼스 생성 완료: {extractor.stats()}")
+        except Exception as e:
+            print(f"키워드 코퍼스 생성 실패: {str(e)}")
+    
+    def _keyword_corpus_expired(self) -> bool:
+        if KEYWORD_CORPUS_MAX_AGE <= 0:
+            return False
+        try:
+            return time.time() - KEYWORD_CORPUS_PATH.stat().st_mtime >= KEYWORD_CORPUS_MAX_AGE
+        except OSError:
+            return True
+    
+    def _load_corpus_documents(self) -> Iterator[str]:
+        """report_sections 본문을 페이지 단위로 읽습니다 (최대 KEYWORD_CORPUS_MAX_DOCUMENTS건)."""
+        for start in range(0, KEYWORD_CORPUS_MAX_DOCUMENTS, KEYWORD_CORPUS_PAGE_SIZE):
+            end = min(start + KEYWORD_CORPUS_PAGE_SIZE, KEYWORD_CORPUS_MAX_DOCUMENTS) - 1
+            response = self.supabase.table(KEYWORD_CORPUS_TABLE).select("content").range(start, end).execute()
+            if hasattr(response, 'error') and response.error:
+                raise RuntimeError(f"Supabase 로드 오류: {response.error.message}")
+            for row in response.data:
+                yield row.get("content") or ""
+            if len(response.data) < end - start + 1:
+                return
+    
+    def _get_expert_items(self, expert: Dict) -> List[str]:
+        """전문가의 경력과 분야를 개별 항목 문자열 리스트로 반환합니다."""
+        career_items = self._normalize_to_string_list(expert.get("career", []))
+        field_items = self._normalize_to_string_list(expert.get("field", []))
+        return career_items + field_items
+    
+    def _load_item_embeddings(self, items: List[str], previous: ExpertCatalog = None) -> np.ndarray:
+        """
+        어휘 임베딩 행렬을 디스크 캐시에서 로드하거나, 없으면 임베딩하여 저장합니다.
+        
+        캐시 파일명은 임베딩 모델과 어휘 내용의 해시로 결정되므로
+        전문가 데이터가 바뀌면 자동으로 새 행렬이 생성됩니다.
+        이전 카탈로그가 주어지면 이미 임베딩된 문자열은 재사용하고 새 문자열만 한 번에 임베딩합니다.
+        
+        Args:
+            items: 고유 항목 문자열(어휘) 리스트
+            previous: 임베딩을 재사용할 이전 카탈로그
+            
+        Returns:
+            (어휘 수, 임베딩 차원) float32 행렬 (memory-mapped)
+        """
+        if not items:
+            return np.zeros((0, 0), dtype=np.float32)
+        
+        content = json.dumps([EMBEDDING_MODEL, items], ensure_ascii=False)
+        digest = hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+        cache_path = EXPERT_CACHE_DIR / f"vocab_{digest}.npy"
+        
+        if cache_path.exists():
+            try:
+                matrix = np.load(cache_path, mmap_mode="r")
+                if matrix.shape[0] == len(items):
+                    print(f"항목 임베딩 캐시 사용: {cache_path.name}")
+                    return matrix
+            except Exception as e:
+                print(f"항목 임베딩 캐시 로드 실패 (재생성): {str(e)}")
+        
+        known = previous.vocab_rows() if previous is not None and previous.vocab else {}
+        missing = list(dict.fromkeys(item for item in items if item not in known))
+        print(f"항목 임베딩 생성 중: 신규 {len(missing)}개 / 전체 {len(items)}개")
+        
+        new_vectors = np.asarray(self.embeddings.embed_documents(missing), dtype=np.float32) if missing else None
+        dim = new_vectors.shape[1] if new_vectors is not None else previous.vocab_embeddings.shape[1]
+        missing_rows = {item: row for row, item in enumerate(missing)}
+        
+        matrix = np.empty((len(items), dim), dtype=np.float32)
+        reused = np.array([item in known for item in items])
+        if reused.any():
+            matrix[reused] = previous.vocab_embeddings[[known[item] for item in items if item in known]]
+        if not reused.all():
+            matrix[~reused] = new_vectors[[missing_rows[item] for item in items if item not in known]]
+        
+        try:
+            EXPERT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_name(f"{cache_path.stem}.tmp.npy")
+            np.save(tmp_path, matrix)
+            os.replace(tmp_path, cache_path)
+            return np.load(cache_path, mmap_mode="r")
+        except Exception as e:
+            print(f"항목 임베딩 캐시 저장 실패: {str(e)}")
+            return matrix
+    
+    def _normalize_to_string_list(self, data) -> List[str]:
+        """딕셔너리 또는 리스트를 문자열 리스트로 정규화합니다."""
+        return normalize_to_string_list(data)
+    
+    def _keyword_prompt(self, business_report: str, num_keywords: int) -> str:
+        return f"""다음 사업보고서 내용을 분석하여 핵심 키워드 {num_keywords}개를 추출해주세요.
 키워드는 전문가 매칭에 사용될 것이므로, 사업 분야, 기술, 산업 등과 관련된 중요한 단어를 선택해주세요.
 
 사업보고서:
@@ -64,90 +627,368 @@ class ExpertMatcher:
 
 응답 형식: 키워드만 쉼표로 구분하여 나열 (예: 디지털전환, 마케팅, 창업, 브랜딩, 사업계획)
 """
+    
+    def _parse_keywords(self, keywords_text: str, num_keywords: int) -> List[str]:
+        # 쉼표로 구분하여 키워드 리스트 생성
+        keywords = [k.strip() for k in keywords_text.strip().split(',')]
+        return keywords[:num_keywords]
+    
+    def _keyword_cache_key(self, business_report: str, num_keywords: int) -> str:
+        # 공백만 다른 보고서는 같은 키를 갖도록 정규화
+        normalized_report = " ".join(business_report.split())
+        return make_cache_key(KEYWORD_MODEL, normalized_report, num_keywords)
+    
+    def extract_keywords(self, business_report: str, num_keywords: int = 5) -> List[str]:
+        """
+        사업보고서에서 키워드 추출
         
-        response = self.llm.invoke(prompt)
-        keywords_text = response.content.strip()
+        Args:
+            business_report: 사업보고서 내용
+            num_keywords: 추출할 키워드 개수
+            
+        Returns:
+            추출된 키워드 리스트
+        """
+        response = self.llm.invoke(self._keyword_prompt(business_report, num_keywords))
+        return self._parse_keywords(response.content, num_keywords)
+    
+    async def aextract_keywords(self, business_report: str, num_keywords: int = 5) -> List[str]:
+        """extract_keywords의 비동기 버전 (비동기 LLM 클라이언트 사용)"""
+        response = await self.llm.ainvoke(self._keyword_prompt(business_report, num_keywords))
+        return self._parse_keywords(response.content, num_keywords)
+    
+    def extract_keywords_cached(self, business_report: str, num_keywords: int = 5,
+                                keyword_mode: str = "llm") -> Tuple[List[str], str]:
+        """
+        캐시를 거쳐 키워드를 추출합니다.
         
-        # 쉼표로 구분하여 키워드 리스트 생성
-        keywords = [k.strip() for k in keywords_text.split(',')]
+        정규화된 사업보고서(공백 정리)와 키워드 개수의 해시를 키로
+        프로세스 내 LRU → Redis 순으로 조회하고, 모두 없을 때만 LLM을 호출합니다.
+        keyword_mode="local"이면 캐시와 LLM 없이 로컬 TF-IDF 추출기를 사용합니다.
         
-        return keywords[:num_keywords]
+        Returns:
+            (키워드 리스트, 캐시 상태 "local_hit" | "redis_hit" | "miss" | "local")
+        """
+        if keyword_mode == "local":
+            return self.local_keywords.extract(business_report, num_keywords), "local"
+        cache_key = self._keyword_cache_key(business_report, num_keywords)
+        keywords, status = self.keyword_cache.lookup(cache_key)
+        if keywords is None:
+            keywords = self.extract_keywords(business_report, num_keywords)
+            self.keyword_cache.set(cache_key, keywords)
+        return keywords, status
+    
+    async def aextract_keywords_cached(self, business_report: str, num_keywords: int = 5,
+                                       keyword_mode: str = "llm") -> Tuple[List[str], str]:
+        """extract_keywords_cached의 비동기 버전 (Redis 입출력과 로컬 추출은 스레드에서 수행)"""
+        if keyword_mode == "local":
+            keywords = await asyncio.to_thread(self.local_keywords.extract, business_report, num_keywords)
+            return keywords, "local"
+        cache_key = self._keyword_cache_key(business_report, num_keywords)
+        keywords, status = await asyncio.to_thread(self.keyword_cache.lookup, cache_key)
+        if keywords is None:
+            keywords = await self.aextract_keywords(business_report, num_keywords)
+            await asyncio.to_thread(self.keyword_cache.set, cache_key, keywords)
+        return keywords, status
     
     def semantic_keyword_matching(self, keywords: List[str], 
-                                   similarity_threshold: float = 0.7) -> List[Tuple[Dict, int, List[Dict]]]:
+                                   similarity_threshold: float = 0.7,
+                                   catalog: ExpertCatalog = None,
+                                   nprobe: Optional[int] = None,
+                                   candidates: Optional[np.ndarray] = None,
+                                   exact_hits: Optional[Tuple[np.ndarray, np.ndarray]] = None
+                                   ) -> List[Tuple[Dict, int, List[Dict]]]:
         """
         임베딩 기반 의미적 키워드 매칭으로 전문가 랭킹
-        경력과 분야를 개별 항목으로 쪼개서 벡터 임베딩 후
-        키워드와 유사도 0.7 이상인 매칭 개수를 카운트
+        경력과 분야를 개별 항목으로 쪼개서 미리 계산한 임베딩 행렬과
+        키워드 임베딩을 한 번에 비교하여 유사도 임계값 이상인 매칭 개수를 카운트
         
         Args:
             keywords: 검색 키워드 리스트 (5개)
             similarity_threshold: 유사도 임계값 (0~1, 기본값 0.7)
+            catalog: 사용할 카탈로그 스냅샷 (기본값: 현재 카탈로그)
+            nprobe: 지정하면 ANN 인덱스로 근사 검색 (None이면 정확 검색)
+            candidates: 지정하면 이 어휘 번호만 의미 검색 (사전 필터)
+            exact_hits: 유사도 1.0으로 처리할 (키워드 번호, 어휘 번호) 문자열 일치 쌍
             
         Returns:
             (전문가 정보, 매칭 개수, 매칭 상세) 튜플 리스트 (내림차순 정렬)
         """
-        # 키워드 임베딩 생성
+        catalog = catalog or self.catalog
+        
+        # 키워드 임베딩 생성 (캐시 미스만 임베딩 API 호출)
         print(f"키워드 임베딩 생성 중: {keywords}")
-        keyword_embeddings = self.embeddings.embed_documents(keywords)
+        keyword_embeddings = self.keyword_embeddings.embed(keywords)
         
-        expert_scores = []
+        return self._rank_experts(
+            catalog, keywords, keyword_embeddings, similarity_threshold, nprobe, candidates, exact_hits
+        )
+    
+    def _rank_experts(self, catalog: ExpertCatalog, keywords: List[str], keyword_embeddings: np.ndarray,
+                      similarity_threshold: float, nprobe: Optional[int],
+                      candidates: Optional[np.ndarray] = None,
+                      exact_hits: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> List[Tuple[Dict, int, List[Dict]]]:
+        """키워드 × 전체(또는 후보) 어휘 유사도를 한 번에 계산하고 전문가별로 집계합니다 (CPU 작업)."""
+        scored = catalog.index.score(keyword_embeddings, similarity_threshold, nprobe, candidates, exact_hits)
+        return self._to_expert_scores(catalog, keywords, scored)
+    
+    def _rank_experts_with_floor(self, catalog: ExpertCatalog, keywords: List[str], keyword_embeddings: np.ndarray,
+                                 similarity_threshold: float, similarity_floor: float, nprobe: Optional[int],
+                                 candidates: Optional[np.ndarray] = None,
+                                 exact_hits: Optional[Tuple[np.ndarray, np.ndarray]] = None
+                                 ) -> Tuple[List[Tuple[Dict, int, List[Dict]]], List[Tuple[int, List[Tuple[int, int, float]]]]]:
+        """
+        하한 임계값으로 한 번만 스코어링하고 요청 임계값 기준으로 다시 집계합니다 (CPU 작업).
         
-        for expert in self.experts:
-            # 전문가의 경력과 분야를 개별 항목으로 분리
-            career_items = expert.get("career", [])
-            field_items = expert.get("field", [])
-            
-            # JSONB 타입이 딕셔너리로 올 수 있으므로 문자열 리스트로 변환
-            if isinstance(career_items, dict):
-                career_items = list(career_items.values()) if career_items else []
-            if isinstance(field_items, dict):
-                field_items = list(field_items.values()) if field_items else []
-            
-            # 문자열만 필터링 (혹시 모를 다른 타입 제거)
-            career_items = [str(item) for item in career_items if item]
-            field_items = [str(item) for item in field_items if item]
-            
-            all_items = career_items + field_items
-            
-            if not all_items:
-                expert_scores.append((expert, 0, []))
-                continue
+        Returns:
+            (요청 임계값 기준 랭킹, 하한 이상 매칭이 있는 전문가의 (전문가 번호, 매칭) 리스트)
+        """
+        scored_floor = catalog.index.score(keyword_embeddings, similarity_floor, nprobe, candidates, exact_hits)
+        expert_hits = [(expert_idx, hits) for expert_idx, match_count, hits in scored_floor if match_count]
+        scored = catalog.index.rerank(expert_hits, similarity_threshold, len(catalog.experts))
+        return self._to_expert_scores(catalog, keywords, scored), expert_hits
+    
+    def _store_match_result(self, catalog: ExpertCatalog, keywords: List[str], similarity_floor: float,
+                            expert_hits: List[Tuple[int, List[Tuple[int, int, float]]]],
+                            search_mode: str, match_mode: str, keyword_mode: str = "llm") -> str:
+        """하한 임계값 이상 매칭을 저장하고 result_id를 반환합니다."""
+        result_id = uuid.uuid4().hex
+        self.match_results.set(result_id, {
+            "catalog_version": catalog.version,
+            "keywords": keywords,
+            "similarity_floor": similarity_floor,
+            "search_mode": search_mode,
+            "match_mode": match_mode,
+            "keyword_mode": keyword_mode,
+            "expert_hits": [
+                [expert_idx, [[keyword_idx, item_idx, float(similarity)] for keyword_idx, item_idx, similarity in hits]]
+                for expert_idx, hits in expert_hits
+            ]
+        })
+        return result_id
+    
+    def _similarity_profiles(self, catalog: ExpertCatalog,
+                             expert_hits: List[Tuple[int, List[Tuple[int, int, float]]]]) -> List[Dict]:
+        """
+        전문가별 유사도 프로필 (하한 이상 유사도 내림차순)
+        
+        임계값 t에서의 매칭 개수는 similarities 중 t 이상인 값의 개수이며,
+        동점은 expert_index 오름차순으로 정렬하면 서버 랭킹과 같습니다.
+        """
+        return [
+            {
+                "expert_index": expert_idx,
+                "이름": catalog.experts[expert_idx]["name"],
+                "similarities": sorted((round(float(hit[2]), 4) for hit in hits), reverse=True)
+            }
+            for expert_idx, hits in expert_hits
+        ]
+    
+    def _cap_match_details(self, result: Dict, max_details_per_expert: Optional[int],
+                           details_id: Optional[str] = None) -> Dict:
+        """
+        전문가별 매칭 상세를 유사도 상위 max_details_per_expert개로 줄이고,
+        전체 상세는 details_id로 저장합니다 (get_match_details로 조회).
+        
+        details_id를 지정하지 않으면 result_id(없으면 새 식별자)를 사용합니다.
+        max_details_per_expert가 None이면 결과를 그대로 반환합니다.
+        """
+        if max_details_per_expert is None:
+            return result
+        
+        details_id = details_id or result.get("result_id") or uuid.uuid4().hex
+        full_details = []
+        for entry in result["final_ranking"]:
+            details = entry["매칭_상세"]
+            full_details.append({"순위": entry["순위"], "이름": entry["이름"], "매칭_상세": details})
+            # 안정 정렬이므로 유사도가 같으면 키워드 순서 유지
+            entry["매칭_상세"] = sorted(details, key=lambda detail: detail["similarity"], reverse=True)[:max_details_per_expert]
+            entry["매칭_상세_생략_개수"] = len(details) - len(entry["매칭_상세"])
+        
+        self.match_details.set(details_id, {"keywords": result["keywords"], "experts": full_details})
+        result.setdefault("result_id", details_id)
+        result["details_id"] = details_id
+        return result
+    
+    def get_match_details(self, details_id: str, rank: Optional[int] = None) -> Optional[Dict]:
+        """
+        저장된 전체 매칭 상세를 조회합니다.
+        
+        Args:
+            details_id: 상세 개수를 제한한 매칭 응답의 details_id
+            rank: 지정하면 해당 순위 전문가의 상세만 반환
             
-            # 전문가 항목들의 임베딩 생성 (각 항목을 개별적으로 임베딩)
-            expert_embeddings = self.embeddings.embed_documents(all_items)
+        Returns:
+            {"details_id", "keywords", "experts": [{"순위", "이름", "매칭_상세"}, ...]}
+            (details_id가 없거나 만료되었으면 None)
+        """
+        stored = self.match_details.get(details_id)
+        if stored is None:
+            return None
+        experts = stored["experts"]
+        if rank is not None:
+            experts = [entry for entry in experts if entry["순위"] == rank]
+        return {"details_id": details_id, "keywords": stored["keywords"], "experts": experts}
+    
+    def rerank_match_result(self, result_id: str, similarity_threshold: float, top_k: int = 10,
+                            max_details_per_expert: Optional[int] = None) -> Optional[Dict]:
+        """
+        저장된 매칭 결과를 새 임계값으로 다시 랭킹합니다 (키워드 추출/임베딩/유사도 계산 없음).
+        
+        Args:
+            result_id: similarity_floor를 지정한 매칭 요청이 반환한 식별자
+            similarity_threshold: 새 유사도 임계값 (저장 시 하한 이상)
+            top_k: 반환할 최종 전문가 수
+            max_details_per_expert: 지정하면 전문가별 매칭 상세를 유사도 상위 N개로 제한
+                (전체 상세는 원래 매칭 응답의 상세를 덮어쓰지 않도록 새 details_id로 저장)
             
-            # 유사도 0.7 이상인 매칭 개수 카운트
-            match_count = 0
-            match_details = []
+        Returns:
+            match_experts와 같은 형식의 결과 (result_id가 없거나 만료되었으면 None)
             
-            for keyword, keyword_emb in zip(keywords, keyword_embeddings):
-                # 각 키워드에 대해 전문가의 모든 항목과 비교
-                for item, expert_emb in zip(all_items, expert_embeddings):
-                    # 코사인 유사도 계산
-                    similarity = cosine_similarity(
-                        np.array(keyword_emb).reshape(1, -1),
-                        np.array(expert_emb).reshape(1, -1)
-                    )[0][0]
-                    
-                    # 임계값 이상인 경우 카운트
-                    if similarity >= similarity_threshold:
-                        match_count += 1
-                        match_details.append({
-                            "keyword": keyword,
-                            "matched_item": item,
-                            "similarity": float(similarity)
-                        })
+        Raises:
+            ValueError: 임계값이 하한보다 낮거나 카탈로그가 갱신된 경우
+        """
+        stored = self.match_results.get(result_id)
+        if stored is None:
+            return None
+        catalog = self.catalog
+        if stored["catalog_version"] != catalog.version:
+            raise ValueError("전문가 카탈로그가 갱신되어 저장된 결과를 사용할 수 없습니다. 매칭을 다시 요청해주세요.")
+        if similarity_threshold < stored["similarity_floor"]:
+            raise ValueError(f"임계값은 저장 시 하한({stored['similarity_floor']}) 이상이어야 합니다.")
+        
+        expert_hits = [
+            (expert_idx, [tuple(hit) for hit in hits]) for expert_idx, hits in stored["expert_hits"]
+        ]
+        scored = catalog.index.rerank(expert_hits, similarity_threshold, len(catalog.experts), top_k)
+        ranked_experts = self._to_expert_scores(catalog, stored["keywords"], scored)
+        result = self._build_match_result(
+            catalog, stored["keywords"], ranked_experts, top_k, similarity_threshold,
+            stored["search_mode"], stored["match_mode"], "stored",
+            result_id=result_id, similarity_floor=stored["similarity_floor"],
+            keyword_mode=stored.get("keyword_mode", "llm")
+        )
+        return self._cap_match_details(result, max_details_per_expert, details_id=uuid.uuid4().hex)
+    
+    def _to_expert_scores(self, catalog: ExpertCatalog, keywords: List[str],
+                          scored: List[Tuple[int, int, List[Tuple[int, int, float]]]]) -> List[Tuple[Dict, int, List[Dict]]]:
+        """인덱스 스코어링 결과를 (전문가 정보, 매칭 개수, 매칭 상세) 튜플 리스트로 변환합니다."""
+        expert_scores = []
+        for expert_idx, match_count, hits in scored:
+            match_details = [
+                {
+                    "keyword": keywords[keyword_idx],
+                    "matched_item": catalog.all_items[item_idx],
+                    "similarity": similarity
+                }
+                for keyword_idx, item_idx, similarity in hits
+            ]
+            expert_scores.append((catalog.experts[expert_idx], match_count, match_details))
+        return expert_scores
+    
+    async def _run_scoring(self, func, *args):
+        """CPU 바운드 스코어링을 전용 스레드 풀에서 실행하여 이벤트 루프를 막지 않습니다."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._scoring_executor, func, *args)
+    
+    def _resolve_search_mode(self, catalog: ExpertCatalog, search_mode: Optional[str],
+                             ann_nprobe: Optional[int]) -> Tuple[str, Optional[int]]:
+        """요청된 검색 방식을 카탈로그에 맞게 확정합니다 (ANN 인덱스가 없으면 항상 정확 검색)."""
+        if catalog.index.ann is None:
+            search_mode = "exact"
+        elif search_mode is None:
+            search_mode = "ann"
+        nprobe = (ann_nprobe or EXPERT_ANN_NPROBE) if search_mode == "ann" else None
+        return search_mode, nprobe
+    
+    def _plan_lexical(self, catalog: ExpertCatalog, keywords: List[str], match_mode: Optional[str]
+                      ) -> Tuple[str, Optional[np.ndarray], Tuple[np.ndarray, np.ndarray]]:
+        """
+        문자열 일치 쌍을 찾고, prefilter 모드면 의미 검색 후보 어휘를 정합니다.
+        
+        Args:
+            catalog: 카탈로그 스냅샷
+            keywords: 키워드 리스트
+            match_mode: "prefilter" 또는 "exhaustive" (기본값: 어휘 수가 EXPERT_PREFILTER_MIN_VOCAB 이상이면 "prefilter")
             
-            expert_scores.append((expert, match_count, match_details))
+        Returns:
+            (확정된 match_mode, 후보 어휘 번호 또는 None(전체), (키워드 번호, 어휘 번호) 문자열 일치 쌍)
+        """
+        exact_hits = catalog.lexicon.match(keywords)
+        if match_mode is None:
+            auto = EXPERT_PREFILTER_MIN_VOCAB > 0 and len(catalog.vocab) >= EXPERT_PREFILTER_MIN_VOCAB
+            match_mode = "prefilter" if auto else "exhaustive"
+        if match_mode == "exhaustive":
+            return match_mode, None, exact_hits
         
-        # 매칭 개수 기준 내림차순 정렬
-        expert_scores.sort(key=lambda x: x[1], reverse=True)
+        candidates = catalog.lexicon.candidates(keywords)
+        if len(candidates) < min(EXPERT_PREFILTER_MIN_CANDIDATES, len(catalog.vocab)):
+            print(f"사전 필터 후보 부족 ({len(candidates)}개) → 전체 검색으로 대체")
+            return "exhaustive", None, exact_hits
+        return match_mode, candidates, exact_hits
+    
+    def _build_match_result(self, catalog: ExpertCatalog, keywords: List[str],
+                            ranked_experts: List[Tuple[Dict, int, List[Dict]]], top_k: int,
+                            similarity_threshold: float, search_mode: str, match_mode: str,
+                            keyword_cache_status: str, result_id: Optional[str] = None,
+                            similarity_floor: Optional[float] = None,
+                            similarity_profiles: Optional[List[Dict]] = None,
+                            keyword_mode: str = "llm") -> Dict:
+        """매칭 결과 응답 딕셔너리를 만듭니다."""
+        if keyword_mode == "local":
+            keyword_cache = {"status": keyword_cache_status, "corpus": self.local_keywords.stats()}
+        else:
+            keyword_cache = {"status": keyword_cache_status, **self.keyword_cache.stats()}
+        result = {
+            "keywords": keywords,
+            "keyword_mode": keyword_mode,
+            "matching_method": "semantic_count",
+            "search_mode": search_mode,
+            "match_mode": match_mode,
+            "similarity_threshold": similarity_threshold,
+            "total_experts_evaluated": len(catalog.experts),
+            "keyword_cache": keyword_cache,
+            "final_ranking": [
+                {
+                    "순위": idx,
+                    "이름": expert["name"],
+                    "경력": self._normalize_to_string_list(expert.get("career", [])),
+                    "분야": self._normalize_to_string_list(expert.get("field", [])),
+                    "경력파일명": expert.get("career_file_name", ""),
+                    "매칭_개수": match_count,
+                    "매칭_상세": match_details
+                }
+                for idx, (expert, match_count, match_details) in enumerate(ranked_experts[:top_k], 1)
+            ]
+        }
+        if result_id is not None:
+            result["result_id"] = result_id
+            result["similarity_floor"] = similarity_floor
+        if similarity_profiles is not None:
+            result["similarity_profiles"] = similarity_profiles
+        return result
+    
+    def _print_ranking(self, top_experts: List[Tuple[Dict, int, List[Dict]]], similarity_threshold: float):
+        print(f"\n최종 랭킹 (유사도 {similarity_threshold} 이상 매칭 개수 기준):")
+        print("=" * 80)
+        for idx, (expert, match_count, match_details) in enumerate(top_experts, 1):
+            print(f"\n{idx}. {expert['name']} - 매칭 개수: {match_count}개")
+            print(f"   경력: {', '.join(self._normalize_to_string_list(expert.get('career', [])))}")
+            print(f"   분야: {', '.join(self._normalize_to_string_list(expert.get('field', [])))}")
+            
+            # 매칭 상세 정보 출력 (상위 3개만)
+            if match_details:
+                print(f"   주요 매칭:")
+                for detail in match_details[:3]:
+                    print(f"     - 키워드 '{detail['keyword']}' ↔ '{detail['matched_item']}' (유사도: {detail['similarity']:.3f})")
         
-        return expert_scores
+        print("=" * 80)
     
     def match_experts(self, business_report: str, num_keywords: int = 5, top_k: int = 10, 
-                     similarity_threshold: float = 0.7) -> Dict:
+                     similarity_threshold: float = 0.7, search_mode: Optional[str] = None,
+                     ann_nprobe: Optional[int] = None, match_mode: Optional[str] = None,
+                     similarity_floor: Optional[float] = None, include_profiles: bool = False,
+                     max_details_per_expert: Optional[int] = None, keyword_mode: str = "llm") -> Dict:
         """
         사업보고서를 기반으로 전문가 매칭 수행
         
@@ -156,83 +997,354 @@ class ExpertMatcher:
             num_keywords: 추출할 키워드 개수 (기본값 5)
             top_k: 반환할 최종 전문가 수 (기본값 10)
             similarity_threshold: 유사도 임계값 (0~1, 기본값 0.7)
+            search_mode: "exact" 또는 "ann" (기본값: ANN 인덱스가 있으면 "ann")
+            ann_nprobe: ANN 검색 클러스터 수 (기본값 EXPERT_ANN_NPROBE)
+            match_mode: "prefilter"(키워드와 글자를 공유하는 어휘만 의미 검색) 또는 "exhaustive"(전체 검색)
+                (기본값: 어휘 수가 EXPERT_PREFILTER_MIN_VOCAB 이상이면 "prefilter").
+                두 방식 모두 키워드가 그대로 포함된 항목은 유사도 1.0으로 매칭합니다.
+            similarity_floor: 지정하면 이 하한 이상 유사도를 한 번에 계산하여 result_id로 저장
+                (rerank_match_result로 하한 이상 임의의 임계값에 대해 재계산 없이 다시 랭킹)
+            include_profiles: true면 전문가별 유사도 프로필(similarity_profiles)을 함께 반환
+                (similarity_floor 지정 시에만 적용)
+            max_details_per_expert: 지정하면 전문가별 매칭 상세를 유사도 상위 N개로 제한하고
+                전체 상세는 details_id로 저장 (get_match_details로 조회)
+            keyword_mode: "llm"(LLM 키워드 추출, 기본값) 또는 "local"(LLM 없이 로컬 TF-IDF 추출)
             
         Returns:
             매칭 결과 딕셔너리
         """
+        # 요청 처리 중 카탈로그가 교체되어도 같은 스냅샷을 사용
+        catalog = self.catalog
+        search_mode, nprobe = self._resolve_search_mode(catalog, search_mode, ann_nprobe)
+        
         # 1단계: 키워드 추출
         print("=" * 80)
         print("1단계: 키워드 추출 중...")
         print("=" * 80)
-        keywords = self.extract_keywords(business_report, num_keywords)
-        print(f"추출된 키워드 ({len(keywords)}개): {keywords}\n")
+        keywords, keyword_cache_status = self.extract_keywords_cached(business_report, num_keywords, keyword_mode)
+        print(f"추출된 키워드 ({len(keywords)}개, 캐시: {keyword_cache_status}): {keywords}\n")
         
         # 2단계: 전체 전문가 대상 의미적 키워드 매칭
         print("=" * 80)
-        print(f"2단계: 전체 전문가 대상 의미적 키워드 매칭 (임계값: {similarity_threshold})")
+        match_mode, candidates, exact_hits = self._plan_lexical(catalog, keywords, match_mode)
+        if candidates is not None:
+            search_mode, nprobe = "exact", None
+        print(f"2단계: 전체 전문가 대상 의미적 키워드 매칭 (임계값: {similarity_threshold}, 검색: {search_mode}, 모드: {match_mode})")
         print("=" * 80)
-        ranked_experts = self.semantic_keyword_matching(keywords, similarity_threshold)
+        stored = {}
+        if similarity_floor is None:
+            ranked_experts = self.semantic_keyword_matching(
+                keywords, similarity_threshold, catalog, nprobe, candidates, exact_hits
+            )
+        else:
+            similarity_floor = min(similarity_floor, similarity_threshold)
+            keyword_embeddings = self.keyword_embeddings.embed(keywords)
+            ranked_experts, expert_hits = self._rank_experts_with_floor(
+                catalog, keywords, keyword_embeddings, similarity_threshold, similarity_floor, nprobe,
+                candidates, exact_hits
+            )
+            stored = self._stored_result_fields(
+                catalog, keywords, similarity_floor, expert_hits, search_mode, match_mode, include_profiles,
+                keyword_mode
+            )
         
-        # 상위 top_k명만 추출
-        top_experts = ranked_experts[:top_k]
-        
-        print(f"\n최종 랭킹 (유사도 {similarity_threshold} 이상 매칭 개수 기준):")
-        print("=" * 80)
-        for idx, (expert, match_count, match_details) in enumerate(top_experts, 1):
-            print(f"\n{idx}. {expert['name']} - 매칭 개수: {match_count}개")
-            
-            # career와 field를 문자열 리스트로 변환
-            career_list = expert.get('career', [])
-            field_list = expert.get('field', [])
-            if isinstance(career_list, dict):
-                career_list = list(career_list.values()) if career_list else []
-            if isinstance(field_list, dict):
-                field_list = list(field_list.values()) if field_list else []
-            career_list = [str(item) for item in career_list if item]
-            field_list = [str(item) for item in field_list if item]
-            
-            print(f"   경력: {', '.join(career_list)}")
-            print(f"   분야: {', '.join(field_list)}")
-            
-            # 매칭 상세 정보 출력 (상위 3개만)
-            if match_details:
-                print(f"   주요 매칭:")
-                for detail in match_details[:3]:
-                    print(f"     - 키워드 '{detail['keyword']}' ↔ '{detail['matched_item']}' (유사도: {detail['similarity']:.3f})")
-        
-        print("=" * 80)
+        # 상위 top_k명만 출력
+        self._print_ranking(ranked_experts[:top_k], similarity_threshold)
         
         # 결과 반환
+        result = self._build_match_result(
+            catalog, keywords, ranked_experts, top_k, similarity_threshold, search_mode, match_mode,
+            keyword_cache_status, keyword_mode=keyword_mode, **stored
+        )
+        return self._cap_match_details(result, max_details_per_expert)
+    
+    def _stored_result_fields(self, catalog: ExpertCatalog, keywords: List[str], similarity_floor: float,
+                              expert_hits: List[Tuple[int, List[Tuple[int, int, float]]]],
+                              search_mode: str, match_mode: str, include_profiles: bool,
+                              keyword_mode: str = "llm") -> Dict:
+        """매칭 결과를 저장하고 응답에 추가할 result_id/하한/프로필 필드를 만듭니다."""
         return {
-            "keywords": keywords,
-            "matching_method": "semantic_count",
-            "similarity_threshold": similarity_threshold,
-            "total_experts_evaluated": len(self.experts),
-            "final_ranking": [
-                {
-                    "순위": idx,
-                    "이름": expert["name"],
-                    "경력": self._normalize_to_string_list(expert.get("career", [])),
-                    "분야": self._normalize_to_string_list(expert.get("field", [])),
-                    "경력파일명": expert.get("career_file_name", ""),
-                    "매칭_개수": match_count,
-                    "매칭_상세": match_details
-                }
-                for idx, (expert, match_count, match_details) in enumerate(top_experts, 1)
-            ]
+            "result_id": self._store_match_result(
+                catalog, keywords, similarity_floor, expert_hits, search_mode, match_mode, keyword_mode
+            ),
+            "similarity_floor": similarity_floor,
+            "similarity_profiles": self._similarity_profiles(catalog, expert_hits) if include_profiles else None
         }
+    
+    async def amatch_experts(self, business_report: str, num_keywords: int = 5, top_k: int = 10,
+                             similarity_threshold: float = 0.7, search_mode: Optional[str] = None,
+                             ann_nprobe: Optional[int] = None, match_mode: Optional[str] = None,
+                             similarity_floor: Optional[float] = None, include_profiles: bool = False,
+                             max_details_per_expert: Optional[int] = None, keyword_mode: str = "llm") -> Dict:
+        """
+        match_experts의 비동기 버전
+        
+        키워드 추출과 임베딩은 비동기 LLM/임베딩 클라이언트로 호출하고,
+        CPU 바운드 스코어링은 스레드 풀에서 실행하여 이벤트 루프를 막지 않습니다.
+        (인자와 반환값은 match_experts와 동일)
+        """
+        catalog = self.catalog
+        search_mode, nprobe = self._resolve_search_mode(catalog, search_mode, ann_nprobe)
+        
+        keywords, keyword_cache_status = await self.aextract_keywords_cached(
+            business_report, num_keywords, keyword_mode
+        )
+        print(f"추출된 키워드 ({len(keywords)}개, 캐시: {keyword_cache_status}): {keywords}")
+        
+        match_mode, candidates, exact_hits = self._plan_lexical(catalog, keywords, match_mode)
+        if candidates is not None:
+            search_mode, nprobe = "exact", None
+        keyword_embeddings = await self.keyword_embeddings.aembed(keywords)
+        stored = {}
+        if similarity_floor is None:
+            ranked_experts = await self._run_scoring(
+                self._rank_experts, catalog, keywords, keyword_embeddings, similarity_threshold, nprobe,
+                candidates, exact_hits
+            )
+        else:
+            similarity_floor = min(similarity_floor, similarity_threshold)
+            ranked_experts, expert_hits = await self._run_scoring(
+                self._rank_experts_with_floor, catalog, keywords, keyword_embeddings, similarity_threshold,
+                similarity_floor, nprobe, candidates, exact_hits
+            )
+            stored = await asyncio.to_thread(
+                self._stored_result_fields,
+                catalog, keywords, similarity_floor, expert_hits, search_mode, match_mode, include_profiles,
+                keyword_mode
+            )
+        self._print_ranking(ranked_experts[:top_k], similarity_threshold)
+        
+        result = self._build_match_result(
+            catalog, keywords, ranked_experts, top_k, similarity_threshold, search_mode, match_mode,
+            keyword_cache_status, keyword_mode=keyword_mode, **stored
+        )
+        return await asyncio.to_thread(self._cap_match_details, result, max_details_per_expert)
+    
+    async def _aextract_keywords_indexed(self, idx: int, business_report: str, num_keywords: int,
+                                         semaphore: asyncio.Semaphore, keyword_mode: str = "llm"
+                                         ) -> Tuple[int, Optional[Tuple[List[str], str]], Optional[Exception]]:
+        """동시 실행 수를 제한하여 키워드를 추출합니다. 예외는 결과로 반환합니다."""
+        async with semaphore:
+            try:
+                return idx, await self.aextract_keywords_cached(business_report, num_keywords, keyword_mode), None
+            except Exception as e:
+                return idx, None, e
+    
+    async def amatch_experts_batch(self, business_reports: List[str], num_keywords: int = 5, top_k: int = 10,
+                                   similarity_threshold: float = 0.7, search_mode: Optional[str] = None,
+                                   ann_nprobe: Optional[int] = None, match_mode: Optional[str] = None,
+                                   max_details_per_expert: Optional[int] = None,
+                                   keyword_mode: str = "llm") -> List[Dict]:
+        """
+        여러 사업보고서에 대해 전문가 매칭을 한 번에 수행
+        
+        키워드는 동시에 추출하고(EXPERT_BATCH_CONCURRENCY개씩), 전체 보고서 키워드의 합집합을
+        한 번에 임베딩한 뒤 한 번의 행렬 곱으로 모든 보고서를 스코어링합니다.
+        
+        Args:
+            business_reports: 사업보고서 내용 리스트
+            (나머지 인자는 match_experts와 동일)
+            
+        Returns:
+            보고서별 {"index", "success", "message", "result"} 리스트 (입력 순서 유지)
+        """
+        catalog = self.catalog
+        search_mode, nprobe = self._resolve_search_mode(catalog, search_mode, ann_nprobe)
+        print(f"배치 전문가 매칭 시작: 보고서 {len(business_reports)}건 (검색: {search_mode})")
+        
+        # 1단계: 키워드 동시 추출
+        semaphore = asyncio.Semaphore(EXPERT_BATCH_CONCURRENCY)
+        extracted = {}
+        results = [None] * len(business_reports)
+        for idx, keyword_result, error in await asyncio.gather(*[
+            self._aextract_keywords_indexed(idx, report, num_keywords, semaphore, keyword_mode)
+            for idx, report in enumerate(business_reports)
+        ]):
+            if error is not None:
+                results[idx] = {"index": idx, "success": False, "message": f"키워드 추출 실패: {str(error)}", "result": None}
+            else:
+                extracted[idx] = keyword_result
+        
+        # 2단계: 키워드 합집합 일괄 임베딩 및 일괄 스코어링
+        union = list(dict.fromkeys(keyword for keywords, _ in extracted.values() for keyword in keywords))
+        union_rows = {keyword: row for row, keyword in enumerate(union)}
+        match_mode, candidates, exact_hits = self._plan_lexical(catalog, union, match_mode)
+        if candidates is not None:
+            search_mode, nprobe = "exact", None
+        union_embeddings = await self.keyword_embeddings.aembed(union)
+        report_ids = sorted(extracted)
+        scored_batch = await self._run_scoring(
+            catalog.index.score_batch,
+            union_embeddings,
+            [[union_rows[keyword] for keyword in extracted[idx][0]] for idx in report_ids],
+            similarity_threshold,
+            nprobe,
+            candidates,
+            exact_hits
+        )
+        
+        for idx, scored in zip(report_ids, scored_batch):
+            keywords, keyword_cache_status = extracted[idx]
+            ranked_experts = self._to_expert_scores(catalog, keywords, scored)
+            results[idx] = {
+                "index": idx,
+                "success": True,
+                "message": "",
+                "result": self._build_match_result(
+                    catalog, keywords, ranked_experts, top_k, similarity_threshold, search_mode, match_mode,
+                    keyword_cache_status, keyword_mode=keyword_mode
+                )
+            }
+        
+        if max_details_per_expert is not None:
+            await asyncio.to_thread(lambda: [
+                self._cap_match_details(results[idx]["result"], max_details_per_expert) for idx in report_ids
+            ])
+        
+        print(f"배치 전문가 매칭 완료: 고유 키워드 {len(union)}개, 성공 {len(report_ids)}/{len(business_reports)}건")
+        return results
+    
+    async def aiter_match_experts_batch(self, business_reports: List[str], num_keywords: int = 5, top_k: int = 10,
+                                        similarity_threshold: float = 0.7, search_mode: Optional[str] = None,
+                                        ann_nprobe: Optional[int] = None, match_mode: Optional[str] = None,
+                                        max_details_per_expert: Optional[int] = None,
+                                        keyword_mode: str = "llm") -> AsyncIterator[Dict]:
+        """
+        amatch_experts_batch의 스트리밍 버전
+        
+        키워드 추출이 끝나는 순서대로 해당 보고서를 스코어링하여 결과를 하나씩 반환합니다.
+        (키워드 임베딩은 공유 캐시를 거치므로 반복 키워드는 다시 임베딩하지 않음)
+        클라이언트 연결이 끊겨 제너레이터가 닫히면 남은 추출 작업을 취소합니다.
+        """
+        catalog = self.catalog
+        requested_search_mode, requested_nprobe = self._resolve_search_mode(catalog, search_mode, ann_nprobe)
+        
+        semaphore = asyncio.Semaphore(EXPERT_BATCH_CONCURRENCY)
+        tasks = [
+            asyncio.create_task(self._aextract_keywords_indexed(idx, report, num_keywords, semaphore, keyword_mode))
+            for idx, report in enumerate(business_reports)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                idx, keyword_result, error = await next_done
+                if error is not None:
+                    yield {"index": idx, "success": False, "message": f"키워드 추출 실패: {str(error)}", "result": None}
+                    continue
+                
+                keywords, keyword_cache_status = keyword_result
+                try:
+                    report_match_mode, candidates, exact_hits = self._plan_lexical(catalog, keywords, match_mode)
+                    search_mode, nprobe = (
+                        ("exact", None) if candidates is not None else (requested_search_mode, requested_nprobe)
+                    )
+                    keyword_embeddings = await self.keyword_embeddings.aembed(keywords)
+                    ranked_experts = await self._run_scoring(
+                        self._rank_experts, catalog, keywords, keyword_embeddings, similarity_threshold, nprobe,
+                        candidates, exact_hits
+                    )
+                    result = self._build_match_result(
+                        catalog, keywords, ranked_experts, top_k, similarity_threshold, search_mode,
+                        report_match_mode, keyword_cache_status, keyword_mode=keyword_mode
+                    )
+                    result = await asyncio.to_thread(self._cap_match_details, result, max_details_per_expert)
+                except Exception as e:
+                    yield {"index": idx, "success": False, "message": f"전문가 매칭 실패: {str(e)}", "result": None}
+                    continue
+                
+                yield {"index": idx, "success": True, "message": "", "result": result}
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    async def acompare_keyword_modes(self, business_reports: List[str], num_keywords: int = 5) -> Dict:
+        """
+        보고서별 로컬 키워드와 LLM 키워드의 일치율 및 추출 시간을 비교합니다.
+        
+        LLM 키워드는 키워드 캐시를 거쳐 동시에 추출합니다(EXPERT_BATCH_CONCURRENCY개씩).
+        
+        Returns:
+            evaluate_keyword_overlap() 결과 + {"corpus": 코퍼스 통계}
+        """
+        semaphore = asyncio.Semaphore(EXPERT_BATCH_CONCURRENCY)
+        extracted = await asyncio.gather(*[
+            self._aextract_keywords_indexed(idx, report, num_keywords, semaphore)
+            for idx, report in enumerate(business_reports)
+        ])
+        for idx, _, error in extracted:
+            if error is not None:
+                raise RuntimeError(f"{idx}번 보고서 LLM 키워드 추출 실패: {str(error)}")
+        
+        comparison = await asyncio.to_thread(
+            evaluate_keyword_overlap,
+            business_reports,
+            self.local_keywords.extract,
+            [keyword_result[0] for _, keyword_result, _ in extracted],
+            num_keywords
+        )
+        comparison["corpus"] = self.local_keywords.stats()
+        return comparison
 
 
-# 전문가 매칭 시스템 초기화
+# 전문가 매칭 시스템 (데이터 로드는 FastAPI 시작 시 백그라운드에서 수행)
 matcher = ExpertMatcher()
 
 
+def ensure_matcher_ready():
+    """카탈로그 로드 전이면 503 오류를 발생시킵니다."""
+    if not matcher.is_ready:
+        raise HTTPException(
+            status_code=503,
+            detail="전문가 데이터를 불러오는 중입니다. 잠시 후 다시 시도해주세요."
+        )
+
+
 class ExpertMatchRequest(BaseModel):
     """전문가 매칭 요청 모델"""
     business_report: str = Field(..., description="사업보고서 내용")
     num_keywords: int = Field(10, description="추출할 키워드 개수", ge=1, le=10)
     top_k: int = Field(10, description="반환할 상위 전문가 수", ge=1, le=50)
     similarity_threshold: float = Field(0.5, description="유사도 임계값", ge=0.0, le=1.0)
+    search_mode: Optional[str] = Field(None, description="검색 방식 (exact: 정확 검색, ann: 근사 검색, 미지정 시 카탈로그 규모에 따라 자동)", pattern="^(exact|ann)$")
+    ann_nprobe: Optional[int] = Field(None, description="근사 검색 시 탐색할 클러스터 수 (클수록 정확하고 느림)", ge=1, le=4096)
+    match_mode: Optional[str] = Field(None, description="매칭 방식 (prefilter: 키워드와 글자를 공유하는 항목만 의미 검색, exhaustive: 전체 검색, 미지정 시 카탈로그 규모에 따라 자동)", pattern="^(prefilter|exhaustive)$")
+    similarity_floor: Optional[float] = Field(None, description="하한 임계값 (지정하면 이 값 이상 유사도를 한 번에 계산하여 result_id로 저장, /match/rerank로 재계산 없이 임계값 변경)", ge=0.0, le=1.0)
+    include_profiles: bool = Field(False, description="true면 전문가별 유사도 프로필 반환 (similarity_floor 지정 시)")
+    max_details_per_expert: Optional[int] = Field(None, description="전문가별 매칭 상세 최대 개수 (유사도 상위 N개, 전체 상세는 details_id로 /match/{details_id}/details에서 조회)", ge=0, le=100)
+    keyword_mode: str = Field("llm", description="키워드 추출 방식 (llm: LLM 추출, local: LLM 없이 보고서 코퍼스 기반 TF-IDF 추출 — 저지연)", pattern="^(llm|local)$")
+
+
+class ExpertRerankRequest(BaseModel):
+    """저장된 매칭 결과 임계값 재조정 요청 모델"""
+    result_id: str = Field(..., description="similarity_floor를 지정한 매칭 응답의 result_id")
+    similarity_threshold: float = Field(..., description="새 유사도 임계값 (저장 시 하한 이상)", ge=0.0, le=1.0)
+    top_k: int = Field(10, description="반환할 상위 전문가 수", ge=1, le=50)
+    max_details_per_expert: Optional[int] = Field(None, description="전문가별 매칭 상세 최대 개수 (유사도 상위 N개, 전체 상세는 details_id로 /match/{details_id}/details에서 조회)", ge=0, le=100)
+
+
+class ExpertBatchReport(BaseModel):
+    """배치 매칭 대상 보고서"""
+    report_id: Optional[str] = Field(None, description="호출 측 식별자 (결과에 그대로 반환)")
+    business_report: str = Field(..., description="사업보고서 내용")
+
+
+class ExpertKeywordCompareRequest(BaseModel):
+    """로컬/LLM 키워드 추출 비교 요청 모델"""
+    business_reports: List[str] = Field(..., description="비교할 사업보고서 내용 목록", min_length=1, max_length=50)
+    num_keywords: int = Field(10, description="추출할 키워드 개수", ge=1, le=10)
+
+
+class ExpertBatchMatchRequest(BaseModel):
+    """배치 전문가 매칭 요청 모델"""
+    reports: List[ExpertBatchReport] = Field(..., description="매칭할 보고서 목록", min_length=1, max_length=200)
+    num_keywords: int = Field(10, description="추출할 키워드 개수", ge=1, le=10)
+    top_k: int = Field(10, description="반환할 상위 전문가 수", ge=1, le=50)
+    similarity_threshold: float = Field(0.5, description="유사도 임계값", ge=0.0, le=1.0)
+    search_mode: Optional[str] = Field(None, description="검색 방식 (exact: 정확 검색, ann: 근사 검색, 미지정 시 카탈로그 규모에 따라 자동)", pattern="^(exact|ann)$")
+    ann_nprobe: Optional[int] = Field(None, description="근사 검색 시 탐색할 클러스터 수 (클수록 정확하고 느림)", ge=1, le=4096)
+    match_mode: Optional[str] = Field(None, description="매칭 방식 (prefilter: 키워드와 글자를 공유하는 항목만 의미 검색, exhaustive: 전체 검색, 미지정 시 카탈로그 규모에 따라 자동)", pattern="^(prefilter|exhaustive)$")
+    max_details_per_expert: Optional[int] = Field(None, description="전문가별 매칭 상세 최대 개수 (유사도 상위 N개, 전체 상세는 details_id로 /match/{details_id}/details에서 조회)", ge=0, le=100)
+    keyword_mode: str = Field("llm", description="키워드 추출 방식 (llm: LLM 추출, local: LLM 없이 보고서 코퍼스 기반 TF-IDF 추출 — 저지연)", pattern="^(llm|local)$")
+    stream: bool = Field(False, description="true면 완료되는 순서대로 NDJSON으로 스트리밍")
 
 
 class MatchDetail(BaseModel):
@@ -251,15 +1363,40 @@ class ExpertRanking(BaseModel):
     경력파일명: str
     매칭_개수: int
     매칭_상세: List[MatchDetail]
+    매칭_상세_생략_개수: int = 0
 
 
 class ExpertMatchResponse(BaseModel):
     """전문가 매칭 응답 모델"""
     keywords: List[str]
+    keyword_mode: str = "llm"
     matching_method: str
+    search_mode: str = "exact"
+    match_mode: str = "exhaustive"
     similarity_threshold: float
     total_experts_evaluated: int
+    keyword_cache: Optional[Dict] = Field(None, description="키워드 추출 캐시 상태(status) 및 누적 적중/미스 통계")
     final_ranking: List[ExpertRanking]
+    result_id: Optional[str] = Field(None, description="임계값 재조정용 결과 식별자 (similarity_floor 지정 시)")
+    details_id: Optional[str] = Field(None, description="전체 매칭 상세 조회용 식별자 (max_details_per_expert 지정 시)")
+    similarity_floor: Optional[float] = None
+    similarity_profiles: Optional[List[Dict]] = Field(None, description="전문가별 하한 이상 유사도 (내림차순)")
+
+
+class ExpertBatchMatchItem(BaseModel):
+    """배치 매칭 개별 결과"""
+    index: int = Field(..., description="요청 reports 내 순서")
+    report_id: Optional[str] = None
+    success: bool
+    message: str = ""
+    result: Optional[ExpertMatchResponse] = None
+
+
+class ExpertBatchMatchResponse(BaseModel):
+    """배치 전문가 매칭 응답 모델"""
+    total_reports: int
+    success_count: int
+    results: List[ExpertBatchMatchItem]
 
 
 async def match_experts(request: ExpertMatchRequest):
@@ -272,12 +1409,20 @@ async def match_experts(request: ExpertMatchRequest):
     Returns:
         매칭 결과
     """
+    ensure_matcher_ready()
     try:
-        result = matcher.match_experts(
+        result = await matcher.amatch_experts(
             business_report=request.business_report,
             num_keywords=request.num_keywords,
             top_k=request.top_k,
-            similarity_threshold=request.similarity_threshold
+            similarity_threshold=request.similarity_threshold,
+            search_mode=request.search_mode,
+            ann_nprobe=request.ann_nprobe,
+            match_mode=request.match_mode,
+            similarity_floor=request.similarity_floor,
+            include_profiles=request.include_profiles,
+            max_details_per_expert=request.max_details_per_expert,
+            keyword_mode=request.keyword_mode
         )
         
         return result
@@ -289,19 +1434,201 @@ async def match_experts(request: ExpertMatchRequest):
         )
 
 
-async def get_all_experts():
+async def rerank_match_result(request: ExpertRerankRequest):
     """
-    전체 전문가 목록 조회
+    저장된 매칭 결과를 새 임계값으로 다시 랭킹
     
+    Args:
+        request: 임계값 재조정 요청 데이터
+        
     Returns:
-        전문가 목록
+        매칭 결과 (키워드 추출/유사도 계산 없이 저장된 유사도로 집계)
     """
+    ensure_matcher_ready()
+    try:
+        result = await asyncio.to_thread(
+            matcher.rerank_match_result, request.result_id, request.similarity_threshold, request.top_k,
+            request.max_details_per_expert
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    if result is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"매칭 결과 '{request.result_id}'을(를) 찾을 수 없습니다. (만료되었을 수 있습니다)"
+        )
+    return result
+
+
+async def get_related_experts(expert_id: str, limit: int = 10):
+    """
+    비슷한 전문가 조회
+    
+    Args:
+        expert_id: 전문가 id
+        limit: 반환할 최대 인원
+        
+    Returns:
+        전문가 정보와 유사도 순 비슷한 전문가 목록
+    """
+    ensure_matcher_ready()
+    try:
+        result = matcher.get_related_experts(expert_id, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    if result is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"전문가 id '{expert_id}'을(를) 찾을 수 없습니다."
+        )
+    return result
+
+
+async def get_match_details(details_id: str, rank: Optional[int] = None):
+    """
+    매칭 결과의 전체 매칭 상세 조회
+    
+    Args:
+        details_id: max_details_per_expert를 지정한 매칭 응답의 details_id
+        rank: 지정하면 해당 순위 전문가의 상세만 반환
+        
+    Returns:
+        전문가별 전체 매칭 상세
+    """
+    result = await asyncio.to_thread(matcher.get_match_details, details_id, rank)
+    if result is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"매칭 결과 '{details_id}'의 상세를 찾을 수 없습니다. (만료되었을 수 있습니다)"
+        )
+    return result
+
+
+async def compare_keyword_modes(request: ExpertKeywordCompareRequest):
+    """
+    로컬(TF-IDF) 키워드와 LLM 키워드의 일치율 비교
+    
+    Args:
+        request: 비교 요청 데이터
+        
+    Returns:
+        보고서별 키워드/일치율/로컬 추출 시간 및 평균
+    """
+    try:
+        return await matcher.acompare_keyword_modes(request.business_reports, request.num_keywords)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"키워드 추출 비교 중 오류가 발생했습니다: {str(e)}"
+        )
+
+
+async def match_experts_batch(request: ExpertBatchMatchRequest):
+    """
+    여러 사업보고서에 대해 전문가 매칭을 한 번에 수행
+    
+    Args:
+        request: 배치 전문가 매칭 요청 데이터
+        
+    Returns:
+        보고서별 매칭 결과 (stream=true면 NDJSON 스트리밍 응답)
+    """
+    ensure_matcher_ready()
+    business_reports = [report.business_report for report in request.reports]
+    options = dict(
+        num_keywords=request.num_keywords,
+        top_k=request.top_k,
+        similarity_threshold=request.similarity_threshold,
+        search_mode=request.search_mode,
+        ann_nprobe=request.ann_nprobe,
+        match_mode=request.match_mode,
+        max_details_per_expert=request.max_details_per_expert,
+        keyword_mode=request.keyword_mode
+    )
+    
+    if request.stream:
+        async def ndjson_lines():
+            async for item in matcher.aiter_match_experts_batch(business_reports, **options):
+                item["report_id"] = request.reports[item["index"]].report_id
+                yield json.dumps(item, ensure_ascii=False) + "\n"
+        
+        return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+    
+    try:
+        results = await matcher.amatch_experts_batch(business_reports, **options)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"배치 전문가 매칭 중 오류가 발생했습니다: {str(e)}"
+        )
+    
+    for item in results:
+        item["report_id"] = request.reports[item["index"]].report_id
+    
     return {
-        "total_count": len(matcher.experts),
-        "experts": matcher.experts
+        "total_reports": len(results),
+        "success_count": sum(1 for item in results if item["success"]),
+        "results": results
     }
 
 
+def _catalog_etag(catalog: ExpertCatalog) -> str:
+    return f'"{catalog.version}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더가 현재 ETag와 일치하는지 확인합니다 (약한 비교)."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in [tag[2:] if tag.startswith("W/") else tag for tag in candidates]
+
+
+async def get_all_experts(
+    page: int = 1,
+    page_size: Optional[int] = None,
+    field: Optional[List[str]] = None,
+    career: Optional[List[str]] = None,
+    if_none_match: Optional[str] = None
+):
+    """
+    전체 전문가 목록 조회
+    
+    ETag는 카탈로그 버전이므로 카탈로그가 바뀌지 않았다면
+    If-None-Match 요청에 본문 없이 304를 반환합니다.
+    
+    Args:
+        page: 1부터 시작하는 페이지 번호
+        page_size: 페이지 크기 (None이면 전체)
+        field: 분야 용어 필터 (여러 개면 모두 만족)
+        career: 경력 용어 필터 (여러 개면 모두 만족)
+        if_none_match: If-None-Match 헤더 값
+        
+    Returns:
+        전문가 목록
+    """
+    ensure_matcher_ready()
+    catalog = matcher.catalog
+    etag = _catalog_etag(catalog)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    
+    total_count, experts = catalog.directory.page(page, page_size, field, career)
+    return JSONResponse(
+        content={
+            "total_count": total_count,
+            "page": page,
+            "page_size": page_size,
+            "catalog_version": catalog.version,
+            "experts": experts
+        },
+        headers=headers
+    )
+
+
 async def get_expert_by_name(expert_name: str):
     """
     특정 전문가 정보 조회
@@ -312,9 +1639,10 @@ async def get_expert_by_name(expert_name: str):
     Returns:
         전문가 정보
     """
-    for expert in matcher.experts:
-        if expert.get("이름") == expert_name:
-            return expert
+    ensure_matcher_ready()
+    expert = matcher.catalog.directory.get_by_name(expert_name)
+    if expert is not None:
+        return expert
     
     raise HTTPException(
         status_code=404,
@@ -0,0 +1,104 @@
+"""
+전문가 항목 어휘 임베딩 근사 최근접 이웃(ANN) 인덱스
+
+NumPy만으로 구현한 IVF(Inverted File) 인덱스입니다.
+어휘(고유 항목 문자열) 벡터를 구면 k-means로 nlist개의 클러스터로 나누고,
+검색 시 키워드와 가장 가까운 nprobe개 클러스터의 어휘만 정확히 비교합니다.
+
+튜닝 파라미터:
+- nlist: 클러스터 수 (기본값 sqrt(어휘 수)). 클수록 클러스터당 후보가 줄어 빨라짐
+- nprobe: 검색할 클러스터 수. 클수록 recall이 오르고 느려짐
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+from services.expert_index import l2_normalize
+
+# 할당 계산 시 한 번에 처리할 항목 수 (메모리 상한)
+ASSIGN_CHUNK_SIZE = 65536
+
+
+class IVFIndex:
+    """항목 벡터용 IVF 인덱스 (코사인 유사도 기준)"""
+
+    def __init__(self, matrix: np.ndarray, nlist: Optional[int] = None,
+                 iterations: int = 10, sample_size: Optional[int] = None, seed: int = 0):
+        """
+        Args:
+            matrix: (항목 수, 차원) L2 정규화된 항목 임베딩 행렬
+            nlist: 클러스터 수 (기본값 sqrt(항목 수))
+            iterations: k-means 반복 횟수
+            sample_size: k-means 학습에 사용할 샘플 수 (기본값 nlist * 64)
+            seed: 난수 시드
+        """
+        self.matrix = matrix
+        num_items = matrix.shape[0]
+        self.nlist = max(1, min(num_items, nlist or int(np.sqrt(num_items))))
+
+        rng = np.random.default_rng(seed)
+        sample_size = min(num_items, sample_size or self.nlist * 64)
+        sample = np.asarray(matrix[np.sort(rng.choice(num_items, sample_size, replace=False))], dtype=np.float32)
+        self.centroids = self._train(sample, iterations, rng)
+
+        # 항목을 클러스터별로 정렬하여 역색인(inverted list) 구성
+        assignments = self._assign(matrix)
+        self.list_items = np.argsort(assignments, kind="stable")
+        self.list_offsets = np.searchsorted(assignments[self.list_items], np.arange(self.nlist + 1))
+
+    def _train(self, sample: np.ndarray, iterations: int, rng: np.random.Generator) -> np.ndarray:
+        """구면 k-means로 클러스터 중심을 학습합니다."""
+        centroids = sample[rng.choice(len(sample), self.nlist, replace=False)].copy()
+        for _ in range(iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=self.nlist)
+            # 빈 클러스터는 임의의 샘플로 다시 초기화
+            empty = counts == 0
+            if empty.any():
+                sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+            centroids = l2_normalize(sums)
+        return centroids
+
+    def _assign(self, matrix: np.ndarray) -> np.ndarray:
+        labels = np.empty(matrix.shape[0], dtype=np.int64)
+        for start in range(0, matrix.shape[0], ASSIGN_CHUNK_SIZE):
+            chunk = np.asarray(matrix[start:start + ASSIGN_CHUNK_SIZE], dtype=np.float32)
+            labels[start:start + len(chunk)] = np.argmax(chunk @ self.centroids.T, axis=1)
+        return labels
+
+    def search(self, keyword_embeddings, similarity_threshold: float, nprobe: int
+               ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        키워드별로 임계값 이상인 후보 항목을 찾습니다.
+
+        Args:
+            keyword_embeddings: (키워드 수, 차원) 키워드 임베딩
+            similarity_threshold: 유사도 임계값
+            nprobe: 검색할 클러스터 수
+
+        Returns:
+            (키워드 번호, 항목 번호, 유사도) 배열. 키워드 → 항목 번호 순으로 정렬됨
+        """
+        if not len(keyword_embeddings):
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, np.zeros(0, dtype=np.float32)
+
+        queries = l2_normalize(keyword_embeddings)
+        nprobe = max(1, min(self.nlist, nprobe))
+        probe_lists = np.argsort(-(queries @ self.centroids.T), axis=1)[:, :nprobe]
+
+        keyword_hits, item_hits, sim_hits = [], [], []
+        for keyword_idx, (query, lists) in enumerate(zip(queries, probe_lists)):
+            candidates = np.sort(np.concatenate([
+                self.list_items[self.list_offsets[l]:self.list_offsets[l + 1]] for l in lists
+            ]))
+            sims = np.asarray(self.matrix[candidates], dtype=np.float32) @ query
+            mask = sims >= similarity_threshold
+            item_hits.append(candidates[mask])
+            sim_hits.append(sims[mask])
+            keyword_hits.append(np.full(int(mask.sum()), keyword_idx, dtype=np.int64))
+
+        return np.concatenate(keyword_hits), np.concatenate(item_hits), np.concatenate(sim_hits)
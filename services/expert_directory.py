@@ -0,0 +1,137 @@
+"""
+전문가 디렉터리 인덱스
+
+카탈로그 스냅샷마다 한 번 만들어 두고 목록/상세 조회에 사용합니다.
+
+- 이름/ID 해시 인덱스: 이름 또는 id → 전문가 (O(1) 조회)
+- 역색인: 분야/경력 용어 → 전문가 번호 배열 (필터 조회)
+
+용어는 항목 문자열 전체와 항목을 공백/구두점으로 나눈 단어를 모두 포함하며,
+대소문자와 공백 차이를 무시합니다 (예: "AI 헬스케어" → "ai 헬스케어", "ai", "헬스케어").
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+_TOKEN_SPLIT = re.compile(r"[\s,/·|()\[\]]+")
+
+
+def normalize_to_string_list(data) -> List[str]:
+    """딕셔너리 또는 리스트를 문자열 리스트로 정규화합니다."""
+    if isinstance(data, dict):
+        data = list(data.values()) if data else []
+    if not isinstance(data, list):
+        return []
+    return [str(item) for item in data if item]
+
+
+def normalize_term(term: str) -> str:
+    """검색 용어 정규화 (소문자 + 공백 정리)"""
+    return " ".join(str(term).split()).casefold()
+
+
+def item_terms(item: str) -> List[str]:
+    """항목 문자열에서 색인할 용어 목록 (전체 문자열 + 단어)"""
+    normalized = normalize_term(item)
+    if not normalized:
+        return []
+    return [normalized] + [token for token in _TOKEN_SPLIT.split(normalized) if token and token != normalized]
+
+
+class ExpertDirectory:
+    """전문가 이름 인덱스 + 분야/경력 역색인"""
+
+    def __init__(self, experts: List[Dict]):
+        """
+        Args:
+            experts: 카탈로그의 전문가 목록 (카탈로그 순서 그대로 번호를 매김)
+        """
+        self.experts = experts
+        self.by_name: Dict[str, Dict] = {}
+        # id → 카탈로그 내 전문가 번호 (경로 파라미터와 비교하도록 문자열 키)
+        self.position_by_id: Dict[str, int] = {}
+        field_postings: Dict[str, List[int]] = {}
+        career_postings: Dict[str, List[int]] = {}
+
+        for expert_idx, expert in enumerate(experts):
+            name = expert.get("name")
+            # 동명이인은 카탈로그 순서상 첫 번째 전문가를 반환 (기존 선형 탐색과 동일)
+            if name and name not in self.by_name:
+                self.by_name[name] = expert
+            if expert.get("id") is not None:
+                self.position_by_id[str(expert["id"])] = expert_idx
+            self._add_postings(field_postings, expert_idx, expert.get("field", []))
+            self._add_postings(career_postings, expert_idx, expert.get("career", []))
+
+        self.field_index = {term: np.asarray(ids, dtype=np.int64) for term, ids in field_postings.items()}
+        self.career_index = {term: np.asarray(ids, dtype=np.int64) for term, ids in career_postings.items()}
+
+    @staticmethod
+    def _add_postings(postings: Dict[str, List[int]], expert_idx: int, data):
+        for item in normalize_to_string_list(data):
+            for term in item_terms(item):
+                ids = postings.setdefault(term, [])
+                # 같은 전문가가 여러 항목에서 같은 용어를 가져도 한 번만 기록
+                if not ids or ids[-1] != expert_idx:
+                    ids.append(expert_idx)
+
+    def get_by_name(self, name: str) -> Optional[Dict]:
+        """이름으로 전문가를 조회합니다 (없으면 None)."""
+        return self.by_name.get(name)
+
+    def position_of(self, expert_id) -> Optional[int]:
+        """id로 카탈로그 내 전문가 번호를 조회합니다 (없으면 None)."""
+        return self.position_by_id.get(str(expert_id))
+
+    def filter(self, fields: Optional[List[str]] = None, careers: Optional[List[str]] = None) -> Optional[np.ndarray]:
+        """
+        조건에 맞는 전문가 번호를 반환합니다.
+
+        각 조건 용어를 모두 만족하는(AND) 전문가만 남깁니다.
+
+        Args:
+            fields: 분야 용어 목록
+            careers: 경력 용어 목록
+
+        Returns:
+            카탈로그 순서로 정렬된 전문가 번호 배열 (조건이 없으면 None = 전체)
+        """
+        postings = [self.field_index.get(normalize_term(term), np.zeros(0, dtype=np.int64))
+                    for term in fields or [] if normalize_term(term)]
+        postings += [self.career_index.get(normalize_term(term), np.zeros(0, dtype=np.int64))
+                     for term in careers or [] if normalize_term(term)]
+        if not postings:
+            return None
+
+        # 가장 짧은 목록부터 교집합
+        postings.sort(key=len)
+        result = postings[0]
+        for ids in postings[1:]:
+            if not len(result):
+                break
+            result = np.intersect1d(result, ids, assume_unique=True)
+        return result
+
+    def page(self, page: int = 1, page_size: Optional[int] = None,
+             fields: Optional[List[str]] = None, careers: Optional[List[str]] = None) -> Tuple[int, List[Dict]]:
+        """
+        필터를 적용한 뒤 한 페이지의 전문가를 반환합니다.
+
+        Args:
+            page: 1부터 시작하는 페이지 번호
+            page_size: 페이지 크기 (None이면 전체)
+            fields: 분야 용어 필터
+            careers: 경력 용어 필터
+
+        Returns:
+            (필터 적용 후 전체 인원수, 해당 페이지 전문가 목록)
+        """
+        ids = self.filter(fields, careers)
+        total = len(self.experts) if ids is None else len(ids)
+        start = (page - 1) * page_size if page_size else 0
+        end = start + page_size if page_size else total
+        if ids is None:
+            return total, self.experts[start:end]
+        return total, [self.experts[i] for i in ids[start:end].tolist()]
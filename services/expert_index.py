@@ -0,0 +1,271 @@
+"""
+전문가 항목 임베딩 스코어링 엔진
+
+여러 전문가가 같은 경력/분야 문자열을 공유하므로 고유 문자열(어휘) 단위로만
+임베딩을 보관하고, 전문가 항목은 어휘 번호 배열(CSR: 전문가별 구간 offset)로 표현합니다.
+키워드 × 어휘 유사도를 한 번의 행렬 곱으로 계산한 뒤
+임계값을 넘은 어휘를 그 어휘를 가진 항목으로 펼치고(fan-out),
+구간 집계로 전문가별 매칭 개수와 상세를 산출합니다.
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from services.vector_store import VectorStore
+
+# 정확 검색 시 한 번에 계산할 유사도 행렬 최대 원소 수 (float32 기준 128MB)
+SCORE_CHUNK_ELEMENTS = 2 ** 25
+
+
+def l2_normalize(matrix: np.ndarray) -> np.ndarray:
+    """행 단위 L2 정규화 (영벡터는 그대로 유지)"""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class ExpertItemIndex:
+    """어휘 임베딩 행렬 + 전문가별 항목(어휘 번호) 구간 인덱스"""
+
+    def __init__(self, vocab_embeddings: np.ndarray, item_offsets: np.ndarray, item_vocab: np.ndarray,
+                 vector_dtype: str = "float32", rescore: bool = True):
+        """
+        Args:
+            vocab_embeddings: (어휘 수, 차원) 고유 항목 문자열 임베딩 행렬
+            item_offsets: 길이 (전문가 수 + 1)의 구간 경계. 전문가 i의 항목은
+                [item_offsets[i], item_offsets[i + 1]) 구간
+            item_vocab: (전체 항목 수,) 항목별 어휘 번호 (전문가 순서대로 이어붙인 것)
+            vector_dtype: 정확 검색용 벡터 저장 형식 ("float32", "float16", "int8")
+            rescore: 압축 형식일 때 후보를 float32 행렬로 재채점할지 여부 (False면 검색에 float32 행렬을 쓰지 않음)
+        """
+        self.offsets = np.asarray(item_offsets, dtype=np.int64)
+        self.num_experts = len(self.offsets) - 1
+        self.num_items = int(self.offsets[-1]) if len(self.offsets) else 0
+        # 항목 → 전문가 번호 매핑
+        self.item_expert = np.repeat(np.arange(self.num_experts), np.diff(self.offsets))
+
+        # 어휘 → 항목 역색인 (어휘 v의 항목은 vocab_items[vocab_offsets[v]:vocab_offsets[v + 1]], 항목 번호 순)
+        self.item_vocab = np.asarray(item_vocab, dtype=np.int64)
+        self.num_vocab = len(vocab_embeddings)
+        self.vocab_items = np.argsort(self.item_vocab, kind="stable")
+        self.vocab_offsets = np.searchsorted(self.item_vocab[self.vocab_items], np.arange(self.num_vocab + 1))
+
+        # np.asarray는 np.memmap을 일반 배열로 바꾸므로 asanyarray로 디스크 캐시 여부를 유지
+        matrix = np.asanyarray(vocab_embeddings)
+        if matrix.size:
+            # OpenAI 임베딩은 이미 단위 벡터이므로 필요할 때만 정규화 사본을 만듦
+            # (memory-mapped 행렬을 그대로 사용하기 위함)
+            norms = np.linalg.norm(matrix, axis=1)
+            if not np.allclose(norms[norms > 0], 1.0, atol=1e-3):
+                matrix = l2_normalize(matrix)
+        self.matrix = matrix
+        self.store = VectorStore(matrix, vector_dtype, rescore)
+        # 선택적 근사 최근접 이웃 인덱스 (services.expert_ann.IVFIndex)
+        self.ann = None
+        # 선택적 다중 프로세스 샤드 검색 (services.expert_shards.ShardedSearch, float32 정확 검색에 사용)
+        self.shards = None
+
+    def search(self, keyword_embeddings, similarity_threshold: float, nprobe: Optional[int] = None,
+               candidates: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        키워드별로 임계값 이상인 어휘를 찾습니다.
+
+        정확 검색은 키워드 × 전체 어휘 유사도를 행렬 곱으로 계산하며,
+        유사도 행렬이 SCORE_CHUNK_ELEMENTS를 넘으면 키워드 단위로 나누어 계산합니다.
+        샤드 검색이 설정되어 있으면 어휘 행 구간별로 작업 프로세스에서 병렬 계산합니다.
+
+        Args:
+            keyword_embeddings: (키워드 수, 차원) 키워드 임베딩
+            similarity_threshold: 유사도 임계값
+            nprobe: 지정하면 ANN 인덱스로 nprobe개 클러스터만 검색 (ANN 인덱스가 있을 때만)
+            candidates: 지정하면 이 어휘 번호(정렬됨)만 정확 검색 (어휘 사전 필터)
+
+        Returns:
+            (키워드 번호, 어휘 번호, 유사도) 배열. 키워드 → 어휘 번호 순으로 정렬됨
+        """
+        if candidates is None and nprobe is not None and self.ann is not None:
+            return self.ann.search(keyword_embeddings, similarity_threshold, nprobe)
+
+        if not self.num_vocab or not len(keyword_embeddings) or (candidates is not None and not len(candidates)):
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, np.zeros(0, dtype=np.float32)
+
+        queries = l2_normalize(keyword_embeddings)
+        if self.store.dtype != "float32":
+            return self.store.search(queries, similarity_threshold, candidates=candidates)
+
+        if candidates is not None:
+            sims = queries @ np.asarray(self.matrix[candidates], dtype=np.float32).T
+            keyword_idx, rows = np.nonzero(sims >= similarity_threshold)
+            return keyword_idx, candidates[rows], sims[keyword_idx, rows]
+
+        if self.shards is not None:
+            return self.shards.search(queries, similarity_threshold)
+
+        chunk_rows = max(1, SCORE_CHUNK_ELEMENTS // self.num_vocab)
+        keyword_hits, item_hits, sim_hits = [], [], []
+        for start in range(0, len(queries), chunk_rows):
+            sims = queries[start:start + chunk_rows] @ self.matrix.T
+            keyword_idx, item_idx = np.nonzero(sims >= similarity_threshold)
+            keyword_hits.append(keyword_idx + start)
+            item_hits.append(item_idx)
+            sim_hits.append(sims[keyword_idx, item_idx])
+        return np.concatenate(keyword_hits), np.concatenate(item_hits), np.concatenate(sim_hits)
+
+    def merge_exact(self, hits: Tuple[np.ndarray, np.ndarray, np.ndarray],
+                    exact_hits: Optional[Tuple[np.ndarray, np.ndarray]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        의미 검색 결과에 문자열 일치(키워드, 어휘) 쌍을 유사도 1.0으로 합칩니다.
+
+        같은 (키워드, 어휘) 쌍은 하나만 남기며 문자열 일치가 우선합니다.
+        """
+        if exact_hits is None or not len(exact_hits[0]):
+            return hits
+        keyword_idx = np.concatenate([exact_hits[0], hits[0]])
+        vocab_idx = np.concatenate([exact_hits[1], hits[1]])
+        sims = np.concatenate([np.ones(len(exact_hits[0]), dtype=np.float32), np.asarray(hits[2], dtype=np.float32)])
+        # (키워드, 어휘) 순으로 안정 정렬하면 같은 쌍 중 문자열 일치가 먼저 옴
+        order = np.lexsort((vocab_idx, keyword_idx))
+        keyword_idx, vocab_idx, sims = keyword_idx[order], vocab_idx[order], sims[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = (keyword_idx[1:] != keyword_idx[:-1]) | (vocab_idx[1:] != vocab_idx[:-1])
+        return keyword_idx[first], vocab_idx[first], sims[first]
+
+    def fan_out(self, keyword_idx: np.ndarray, vocab_idx: np.ndarray, sims: np.ndarray
+                ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (키워드, 어휘, 유사도) 매칭을 그 어휘를 가진 모든 항목의 매칭으로 펼칩니다.
+
+        Returns:
+            (키워드 번호, 전체 항목 번호, 유사도) 배열. 키워드 → 항목 번호 순으로 정렬됨
+        """
+        starts = self.vocab_offsets[vocab_idx]
+        counts = self.vocab_offsets[vocab_idx + 1] - starts
+        total = int(counts.sum())
+        # 각 어휘 구간 [start, start + count)를 이어붙인 위치 배열
+        shifts = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+        item_idx = self.vocab_items[shifts + np.arange(total)]
+        keyword_idx = np.repeat(keyword_idx, counts)
+        sims = np.repeat(sims, counts)
+        order = np.lexsort((item_idx, keyword_idx))
+        return keyword_idx[order], item_idx[order], sims[order]
+
+    def score(self, keyword_embeddings, similarity_threshold: float, nprobe: Optional[int] = None,
+              candidates: Optional[np.ndarray] = None, exact_hits: Optional[Tuple[np.ndarray, np.ndarray]] = None
+              ) -> List[Tuple[int, int, List[Tuple[int, int, float]]]]:
+        """
+        키워드 임베딩으로 전체 전문가를 스코어링합니다.
+
+        Args:
+            keyword_embeddings: (키워드 수, 차원) 키워드 임베딩
+            similarity_threshold: 유사도 임계값
+            nprobe: 지정하면 ANN 인덱스로 nprobe개 클러스터만 검색 (ANN 인덱스가 있을 때만)
+            candidates: 지정하면 이 어휘 번호만 의미 검색
+            exact_hits: 유사도 1.0으로 처리할 (키워드 번호, 어휘 번호) 문자열 일치 쌍
+
+        Returns:
+            (전문가 번호, 매칭 개수, [(키워드 번호, 전체 항목 번호, 유사도), ...]) 리스트.
+            매칭 개수 내림차순이며 동점은 전문가 순서를 유지합니다.
+        """
+        hits = self.search(keyword_embeddings, similarity_threshold, nprobe, candidates)
+        return self.aggregate(*self.fan_out(*self.merge_exact(hits, exact_hits)))
+
+    def score_batch(self, keyword_embeddings, keyword_groups: List[List[int]],
+                    similarity_threshold: float, nprobe: Optional[int] = None,
+                    candidates: Optional[np.ndarray] = None, exact_hits: Optional[Tuple[np.ndarray, np.ndarray]] = None
+                    ) -> List[List[Tuple[int, int, List[Tuple[int, int, float]]]]]:
+        """
+        여러 보고서의 키워드를 한 번에 스코어링합니다.
+
+        전체 보고서 키워드의 합집합을 한 번만 검색(+ 항목으로 펼침)한 뒤
+        보고서별 키워드 구성(keyword_groups)에 맞게 매칭을 나누어 집계합니다.
+
+        Args:
+            keyword_embeddings: (고유 키워드 수, 차원) 키워드 합집합 임베딩
+            keyword_groups: 보고서별 키워드 행 번호 리스트 (보고서 키워드 순서대로)
+            similarity_threshold: 유사도 임계값
+            nprobe: 지정하면 ANN 인덱스로 근사 검색
+            candidates: 지정하면 이 어휘 번호만 의미 검색
+            exact_hits: 유사도 1.0으로 처리할 (합집합 키워드 번호, 어휘 번호) 문자열 일치 쌍
+
+        Returns:
+            보고서별 score() 결과 리스트 (키워드 번호는 보고서 내 키워드 순서 기준)
+        """
+        hits = self.search(keyword_embeddings, similarity_threshold, nprobe, candidates)
+        keyword_idx, item_idx, sims = self.fan_out(*self.merge_exact(hits, exact_hits))
+        bounds = np.searchsorted(keyword_idx, np.arange(len(keyword_embeddings) + 1))
+
+        empty = np.zeros(0, dtype=np.int64)
+        results = []
+        for group in keyword_groups:
+            spans = [(position, bounds[row], bounds[row + 1]) for position, row in enumerate(group)]
+            results.append(self.aggregate(
+                np.concatenate([empty] + [np.full(end - start, position, dtype=np.int64) for position, start, end in spans]),
+                np.concatenate([empty] + [item_idx[start:end] for _, start, end in spans]),
+                np.concatenate([sims[:0]] + [sims[start:end] for _, start, end in spans]),
+            ))
+        return results
+
+    def aggregate(self, keyword_idx: np.ndarray, item_idx: np.ndarray, sims: np.ndarray
+                  ) -> List[Tuple[int, int, List[Tuple[int, int, float]]]]:
+        """
+        (키워드, 항목, 유사도) 매칭 목록을 전문가별로 집계합니다.
+
+        입력은 키워드 → 항목 순으로 정렬되어 있어야 하며,
+        전문가별 상세도 같은 순서(키워드 순, 그 안에서 항목 순)로 반환됩니다.
+        """
+        hit_experts = self.item_expert[item_idx]
+        counts = np.bincount(hit_experts, minlength=self.num_experts)
+
+        # 전문가 번호로 안정 정렬하여 전문가별 구간 생성
+        order = np.argsort(hit_experts, kind="stable")
+        bounds = np.searchsorted(hit_experts[order], np.arange(self.num_experts + 1))
+        keyword_idx = keyword_idx[order].tolist()
+        item_idx = item_idx[order].tolist()
+        sims = sims[order].tolist()
+
+        ranking = np.argsort(-counts, kind="stable")
+        results = []
+        for expert_idx in ranking.tolist():
+            start, end = bounds[expert_idx], bounds[expert_idx + 1]
+            hits = list(zip(keyword_idx[start:end], item_idx[start:end], sims[start:end]))
+            results.append((expert_idx, int(counts[expert_idx]), hits))
+        return results
+
+    @staticmethod
+    def rerank(expert_hits: List[Tuple[int, List[Tuple[int, int, float]]]], similarity_threshold: float,
+               num_experts: int, top_k: Optional[int] = None) -> List[Tuple[int, int, List[Tuple[int, int, float]]]]:
+        """
+        낮은 임계값으로 계산해 둔 매칭을 더 높은 임계값으로 다시 집계합니다 (유사도 재계산 없음).
+
+        임계값 비교는 search()와 같이 float32로 하므로 해당 임계값으로 직접 스코어링한 결과와 같습니다.
+
+        Args:
+            expert_hits: 매칭이 있는 전문가의 (전문가 번호, [(키워드 번호, 항목 번호, 유사도), ...]) 리스트
+            similarity_threshold: 새 유사도 임계값
+            num_experts: 전체 전문가 수 (매칭 0개 전문가를 채우는 데 사용)
+            top_k: 지정하면 상위 top_k명만 반환
+
+        Returns:
+            score()와 같은 형식의 리스트 (매칭 개수 내림차순, 동점은 전문가 순서)
+        """
+        threshold = np.float32(similarity_threshold)
+        ranked = []
+        for expert_idx, hits in expert_hits:
+            kept = [hit for hit in hits if np.float32(hit[2]) >= threshold]
+            if kept:
+                ranked.append((expert_idx, len(kept), kept))
+        ranked.sort(key=lambda entry: (-entry[1], entry[0]))
+
+        limit = num_experts if top_k is None else min(top_k, num_experts)
+        if len(ranked) < limit:
+            # 매칭 0개 전문가를 전문가 순서대로 채움
+            matched = {expert_idx for expert_idx, _, _ in ranked}
+            for expert_idx in range(num_experts):
+                if len(ranked) >= limit:
+                    break
+                if expert_idx not in matched:
+                    ranked.append((expert_idx, 0, []))
+        return ranked[:limit]
@@ -0,0 +1,290 @@
+"""
+로컬(LLM 미사용) 키워드 추출
+
+사업보고서에서 명사/명사구 후보를 뽑아 TF-IDF로 점수를 매깁니다.
+문서 빈도(DF)는 저장된 사업계획서 본문(report_sections)으로 만든 코퍼스 통계를 사용하며,
+코퍼스가 없으면 보고서 내 빈도만으로 점수를 매깁니다.
+
+- 후보: 조사/어미를 떼어 낸 단어(2글자 이상)와, 같은 구절 안에서 이웃한 두 단어 구(2회 이상 등장)
+- 점수: (1 + log tf) × idf × 첫 등장 위치 가중치 (구는 PHRASE_WEIGHT 추가 가중)
+- 선택: 점수 순으로 고르되, 이미 고른 키워드와 글자가 포함 관계인 후보는 건너뜀
+
+LLM 호출이 없으므로 수천 자 보고서도 수 ms 안에 처리됩니다.
+evaluate_keyword_overlap()으로 LLM 키워드와의 일치율을 비교할 수 있습니다.
+"""
+
+import json
+import math
+import os
+import re
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from services.text_utils import compact, strip_html
+
+# 구절 경계 (구두점/줄바꿈) — 구는 경계를 넘어 만들지 않음
+_PHRASE_SPLIT = re.compile(r"[.,!?;:()\[\]{}<>\"'“”‘’·•/|\n\r\t-]+")
+_TOKEN = re.compile(r"[가-힣]+|[A-Za-z][A-Za-z0-9+#]*")
+
+# 단어 끝에서 떼어 낼 조사/어미 (긴 것부터 비교)
+_SUFFIXES = sorted([
+    "으로써", "로써", "으로서", "로서", "에서는", "에서도", "에서의", "에게서", "에서", "에게", "으로", "로는",
+    "까지", "부터", "보다", "처럼", "마다", "이나", "이며", "이고", "이다", "입니다", "이라는", "라는",
+    "하고자", "하기", "하는", "하여", "하며", "하고", "하게", "합니다", "한다", "했다", "하였다", "할", "한",
+    "되는", "되어", "되며", "되고", "된다", "됩니다", "된", "될",
+    "적인", "적으로", "적",
+    "과의", "와의", "과", "와", "을", "를", "이", "가", "은", "는", "의", "에", "만", "로", "들",
+], key=len, reverse=True)
+
+# 조사처럼 끝나지만 떼면 안 되는 단어 끝 ("전문가" → "전문", "디스플레이" → "디스플레" 방지)
+_KEEP_ENDINGS = ("전문가", "기업가", "투자가", "사업가", "창업가", "플레이", "웨이", "서베이")
+
+STOPWORDS = frozenset([
+    "및", "등", "통해", "통한", "위해", "위한", "대한", "대해", "있는", "있다", "있습니다", "없는", "것", "수",
+    "이를", "이러한", "그러나", "또한", "따라서", "우리", "당사", "본", "해당", "관련", "다양", "같은", "경우",
+    "하는", "하여", "되는", "모든", "새로운", "매우", "때문", "현재", "향후", "이상", "이하", "가능", "필요",
+    "중요", "제공", "활용", "기반", "진행", "추진",
+    "the", "and", "for", "with", "of", "to", "in", "on", "a", "an", "is", "are",
+])
+
+# 키워드 최소 길이 (글자 수)
+MIN_TERM_LENGTH = 2
+
+# 두 단어 구를 후보로 삼을 최소 등장 횟수
+MIN_PHRASE_COUNT = 2
+
+# 두 단어 구 점수 가중치 (구의 빈도는 구성 단어보다 낮으므로 보정)
+PHRASE_WEIGHT = 1.5
+
+# 첫 등장 위치 가중치 (문서 맨 앞 1 + POSITION_WEIGHT, 맨 끝 1)
+POSITION_WEIGHT = 0.3
+
+# 코퍼스 통계에 남길 최소 문서 빈도 (한 문서에만 나온 용어는 버려 파일 크기를 줄임)
+CORPUS_MIN_DF = 2
+
+
+def _strip_suffix(token: str) -> str:
+    if not ("가" <= token[0] <= "힣"):
+        return token
+    if token.endswith(_KEEP_ENDINGS):
+        return token
+    for suffix in _SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= MIN_TERM_LENGTH:
+            return token[:-len(suffix)]
+    return token
+
+
+def _is_term(token: str) -> bool:
+    return len(token) >= MIN_TERM_LENGTH and token.lower() not in STOPWORDS
+
+
+def phrases(text: str) -> List[List[str]]:
+    """
+    텍스트를 구절별 단어 목록으로 나눕니다.
+
+    조사/어미를 뗀 단어만 남기며, 불용어/한 글자 단어 자리는 None으로 두어
+    그 사이를 건너뛰는 구가 만들어지지 않도록 합니다.
+    """
+    result = []
+    for segment in _PHRASE_SPLIT.split(strip_html(text)):
+        tokens = [_strip_suffix(token) for token in _TOKEN.findall(segment)]
+        tokens = [token if _is_term(token) else None for token in tokens]
+        if any(tokens):
+            result.append(tokens)
+    return result
+
+
+def candidate_terms(text: str) -> Tuple[Counter, Dict[str, int], int]:
+    """
+    키워드 후보와 빈도를 셉니다.
+
+    Returns:
+        (후보 → 등장 횟수, 후보 → 첫 등장 단어 위치, 전체 단어 수)
+    """
+    counts: Counter = Counter()
+    first_seen: Dict[str, int] = {}
+    position = 0
+    for tokens in phrases(text):
+        for i, token in enumerate(tokens):
+            position += 1
+            if token is None:
+                continue
+            terms = [token]
+            if i + 1 < len(tokens) and tokens[i + 1] is not None:
+                terms.append(f"{token} {tokens[i + 1]}")
+            for term in terms:
+                counts[term] += 1
+                first_seen.setdefault(term, position)
+    return counts, first_seen, position
+
+
+def document_terms(text: str) -> set:
+    """문서 빈도 계산용 후보 집합 (구는 등장 횟수와 관계없이 포함)"""
+    return set(candidate_terms(text)[0])
+
+
+class LocalKeywordExtractor:
+    """코퍼스 문서 빈도 기반 TF-IDF 키워드 추출기"""
+
+    def __init__(self, document_frequencies: Optional[Dict[str, int]] = None, num_documents: int = 0,
+                 built_at: Optional[str] = None):
+        """
+        Args:
+            document_frequencies: 용어 → 등장 문서 수 (없으면 보고서 내 빈도만 사용)
+            num_documents: 코퍼스 문서 수
+            built_at: 코퍼스 생성 시각 (ISO 8601)
+        """
+        self.document_frequencies = document_frequencies or {}
+        self.num_documents = num_documents
+        self.built_at = built_at
+
+    @classmethod
+    def from_documents(cls, documents: Iterable[str], built_at: Optional[str] = None) -> "LocalKeywordExtractor":
+        """문서(사업계획서 본문) 목록으로 문서 빈도를 계산합니다."""
+        frequencies: Counter = Counter()
+        num_documents = 0
+        for document in documents:
+            if not document:
+                continue
+            frequencies.update(document_terms(document))
+            num_documents += 1
+        return cls(
+            {term: df for term, df in frequencies.items() if df >= CORPUS_MIN_DF},
+            num_documents,
+            built_at
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "LocalKeywordExtractor":
+        """저장된 코퍼스 통계를 읽습니다."""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["document_frequencies"], data["num_documents"], data.get("built_at"))
+
+    def save(self, path: Path):
+        """코퍼스 통계를 저장합니다 (임시 파일에 쓴 뒤 교체)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "built_at": self.built_at,
+                "num_documents": self.num_documents,
+                "document_frequencies": self.document_frequencies
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def idf(self, term: str) -> float:
+        """평활화한 역문서 빈도 (코퍼스가 없으면 1)"""
+        if not self.num_documents:
+            return 1.0
+        df = self.document_frequencies.get(term, 0)
+        return math.log((self.num_documents + 1) / (df + 1)) + 1.0
+
+    def score_terms(self, text: str) -> List[Tuple[str, float]]:
+        """후보별 점수 (내림차순, 동점은 첫 등장 순)"""
+        counts, first_seen, num_tokens = candidate_terms(text)
+        scored = []
+        for term, count in counts.items():
+            if " " in term and count < MIN_PHRASE_COUNT:
+                continue
+            weight = 1.0 + POSITION_WEIGHT * (1.0 - first_seen[term] / max(num_tokens, 1))
+            if " " in term:
+                weight *= PHRASE_WEIGHT
+            scored.append((term, (1.0 + math.log(count)) * self.idf(term) * weight))
+        scored.sort(key=lambda pair: (-pair[1], first_seen[pair[0]]))
+        return scored
+
+    def extract(self, text: str, num_keywords: int = 5) -> List[str]:
+        """
+        사업보고서에서 키워드를 추출합니다.
+
+        Args:
+            text: 사업보고서 내용
+            num_keywords: 추출할 키워드 개수
+
+        Returns:
+            키워드 리스트 (점수 내림차순)
+        """
+        selected: List[str] = []
+        selected_compact: List[str] = []
+        for term, _ in self.score_terms(text):
+            term_compact = compact(term)
+            # "디지털 전환"을 고른 뒤 "디지털"/"전환"은 건너뜀 (반대 방향도 동일)
+            if any(term_compact in other or other in term_compact for other in selected_compact):
+                continue
+            selected.append(term)
+            selected_compact.append(term_compact)
+            if len(selected) >= num_keywords:
+                break
+        return selected
+
+    def stats(self) -> Dict:
+        """코퍼스 통계 요약"""
+        return {
+            "num_documents": self.num_documents,
+            "num_terms": len(self.document_frequencies),
+            "built_at": self.built_at
+        }
+
+
+def _keywords_match(a: str, b: str) -> bool:
+    a, b = compact(a), compact(b)
+    return bool(a and b) and (a == b or a in b or b in a)
+
+
+def keyword_overlap(predicted: List[str], reference: List[str]) -> Dict:
+    """
+    두 키워드 목록의 일치율을 계산합니다.
+
+    공백/대소문자를 무시하고, 한쪽이 다른 쪽을 포함하면("헬스케어" ↔ "AI 헬스케어") 일치로 봅니다.
+
+    Returns:
+        {"exact", "matched", "precision", "recall", "f1"}
+    """
+    exact = len({compact(k) for k in predicted} & {compact(k) for k in reference})
+    precision_hits = sum(any(_keywords_match(p, r) for r in reference) for p in predicted)
+    recall_hits = sum(any(_keywords_match(p, r) for p in predicted) for r in reference)
+    precision = precision_hits / len(predicted) if predicted else 0.0
+    recall = recall_hits / len(reference) if reference else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {
+        "exact": exact,
+        "matched": recall_hits,
+        "precision": round(precision, 4),
+        "recall": round(recall, 4),
+        "f1": round(f1, 4)
+    }
+
+
+def evaluate_keyword_overlap(reports: List[str], local_extract: Callable[[str, int], List[str]],
+                             llm_keywords: List[List[str]], num_keywords: int = 5) -> Dict:
+    """
+    보고서별 로컬 키워드와 LLM 키워드의 일치율 및 로컬 추출 시간을 비교합니다.
+
+    Args:
+        reports: 사업보고서 내용 리스트
+        local_extract: (보고서, 키워드 개수) → 키워드 리스트
+        llm_keywords: 보고서별 LLM 추출 키워드 (reports와 같은 순서)
+        num_keywords: 추출할 키워드 개수
+
+    Returns:
+        {"reports": [{"local_keywords", "llm_keywords", "local_ms", ...overlap}], "mean": {...}}
+    """
+    rows = []
+    for report, reference in zip(reports, llm_keywords):
+        start = time.perf_counter()
+        predicted = local_extract(report, num_keywords)
+        elapsed = time.perf_counter() - start
+        rows.append({
+            "local_keywords": predicted,
+            "llm_keywords": reference,
+            "local_ms": round(elapsed * 1000, 3),
+            **keyword_overlap(predicted, reference)
+        })
+
+    metrics = ("precision", "recall", "f1", "local_ms")
+    mean = {metric: round(sum(row[metric] for row in rows) / len(rows), 4) if rows else 0.0 for metric in metrics}
+    mean["max_local_ms"] = max((row["local_ms"] for row in rows), default=0.0)
+    return {"reports": rows, "mean": mean}
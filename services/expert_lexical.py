@@ -0,0 +1,80 @@
+"""
+전문가 항목 어휘 문자 n-gram 역색인
+
+키워드가 전문가 경력/분야 문자열에 그대로 포함된 경우(정확/부분 문자열 일치)를
+임베딩 계산 없이 찾고, 의미 검색 후보를 키워드와 글자를 공유하는 어휘로 좁히는 데 사용합니다.
+
+한국어는 띄어쓰기가 일정하지 않으므로("디지털 전환" / "디지털전환") 공백을 제거한 문자열의
+글자 2-gram으로 색인합니다. 영문/숫자로만 된 키워드는 단어 경계가 맞을 때만 일치로 봅니다
+("AI"가 "retail"에 일치하지 않도록).
+"""
+
+import re
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from services.text_utils import NGRAM_SIZE, compact, ngrams
+
+
+class LexicalIndex:
+    """어휘 문자열의 글자 n-gram 역색인"""
+
+    def __init__(self, vocab: List[str]):
+        """
+        Args:
+            vocab: 어휘(고유 항목 문자열) 리스트. 어휘 번호는 리스트 순서
+        """
+        self.spaced = [" ".join(item.split()).casefold() for item in vocab]
+        self.compact = [compact(item) for item in vocab]
+        postings: Dict[str, List[int]] = {}
+        for row, text in enumerate(self.compact):
+            for gram in ngrams(text):
+                postings.setdefault(gram, []).append(row)
+        self.postings = {gram: np.asarray(rows, dtype=np.int64) for gram, rows in postings.items()}
+
+    def _gram_rows(self, gram: str) -> np.ndarray:
+        return self.postings.get(gram, np.zeros(0, dtype=np.int64))
+
+    def _contains(self, keyword: str, row: int) -> bool:
+        if keyword.isascii():
+            pattern = rf"(?<![a-z0-9]){re.escape(' '.join(keyword.split()).casefold())}(?![a-z0-9])"
+            return re.search(pattern, self.spaced[row]) is not None
+        return compact(keyword) in self.compact[row]
+
+    def _keyword_matches(self, keyword: str) -> np.ndarray:
+        text = compact(keyword)
+        if not text:
+            return np.zeros(0, dtype=np.int64)
+        if len(text) < NGRAM_SIZE:
+            # 한 글자 키워드는 n-gram으로 좁힐 수 없으므로 전체 비교
+            candidates = np.arange(len(self.compact))
+        else:
+            # 모든 n-gram을 가진 어휘만 후보 (가장 짧은 목록부터 교집합)
+            gram_rows = sorted((self._gram_rows(gram) for gram in ngrams(text)), key=len)
+            candidates = gram_rows[0]
+            for rows in gram_rows[1:]:
+                if not len(candidates):
+                    break
+                candidates = np.intersect1d(candidates, rows, assume_unique=True)
+        return np.asarray([row for row in candidates.tolist() if self._contains(keyword, row)], dtype=np.int64)
+
+    def match(self, keywords: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        키워드가 그대로 포함된 어휘를 찾습니다.
+
+        Returns:
+            (키워드 번호, 어휘 번호) 배열. 키워드 → 어휘 번호 순으로 정렬됨
+        """
+        keyword_hits, vocab_hits = [np.zeros(0, dtype=np.int64)], [np.zeros(0, dtype=np.int64)]
+        for keyword_idx, keyword in enumerate(keywords):
+            rows = self._keyword_matches(keyword)
+            keyword_hits.append(np.full(len(rows), keyword_idx, dtype=np.int64))
+            vocab_hits.append(rows)
+        return np.concatenate(keyword_hits), np.concatenate(vocab_hits)
+
+    def candidates(self, keywords: List[str]) -> np.ndarray:
+        """키워드 중 하나와 n-gram을 하나 이상 공유하는 어휘 번호 (정렬됨)"""
+        grams = {gram for keyword in keywords for gram in ngrams(compact(keyword))}
+        rows = [self._gram_rows(gram) for gram in grams]
+        return np.unique(np.concatenate([np.zeros(0, dtype=np.int64)] + rows))
@@ -0,0 +1,76 @@
+"""
+전문가 간 유사도 이웃 목록 ("비슷한 전문가")
+
+전문가별 항목(어휘) 임베딩 평균을 전문가 프로필 벡터로 보고,
+프로필 × 프로필 코사인 유사도의 전문가별 상위 K개를 블록 단위로 계산합니다.
+유사도 행렬 전체(전문가 수²)를 만들지 않으므로 수만 명 규모에서도 메모리가 일정합니다.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+from services.expert_index import ExpertItemIndex, l2_normalize
+
+# 한 번에 계산할 유사도 행렬 최대 원소 수 (float32 기준 128MB)
+RELATED_BLOCK_ELEMENTS = 2 ** 25
+
+# 프로필 계산 시 한 번에 처리할 전문가 수
+PROFILE_CHUNK_SIZE = 4096
+
+
+def expert_profiles(index: ExpertItemIndex) -> np.ndarray:
+    """
+    전문가별 항목 임베딩 평균(L2 정규화)을 계산합니다.
+
+    Returns:
+        (전문가 수, 차원) float32 행렬. 항목이 없는 전문가는 영벡터
+    """
+    dim = index.matrix.shape[1] if index.matrix.ndim == 2 else 0
+    profiles = np.zeros((index.num_experts, dim), dtype=np.float32)
+    has_items = np.diff(index.offsets) > 0
+    for start in range(0, index.num_experts, PROFILE_CHUNK_SIZE):
+        end = min(start + PROFILE_CHUNK_SIZE, index.num_experts)
+        item_start, item_end = index.offsets[start], index.offsets[end]
+        if item_start == item_end:
+            continue
+        vectors = np.asarray(index.matrix[index.item_vocab[item_start:item_end]], dtype=np.float32)
+        # 항목이 있는 전문가의 구간은 연속이므로 구간 시작점으로 한 번에 합산
+        experts = np.nonzero(has_items[start:end])[0] + start
+        profiles[experts] = np.add.reduceat(vectors, index.offsets[experts] - item_start, axis=0)
+    profiles[has_items] = l2_normalize(profiles[has_items])
+    return profiles
+
+
+def top_k_neighbours(profiles: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    전문가별 유사도 상위 top_k 이웃을 블록 단위로 계산합니다 (자기 자신 제외).
+
+    Args:
+        profiles: (전문가 수, 차원) L2 정규화된 프로필 행렬
+        top_k: 전문가별 이웃 수
+
+    Returns:
+        (이웃 전문가 번호, 유사도) 배열. 둘 다 (전문가 수, k) 형태이며 유사도 내림차순
+        (k = min(top_k, 전문가 수 - 1))
+    """
+    num_experts = len(profiles)
+    k = max(0, min(top_k, num_experts - 1))
+    neighbours = np.zeros((num_experts, k), dtype=np.int32)
+    scores = np.zeros((num_experts, k), dtype=np.float32)
+    if not k:
+        return neighbours, scores
+
+    block_rows = max(1, RELATED_BLOCK_ELEMENTS // num_experts)
+    for start in range(0, num_experts, block_rows):
+        end = min(start + block_rows, num_experts)
+        sims = profiles[start:end] @ profiles.T
+        # 자기 자신 제외
+        sims[np.arange(end - start), np.arange(start, end)] = -np.inf
+        candidates = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        candidate_sims = np.take_along_axis(sims, candidates, axis=1)
+        # 유사도 내림차순, 동점은 전문가 번호 오름차순
+        order = np.lexsort((candidates, -candidate_sims), axis=1)
+        neighbours[start:end] = np.take_along_axis(candidates, order, axis=1)
+        scores[start:end] = np.take_along_axis(candidate_sims, order, axis=1)
+    return neighbours, scores
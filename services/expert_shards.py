@@ -0,0 +1,145 @@
+"""
+어휘 임베딩 행렬 샤드 병렬 검색
+
+대규모 카탈로그(수십만 전문가 × 항목)에서 정확 검색의 행렬 곱을 여러 프로세스로 나눕니다.
+
+- 샤드: 디스크 memory-mapped 어휘 행렬(vocab_<digest>.npy)의 행 구간
+- 작업 프로세스는 같은 파일을 memory-map으로 열므로 행렬이 OS 페이지 캐시에서 공유되고
+  프로세스마다 복사본을 만들지 않습니다 (요청마다 전달하는 것은 키워드 임베딩뿐)
+- 각 샤드는 임계값 이상 (키워드, 어휘, 유사도)만 반환하고, 부모 프로세스가 합쳐
+  ExpertItemIndex의 fan-out/집계를 그대로 수행합니다
+
+매칭 개수 기반 랭킹은 임계값 이상 매칭이 모두 있어야 하므로 샤드별 상위 k가 아니라
+샤드별 임계값 이상 매칭 전체를 합칩니다.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+# 작업 프로세스에서 한 번에 계산할 유사도 행렬 최대 원소 수 (float32 기준 128MB)
+SHARD_CHUNK_ELEMENTS = 2 ** 25
+
+# 작업 프로세스가 열어 둘 행렬 파일 수 (카탈로그 교체 직후 이전/현재 스냅샷)
+WORKER_MATRIX_CACHE_SIZE = 2
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+# 작업 프로세스 내 파일 경로 → memory-mapped 행렬
+_worker_matrices: Dict[str, np.ndarray] = {}
+
+
+def _init_worker():
+    """작업 프로세스 초기화: 프로세스끼리 코어를 나눠 쓰도록 BLAS 스레드를 1개로 제한"""
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(1)
+    except ImportError:
+        pass
+
+
+def _worker_matrix(path: str) -> np.ndarray:
+    matrix = _worker_matrices.get(path)
+    if matrix is None:
+        while len(_worker_matrices) >= WORKER_MATRIX_CACHE_SIZE:
+            _worker_matrices.pop(next(iter(_worker_matrices)))
+        matrix = _worker_matrices[path] = np.load(path, mmap_mode="r")
+    return matrix
+
+
+def _search_shard(path: str, start: int, end: int, queries: np.ndarray, similarity_threshold: float
+                  ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """작업 프로세스: [start, end) 행에서 임계값 이상 (키워드, 어휘, 유사도)를 찾습니다."""
+    matrix = _worker_matrix(path)
+    chunk_rows = max(1, SHARD_CHUNK_ELEMENTS // max(len(queries), 1))
+    keyword_hits, vocab_hits, sim_hits = [], [], []
+    for chunk_start in range(start, end, chunk_rows):
+        chunk_end = min(chunk_start + chunk_rows, end)
+        sims = queries @ np.asarray(matrix[chunk_start:chunk_end], dtype=np.float32).T
+        keyword_idx, vocab_idx = np.nonzero(sims >= similarity_threshold)
+        keyword_hits.append(keyword_idx)
+        vocab_hits.append(vocab_idx + chunk_start)
+        sim_hits.append(sims[keyword_idx, vocab_idx])
+    empty = np.zeros(0, dtype=np.int64)
+    return (
+        np.concatenate([empty] + keyword_hits),
+        np.concatenate([empty] + vocab_hits),
+        np.concatenate([np.zeros(0, dtype=np.float32)] + sim_hits),
+    )
+
+
+def get_shard_pool(workers: int) -> ProcessPoolExecutor:
+    """샤드 검색용 프로세스 풀을 반환합니다 (프로세스 전체에서 하나, 처음 사용할 때 생성)."""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+            # fork는 부모의 스레드(BLAS, 스코어링 스레드 풀) 상태를 복제하므로 spawn 사용
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker
+            )
+            _pool_workers = workers
+        return _pool
+
+
+def shutdown_shard_pool():
+    """샤드 검색 프로세스 풀을 종료합니다."""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool, _pool_workers = None, 0
+
+
+class ShardedSearch:
+    """memory-mapped 어휘 행렬의 샤드 병렬 임계값 검색"""
+
+    def __init__(self, matrix: np.memmap, workers: int, num_shards: Optional[int] = None):
+        """
+        Args:
+            matrix: (어휘 수, 차원) L2 정규화된 float32 memory-mapped 행렬 (.npy 파일)
+            workers: 작업 프로세스 수
+            num_shards: 샤드 수 (기본값 workers)
+        """
+        if not isinstance(matrix, np.memmap) or matrix.filename is None:
+            raise ValueError("샤드 검색에는 디스크 memory-mapped 행렬이 필요합니다.")
+        self.path = os.fspath(matrix.filename)
+        self.num_rows = len(matrix)
+        self.workers = workers
+        num_shards = max(1, min(num_shards or workers, self.num_rows))
+        self.bounds = np.linspace(0, self.num_rows, num_shards + 1).astype(np.int64)
+
+    def search(self, queries: np.ndarray, similarity_threshold: float
+               ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        샤드별로 병렬 검색한 뒤 결과를 합칩니다.
+
+        Args:
+            queries: (키워드 수, 차원) L2 정규화된 키워드 임베딩
+            similarity_threshold: 유사도 임계값
+
+        Returns:
+            (키워드 번호, 어휘 번호, 유사도) 배열. 키워드 → 어휘 번호 순으로 정렬됨
+        """
+        pool = get_shard_pool(self.workers)
+        queries = np.ascontiguousarray(queries, dtype=np.float32)
+        futures = [
+            pool.submit(_search_shard, self.path, int(start), int(end), queries, similarity_threshold)
+            for start, end in zip(self.bounds[:-1], self.bounds[1:])
+        ]
+        # 샤드는 어휘 번호 순이므로 이어붙인 뒤 키워드 번호로 안정 정렬하면 키워드 → 어휘 순
+        parts = [future.result() for future in futures]
+        keyword_idx = np.concatenate([part[0] for part in parts])
+        vocab_idx = np.concatenate([part[1] for part in parts])
+        sims = np.concatenate([part[2] for part in parts])
+        order = np.argsort(keyword_idx, kind="stable")
+        return keyword_idx[order], vocab_idx[order], sims[order]
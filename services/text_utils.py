@@ -0,0 +1,30 @@
+"""
+텍스트 정규화 공용 함수
+
+전문가 매칭(어휘 색인, 로컬 키워드 추출)과 사업계획서 진단(소목차 해시, 소목차 → 카테고리 배정)이
+함께 사용합니다.
+"""
+
+import re
+from typing import List
+
+NGRAM_SIZE = 2
+
+_HTML_TAG = re.compile(r"<[^>]+>")
+
+
+def strip_html(text: str) -> str:
+    """HTML 태그 제거"""
+    return _HTML_TAG.sub(" ", text)
+
+
+def compact(text: str) -> str:
+    """공백 제거 + 소문자 (색인/부분 문자열 비교용)"""
+    return "".join(str(text).split()).casefold()
+
+
+def ngrams(text: str) -> List[str]:
+    """공백을 제거한 문자열의 글자 n-gram (n보다 짧으면 문자열 자체)"""
+    if len(text) <= NGRAM_SIZE:
+        return [text] if text else []
+    return list(dict.fromkeys(text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)))
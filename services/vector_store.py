@@ -0,0 +1,229 @@
+"""
+압축 벡터 저장소
+
+L2 정규화된 임베딩 행렬을 float16 또는 int8(행별 스케일)로 연속 배열에 보관하고
+임계값 검색을 제공합니다.
+
+- float32: 원본 행렬(디스크 memory-mapped 캐시)을 그대로 사용 (복사 없음)
+- float16: 원소당 2바이트. 유사도 오차 ≤ 2^-11
+- int8: 원소당 1바이트 + 행별 float32 스케일. 유사도 오차 ≤ ||q||_1 × scale / 2
+
+원본이 디스크 캐시(memory-mapped)이면 압축 행렬도 같은 디렉터리에 캐시 파일
+(vocab_<digest>.f16.npy, vocab_<digest>.i8.npy + vocab_<digest>.i8_scale.npy)로 저장하고
+memory-map으로 열어 uvicorn 작업 프로세스들이 페이지 캐시를 공유합니다.
+
+rescore=True면 압축 벡터로 (임계값 - 오차 상한) 이상인 후보를 고른 뒤
+float32 원본 행렬로 후보 유사도만 다시 계산하므로 결과가 float32 검색과 같습니다.
+rescore=False면 float32 원본을 참조하지 않습니다.
+"""
+
+import os
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+VECTOR_DTYPES = ("float32", "float16", "int8")
+
+# 검색/변환 시 한 번에 처리할 행 수 (역양자화 임시 버퍼 크기 상한)
+ROW_CHUNK_SIZE = 16384
+
+# 재채점 시 한 번에 계산할 후보 원소 수 (후보 수 × 차원)
+RESCORE_CHUNK_ELEMENTS = 2 ** 22
+
+# float16 반올림 상대 오차 상한 (단위 벡터끼리의 내적 오차 상한, float32 누적 오차 여유 포함)
+FLOAT16_ERROR = 2.0 ** -11 + 1e-5
+
+
+def compress(matrix: np.ndarray, dtype: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """float32 행렬을 float16 또는 int8(+ 행별 스케일)로 변환합니다 (ROW_CHUNK_SIZE 행씩)."""
+    if dtype == "float16":
+        data = np.empty(matrix.shape, dtype=np.float16)
+        for start in range(0, len(matrix), ROW_CHUNK_SIZE):
+            data[start:start + ROW_CHUNK_SIZE] = matrix[start:start + ROW_CHUNK_SIZE]
+        return data, None
+
+    data = np.empty(matrix.shape, dtype=np.int8)
+    scale = np.empty(len(matrix), dtype=np.float32)
+    for start in range(0, len(matrix), ROW_CHUNK_SIZE):
+        chunk = np.asarray(matrix[start:start + ROW_CHUNK_SIZE], dtype=np.float32)
+        chunk_scale = np.abs(chunk).max(axis=1) / 127.0
+        chunk_scale[chunk_scale == 0] = 1.0
+        data[start:start + len(chunk)] = np.round(chunk / chunk_scale[:, None])
+        scale[start:start + len(chunk)] = chunk_scale
+    return data, scale
+
+
+def compressed_cache_paths(cache_path: Path, dtype: str) -> Tuple[Path, Optional[Path]]:
+    """float32 캐시 파일 경로 → 압축 행렬 캐시 파일 경로 (int8은 행별 스케일 파일 포함)"""
+    if dtype == "float16":
+        return cache_path.with_name(f"{cache_path.stem}.f16.npy"), None
+    return cache_path.with_name(f"{cache_path.stem}.i8.npy"), cache_path.with_name(f"{cache_path.stem}.i8_scale.npy")
+
+
+def load_compressed(matrix: np.ndarray, dtype: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    압축 행렬을 디스크 캐시에서 memory-map으로 열거나, 없으면 만들어 저장합니다.
+
+    원본이 memory-mapped 캐시 파일이 아니거나 저장에 실패하면 프로세스 내 압축 사본을 반환합니다.
+    """
+    filename = getattr(matrix, "filename", None) if isinstance(matrix, np.memmap) else None
+    if filename is None:
+        return compress(matrix, dtype)
+
+    data_path, scale_path = compressed_cache_paths(Path(filename), dtype)
+    if data_path.exists() and (scale_path is None or scale_path.exists()):
+        try:
+            data = np.load(data_path, mmap_mode="r")
+            scale = np.load(scale_path, mmap_mode="r") if scale_path is not None else None
+            if data.shape == matrix.shape and (scale is None or len(scale) == len(matrix)):
+                return data, scale
+        except Exception as e:
+            print(f"압축 벡터 캐시 로드 실패 (재생성): {str(e)}")
+
+    data, scale = compress(matrix, dtype)
+    try:
+        # 여러 작업 프로세스가 동시에 만들 수 있으므로 프로세스별 임시 파일에 쓴 뒤 교체
+        # (int8은 스케일 파일을 먼저 교체하여 행렬 파일이 있으면 스케일도 있도록 함)
+        if scale_path is not None:
+            tmp_scale = scale_path.with_name(f"{scale_path.stem}.{os.getpid()}.tmp.npy")
+            np.save(tmp_scale, scale)
+            os.replace(tmp_scale, scale_path)
+        tmp_data = data_path.with_name(f"{data_path.stem}.{os.getpid()}.tmp.npy")
+        np.save(tmp_data, data)
+        os.replace(tmp_data, data_path)
+        data = np.load(data_path, mmap_mode="r")
+        if scale_path is not None:
+            scale = np.load(scale_path, mmap_mode="r")
+        return data, scale
+    except Exception as e:
+        print(f"압축 벡터 캐시 저장 실패: {str(e)}")
+        return data, scale
+
+
+class VectorStore:
+    """float32 / float16 / int8 임베딩 행렬 저장소"""
+
+    def __init__(self, matrix: np.ndarray, dtype: str = "float32", rescore: bool = True):
+        """
+        Args:
+            matrix: (행 수, 차원) L2 정규화된 float32 행렬 (memory-mapped이면 압축 행렬도 디스크에 캐시)
+            dtype: 저장 형식 ("float32", "float16", "int8")
+            rescore: 압축 형식일 때 float32 원본을 재채점용으로 보관할지 여부
+        """
+        if dtype not in VECTOR_DTYPES:
+            raise ValueError(f"지원하지 않는 벡터 형식입니다: {dtype} (지원: {', '.join(VECTOR_DTYPES)})")
+        self.dtype = dtype
+        self.scale = None
+
+        if dtype == "float32" or not matrix.size:
+            self.data = matrix
+            self.reference = matrix
+        else:
+            self.data, self.scale = load_compressed(matrix, dtype)
+            # 재채점하지 않으면 float32 원본을 참조하지 않음
+            self.reference = matrix if rescore else None
+        self.rescore = self.reference is not None and self.data is not self.reference
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def rows(self, start: int, end: int) -> np.ndarray:
+        """[start, end) 행을 float32로 역양자화하여 반환합니다."""
+        block = np.asarray(self.data[start:end], dtype=np.float32)
+        if self.scale is not None:
+            block *= self.scale[start:end, None]
+        return block
+
+    def take(self, row_idx: np.ndarray) -> np.ndarray:
+        """지정한 행들을 float32로 역양자화하여 반환합니다."""
+        block = np.asarray(self.data[row_idx], dtype=np.float32)
+        if self.scale is not None:
+            block *= self.scale[row_idx, None]
+        return block
+
+    def error_bounds(self, queries: np.ndarray) -> np.ndarray:
+        """질의별 압축 유사도의 최대 오차 (재채점 후보 여유분)"""
+        if self.dtype == "float32" or not len(self.data):
+            return np.zeros(len(queries), dtype=np.float32)
+        if self.dtype == "float16":
+            return np.full(len(queries), FLOAT16_ERROR, dtype=np.float32)
+        return np.abs(queries).sum(axis=1) * float(self.scale.max()) / 2
+
+    def search(self, queries: np.ndarray, similarity_threshold: float, rescore: Optional[bool] = None,
+               candidates: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        질의별로 임계값 이상인 행을 찾습니다.
+
+        Args:
+            queries: (질의 수, 차원) L2 정규화된 질의 행렬
+            similarity_threshold: 유사도 임계값
+            rescore: 압축 형식일 때 후보를 float32 원본으로 재채점할지 여부
+                (None이면 생성 시 설정, float32 원본을 보관하지 않았으면 무시)
+            candidates: 지정하면 이 행 번호(정렬됨)만 검색
+
+        Returns:
+            (질의 번호, 행 번호, 유사도) 배열. 질의 → 행 번호 순으로 정렬됨
+        """
+        rescore = self.rescore if rescore is None else (rescore and self.rescore)
+        thresholds = np.full(len(queries), similarity_threshold, dtype=np.float32)
+        if rescore:
+            thresholds -= self.error_bounds(queries)
+
+        total = len(self.data) if candidates is None else len(candidates)
+        query_hits, row_hits, sim_hits = [], [], []
+        for start in range(0, total, ROW_CHUNK_SIZE):
+            if candidates is None:
+                block_rows = None
+                sims = queries @ self.rows(start, start + ROW_CHUNK_SIZE).T
+            else:
+                block_rows = candidates[start:start + ROW_CHUNK_SIZE]
+                sims = queries @ self.take(block_rows).T
+            query_idx, row_idx = np.nonzero(sims >= thresholds[:, None])
+            query_hits.append(query_idx)
+            row_hits.append(row_idx + start if block_rows is None else block_rows[row_idx])
+            sim_hits.append(sims[query_idx, row_idx])
+
+        empty = np.zeros(0, dtype=np.int64)
+        query_idx = np.concatenate([empty] + query_hits)
+        row_idx = np.concatenate([empty] + row_hits)
+        sims = np.concatenate([np.zeros(0, dtype=np.float32)] + sim_hits)
+
+        if rescore and len(row_idx):
+            # 후보 행만 float32 원본에서 읽어 정확한 유사도로 교체
+            unique_rows, inverse = np.unique(row_idx, return_inverse=True)
+            reference = np.asarray(self.reference[unique_rows], dtype=np.float32)
+            chunk = max(1, RESCORE_CHUNK_ELEMENTS // queries.shape[1])
+            sims = np.concatenate([
+                np.einsum("ij,ij->i", queries[query_idx[i:i + chunk]], reference[inverse[i:i + chunk]])
+                for i in range(0, len(row_idx), chunk)
+            ])
+            mask = sims >= similarity_threshold
+            query_idx, row_idx, sims = query_idx[mask], row_idx[mask], sims[mask]
+
+        order = np.lexsort((row_idx, query_idx))
+        return query_idx[order], row_idx[order], sims[order]
+
+    def memory_footprint(self) -> Dict:
+        """
+        저장 형식별 메모리 사용량
+
+        vector_bytes는 검색에 쓰는 행렬(+ int8 스케일), reference_bytes는 재채점용 float32 원본 크기이며
+        in_memory_bytes는 그중 memory-map이 아닌(작업 프로세스마다 따로 잡히는) 배열의 크기입니다.
+        """
+        vector_bytes = int(self.data.nbytes) + (int(self.scale.nbytes) if self.scale is not None else 0)
+        has_reference = self.reference is not None and self.reference is not self.data
+        reference_bytes = int(self.reference.nbytes) if has_reference else 0
+        in_memory_bytes = 0 if isinstance(self.data, np.memmap) else int(self.data.nbytes)
+        in_memory_bytes += int(self.scale.nbytes) if self.scale is not None and not isinstance(self.scale, np.memmap) else 0
+        in_memory_bytes += reference_bytes if has_reference and not isinstance(self.reference, np.memmap) else 0
+        return {
+            "dtype": self.dtype,
+            "rows": int(len(self.data)),
+            "dim": int(self.data.shape[1]) if self.data.ndim == 2 else 0,
+            "vector_bytes": vector_bytes,
+            "vector_memory_mapped": isinstance(self.data, np.memmap),
+            "reference_bytes": reference_bytes,
+            "reference_memory_mapped": has_reference and isinstance(self.reference, np.memmap),
+            "in_memory_bytes": in_memory_bytes,
+        }
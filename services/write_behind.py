@@ -0,0 +1,398 @@
+"""
+Write-behind 저장 큐
+
+요청 처리 경로에서 DB 쓰기를 기다리지 않도록 레코드를 메모리 큐에 넣고,
+백그라운드 스레드가 모아서(micro-batch) 저장합니다.
+
+- 마이크로 배치: batch_size건이 모이거나 가장 오래된 레코드가 flush_interval초 기다리면 한 번에 저장
+- 재시도: 일시적 오류(연결 실패, 타임아웃 등)는 지수 백오프로 max_retries회 재시도
+- 불량 레코드 격리: 영구 오류(제약 조건 위반 등)로 배치가 거부되면 배치를 반으로 나눠 다시 저장하여
+  거부되는 레코드만 dead-letter 파일(dead-<호스트>-<pid>.jsonl)로 옮기고 나머지는 저장합니다
+- 스풀: 재시도 후에도 일시적 오류로 실패한 배치(DB 장애), 큐가 가득 찼을 때와 종료 시 남은 레코드는
+  로컬 JSONL 스풀 파일에 fsync로 기록하고, spool_retry_interval마다 다시 전송합니다
+  (장애가 확인되면 그동안 새 배치는 재시도 없이 바로 스풀)
+- 지표: 큐 깊이, 가장 오래된 미저장 레코드의 대기 시간(lag), 스풀/dead-letter 파일 크기, 저장/재시도/실패 누계
+
+스풀 파일은 프로세스마다 따로 쓰고(spool-<호스트>-<pid>.jsonl), 재전송할 때는 파일 잠금을 잡은 채
+이름을 바꿔 선점하므로 여러 워커/컨테이너가 같은 디렉터리를 공유해도 같은 레코드를 두 번 보내지 않습니다.
+메모리 큐에만 있던 레코드는 프로세스가 강제 종료(SIGKILL)되면 유실될 수 있습니다.
+"""
+
+import atexit
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import deque
+from pathlib import Path
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows 로컬 개발 환경 (단일 프로세스로 가정)
+    fcntl = None
+
+
+class WriteBehindQueue:
+    """레코드를 백그라운드 스레드에서 배치로 저장하는 큐 (실패 시 로컬 스풀 파일)"""
+
+    def __init__(self, name: str, write_batch: Callable[[List[Dict]], None], spool_dir: Path,
+                 batch_size: int = 50, flush_interval: float = 0.5, max_retries: int = 3,
+                 retry_backoff: float = 1.0, max_queue: int = 10000, spool_retry_interval: float = 30.0,
+                 is_transient: Callable[[Exception], bool] = lambda error: True):
+        """
+        Args:
+            name: 스레드/로그 이름
+            write_batch: 레코드 리스트를 한 번에 저장하는 함수 (동기, 실패 시 예외)
+            spool_dir: 스풀/dead-letter 파일 디렉터리
+            batch_size: 배치당 최대 레코드 수
+            flush_interval: 배치가 다 차지 않아도 저장하기까지 기다릴 최대 시간(초)
+            max_retries: 배치 저장 재시도 횟수
+            retry_backoff: 첫 재시도 대기 시간(초, 재시도마다 2배)
+            max_queue: 메모리 큐 최대 길이 (넘으면 바로 스풀)
+            spool_retry_interval: 저장 실패 후 스풀 재전송까지 기다릴 시간(초)
+            is_transient: 예외가 일시적 오류(재시도/스풀 대상)인지 판별하는 함수.
+                False로 판별된 오류는 배치를 나눠 거부되는 레코드를 찾아 dead-letter로 옮김
+        """
+        self.name = name
+        self.write_batch = write_batch
+        self.spool_dir = Path(spool_dir)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.max_queue = max_queue
+        self.spool_retry_interval = spool_retry_interval
+        self.is_transient = is_transient
+
+        self._queue: Deque[Tuple[float, Dict]] = deque()
+        self._cond = threading.Condition()
+        self._spool_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._in_flight: Optional[Tuple[float, int]] = None
+        self._unavailable_until = 0.0
+        self._next_replay_at = 0.0
+        self._spool_name = f"spool-{socket.gethostname()}-{os.getpid()}.jsonl"
+        self._dead_letter_name = f"dead-{socket.gethostname()}-{os.getpid()}.jsonl"
+
+        self.written = 0
+        self.replayed = 0
+        self.retries = 0
+        self.failed_batches = 0
+        self.spooled = 0
+        self.dead_lettered = 0
+        self.last_error: Optional[str] = None
+        self.last_written_at: Optional[float] = None
+        self.last_batch_lag = 0.0
+
+    # ==================== 공개 API ====================
+
+    def start(self):
+        """저장 스레드를 시작합니다 (이미 실행 중이면 무시). 시작하면 남아 있는 스풀부터 재전송합니다."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._cond:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            if self._thread is None:
+                atexit.register(self.stop)
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """
+        큐에 남은 레코드를 저장한 뒤 스레드를 종료합니다.
+
+        종료 중에는 재시도 대기 없이 한 번만 시도하며, timeout 안에 저장하지 못한 레코드는 스풀에 기록합니다.
+        """
+        with self._cond:
+            self._stop_event.set()
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        with self._cond:
+            remaining = [record for _, record in self._queue]
+            self._queue.clear()
+        if remaining:
+            self._spool(remaining)
+
+    def enqueue(self, record: Dict):
+        """레코드를 저장 큐에 넣습니다 (바로 반환)."""
+        if not self._stop_event.is_set():
+            self.start()
+            with self._cond:
+                if len(self._queue) < self.max_queue:
+                    self._queue.append((time.time(), record))
+                    self._cond.notify()
+                    return
+        # 큐가 가득 찼거나 종료 중이면 버리지 않고 스풀에 기록
+        self._spool([record])
+
+    def stats(self) -> Dict:
+        """큐 깊이, 지연(lag), 스풀, 저장 누계 지표"""
+        now = time.time()
+        with self._cond:
+            depth = len(self._queue)
+            oldest = self._queue[0][0] if self._queue else None
+            in_flight = self._in_flight
+        if in_flight is not None:
+            oldest = in_flight[0] if oldest is None else min(oldest, in_flight[0])
+        spool_files, spool_bytes, dead_letter_bytes = 0, 0, 0
+        try:
+            for path in self._spool_files():
+                spool_files += 1
+                spool_bytes += path.stat().st_size
+            for path in self._dead_letter_files():
+                dead_letter_bytes += path.stat().st_size
+        except OSError:
+            pass
+        return {
+            "depth": depth,
+            "in_flight": in_flight[1] if in_flight else 0,
+            "lag_seconds": round(now - oldest, 3) if oldest is not None else 0.0,
+            "last_batch_lag_seconds": round(self.last_batch_lag, 3),
+            "written": self.written,
+            "replayed": self.replayed,
+            "retries": self.retries,
+            "failed_batches": self.failed_batches,
+            "spooled": self.spooled,
+            "spool_files": spool_files,
+            "spool_bytes": spool_bytes,
+            "dead_lettered": self.dead_lettered,
+            "dead_letter_bytes": dead_letter_bytes,
+            "available": time.monotonic() >= self._unavailable_until,
+            "last_error": self.last_error,
+            "last_written_at": self.last_written_at,
+        }
+
+    # ==================== 저장 스레드 ====================
+
+    def _run(self):
+        while True:
+            if not self._stop_event.is_set() and time.monotonic() >= self._next_replay_at:
+                self._replay_spool()
+            batch = self._next_batch()
+            if batch is None:
+                return
+            if batch:
+                self._persist(batch)
+
+    def _next_batch(self) -> Optional[List[Tuple[float, Dict]]]:
+        """
+        다음 배치를 꺼냅니다.
+
+        Returns:
+            배치 (스풀 재전송 시각이 되었으면 빈 리스트, 종료 중이고 큐가 비었으면 None)
+        """
+        with self._cond:
+            while True:
+                stopping = self._stop_event.is_set()
+                if self._queue:
+                    wait = self._queue[0][0] + self.flush_interval - time.time()
+                    if len(self._queue) >= self.batch_size or wait <= 0 or stopping:
+                        break
+                    self._cond.wait(wait)
+                elif stopping:
+                    return None
+                else:
+                    self._cond.wait(max(0.1, self._next_replay_at - time.monotonic()))
+                    if not self._queue:
+                        return []
+            batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+            self._in_flight = (batch[0][0], len(batch))
+            return batch
+
+    def _persist(self, batch: List[Tuple[float, Dict]]):
+        records = [record for _, record in batch]
+        try:
+            # 장애가 확인된 동안에는 재시도하지 않고 바로 스풀 (재전송 시 다시 확인)
+            if time.monotonic() < self._unavailable_until:
+                self._spool(records)
+                return
+            written, unsent = self._write_or_split(records, retry=True)
+            if written:
+                self.written += written
+                self.last_written_at = time.time()
+                self.last_batch_lag = self.last_written_at - batch[0][0]
+            if unsent:
+                self.failed_batches += 1
+                print(f"[{self.name}] {len(unsent)}건 저장 실패, 스풀에 기록: {self.last_error}")
+                self._mark_unavailable()
+                self._spool(unsent)
+        finally:
+            with self._cond:
+                self._in_flight = None
+
+    def _attempt(self, records: List[Dict], retry: bool) -> Optional[Exception]:
+        """
+        레코드를 저장합니다. 일시적 오류는 retry이면 백오프 후 재시도합니다.
+
+        Returns:
+            성공하면 None, 실패하면 마지막 예외
+        """
+        attempts = self.max_retries + 1 if retry else 1
+        error: Optional[Exception] = None
+        for attempt in range(attempts):
+            if attempt:
+                # 종료 중이면 대기 없이 바로 스풀
+                if self._stop_event.wait(self.retry_backoff * 2 ** (attempt - 1)):
+                    break
+                self.retries += 1
+            try:
+                self.write_batch(records)
+                return None
+            except Exception as e:
+                error = e
+                self.last_error = str(e)
+            if not self._is_transient(error):
+                break
+        return error
+
+    def _is_transient(self, error: Exception) -> bool:
+        try:
+            return bool(self.is_transient(error))
+        except Exception:
+            return True
+
+    def _write_or_split(self, records: List[Dict], retry: bool) -> Tuple[int, List[Dict]]:
+        """
+        레코드를 저장합니다. 영구 오류로 거부되면 반으로 나눠 다시 저장하고,
+        혼자서도 거부되는 레코드는 dead-letter로 옮깁니다.
+
+        Returns:
+            (저장된 레코드 수, 일시적 오류로 저장하지 못한 레코드 (스풀 대상))
+        """
+        error = self._attempt(records, retry)
+        if error is None:
+            return len(records), []
+        if self._is_transient(error):
+            return 0, records
+        if len(records) == 1:
+            self._dead_letter(records[0], error)
+            return 0, []
+        middle = len(records) // 2
+        written, unsent = self._write_or_split(records[:middle], retry=False)
+        if unsent:
+            # 나누는 중에 장애가 나면 나머지는 시도하지 않고 스풀
+            return written, unsent + records[middle:]
+        right_written, unsent = self._write_or_split(records[middle:], retry=False)
+        return written + right_written, unsent
+
+    def _mark_unavailable(self):
+        self._unavailable_until = time.monotonic() + self.spool_retry_interval
+        self._next_replay_at = self._unavailable_until
+
+    # ==================== 스풀 파일 ====================
+
+    def _spool_files(self) -> List[Path]:
+        if not self.spool_dir.exists():
+            return []
+        return sorted(self.spool_dir.glob("spool-*.jsonl")) + sorted(self.spool_dir.glob("replay-*.jsonl"))
+
+    def _dead_letter_files(self) -> List[Path]:
+        if not self.spool_dir.exists():
+            return []
+        return sorted(self.spool_dir.glob("dead-*.jsonl"))
+
+    def _append(self, name: str, lines: str):
+        """파일에 줄을 추가하고 디스크에 동기화합니다 (재전송용으로 이름이 바뀐 파일에는 쓰지 않음)."""
+        path = self.spool_dir / name
+        with self._spool_lock:
+            self.spool_dir.mkdir(parents=True, exist_ok=True)
+            while True:
+                with open(path, "a", encoding="utf-8") as f:
+                    if fcntl is not None:
+                        fcntl.flock(f, fcntl.LOCK_EX)
+                        # 잠금을 기다리는 동안 재전송용으로 이름이 바뀌었으면 새 파일로 다시 시도
+                        try:
+                            if os.fstat(f.fileno()).st_ino != os.stat(path).st_ino:
+                                continue
+                        except FileNotFoundError:
+                            continue
+                    f.write(lines)
+                    f.flush()
+                    os.fsync(f.fileno())
+                    return
+
+    def _spool(self, records: List[Dict]):
+        """레코드를 이 프로세스의 스풀 파일에 추가합니다."""
+        lines = "".join(json.dumps(record, ensure_ascii=False, default=str) + "\n" for record in records)
+        try:
+            self._append(self._spool_name, lines)
+            self.spooled += len(records)
+        except OSError as e:
+            print(f"[{self.name}] 스풀 기록 실패, 레코드 {len(records)}건 유실: {str(e)}")
+
+    def _dead_letter(self, record: Dict, error: Exception):
+        """DB가 계속 거부하는 레코드를 오류와 함께 dead-letter 파일로 옮깁니다 (재전송하지 않음)."""
+        entry = {"record": record, "error": str(error), "failed_at": time.time()}
+        print(f"[{self.name}] 레코드 1건 dead-letter로 이동: {str(error)}")
+        try:
+            self._append(self._dead_letter_name, json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+            self.dead_lettered += 1
+        except OSError as e:
+            print(f"[{self.name}] dead-letter 기록 실패, 레코드 1건 유실: {str(e)}")
+
+    def _claim(self, path: Path):
+        """스풀 파일을 잠그고 재전송용 이름으로 바꿉니다 (다른 프로세스가 사용 중이면 None)."""
+        try:
+            f = open(path, "r", encoding="utf-8")
+        except OSError:
+            return None
+        if fcntl is not None:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                # 쓰는 중인 스풀이거나 다른 프로세스가 재전송 중인 파일
+                f.close()
+                return None
+        target = path.with_name(f"replay-{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}.jsonl")
+        try:
+            os.rename(path, target)
+        except OSError:
+            f.close()
+            return None
+        return f, target
+
+    def _replay_spool(self):
+        """스풀 파일의 레코드를 배치로 다시 저장합니다 (실패하면 남은 레코드를 다시 스풀)."""
+        self._next_replay_at = time.monotonic() + self.spool_retry_interval
+        if time.monotonic() < self._unavailable_until:
+            return
+        for path in self._spool_files():
+            with self._spool_lock:
+                claimed = self._claim(path)
+            if claimed is None:
+                continue
+            f, target = claimed
+            with f:
+                records = []
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        # 기록 중 종료되어 잘린 줄
+                        continue
+                unsent: List[Dict] = []
+                for start in range(0, len(records), self.batch_size):
+                    chunk = records[start:start + self.batch_size]
+                    if unsent:
+                        # 장애가 확인되면 남은 레코드는 시도하지 않고 다시 스풀
+                        unsent.extend(chunk)
+                        continue
+                    written, unsent = self._write_or_split(chunk, retry=False)
+                    self.replayed += written
+                if unsent:
+                    self._spool(unsent)
+                target.unlink()
+            if unsent:
+                print(f"[{self.name}] 스풀 재전송 실패 ({len(unsent)}건 보류): {self.last_error}")
+                self._mark_unavailable()
+                return
+            if records:
+                self.last_written_at = time.time()
+                print(f"[{self.name}] 스풀 재전송 완료: {len(records)}건")
@@ -0,0 +1,74 @@
+"""
+사업계획서 대량 진단 관련 Celery 태스크
+"""
+
+from celery_config import celery_app
+from services.diagnosis_bulk import BulkDiagnosisRequest, process_bulk_diagnosis
+from tasks.report_tasks import CallbackTask
+import traceback
+
+
+@celery_app.task(
+    bind=True,
+    base=CallbackTask,
+    name="tasks.diagnosis_tasks.bulk_diagnosis_task",
+    max_retries=3,
+    default_retry_delay=60
+)
+def bulk_diagnosis_task(self, request_data: dict):
+    """
+    대량 진단 태스크
+
+    항목별 진행 상황은 PROGRESS 상태의 meta(items)로 갱신되며
+    GET /api/jobs/status/{task_id}에서 조회할 수 있습니다.
+
+    Args:
+        self: Celery task instance
+        request_data: BulkDiagnosisRequest를 직렬화한 딕셔너리
+
+    Returns:
+        dict: 집계 및 항목별 진단 결과
+    """
+    request = BulkDiagnosisRequest.model_validate(request_data)
+    try:
+        print(f"\n{'='*60}")
+        print(f"📊 Celery Task 시작: 대량 진단")
+        print(f"{'='*60}")
+        print(f"Task ID: {self.request.id}")
+        print(f"항목 수: {len(request.items)}")
+        print(f"{'='*60}\n")
+
+        def on_progress(meta: dict):
+            self.update_state(state="PROGRESS", meta=meta)
+
+        result = process_bulk_diagnosis(request, on_progress)
+
+        print(f"\n{'='*60}")
+        print(f"{'✅' if result['success'] else '⚠️ '} Celery Task 완료: 대량 진단")
+        print(f"{'='*60}")
+        print(f"Task ID: {self.request.id}")
+        print(f"결과: {result['message']}")
+        print(f"{'='*60}\n")
+
+        return {**result, "task_id": self.request.id}
+
+    except Exception as exc:
+        print(f"\n{'='*60}")
+        print(f"❌ Celery Task 예외 발생: 대량 진단")
+        print(f"{'='*60}")
+        print(f"Task ID: {self.request.id}")
+        print(f"예외: {str(exc)}")
+        print(f"Traceback:\n{traceback.format_exc()}")
+        print(f"{'='*60}\n")
+
+        # 재시도 로직 (이미 진단된 항목은 진단 캐시에서 바로 반환됨)
+        try:
+            raise self.retry(exc=exc)
+        except self.MaxRetriesExceededError:
+            return {
+                "success": False,
+                "message": f"최대 재시도 횟수 초과: {str(exc)}",
+                "total": len(request.items),
+                "items": [],
+                "task_id": self.request.id
+            }
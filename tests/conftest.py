@@ -0,0 +1,201 @@
+"""
+pytest 공용 설정
+
+- 저장소 루트를 import 경로에 추가하여 tests/에서 services, routers 모듈을 바로 불러옵니다.
+- 캐시는 Redis 없이 프로세스 내 LRU만 사용합니다.
+- Supabase/OpenAI는 메모리 내 가짜 클라이언트로 대체합니다 (fake_supabase, fake_openai, expert_matcher).
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# 모듈 import 시 클라이언트 객체만 만들고 실제 호출은 하지 않음
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+from services import cache  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def no_redis(monkeypatch):
+    monkeypatch.setattr(cache, "get_redis_client", lambda: None)
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeQuery:
+    """테스트에서 사용하는 PostgREST 쿼리 메서드만 흉내 내는 쿼리"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.filters = []
+        self.payload = None
+
+    def select(self, *args, **kwargs):
+        return self
+
+    def eq(self, column, value):
+        if "->>" in column:
+            field, key = column.split("->>")
+            self.filters.append(lambda row: (row.get(field) or {}).get(key) == value)
+        else:
+            self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def gte(self, column, value):
+        self.filters.append(lambda row: row.get(column) is not None and str(row.get(column)) >= value)
+        return self
+
+    def in_(self, column, values):
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def order(self, *args, **kwargs):
+        return self
+
+    def limit(self, *args, **kwargs):
+        return self
+
+    def range(self, *args, **kwargs):
+        return self
+
+    def insert(self, payload):
+        self.payload = payload if isinstance(payload, list) else [payload]
+        return self
+
+    def execute(self):
+        if self.payload is not None:
+            self.rows.extend(self.payload)
+            return FakeResponse(self.payload)
+        return FakeResponse([dict(row) for row in self.rows if all(match(row) for match in self.filters)])
+
+
+class FakeSupabase:
+    def __init__(self):
+        self.tables = {}
+
+    def table(self, name):
+        return FakeQuery(self.tables.setdefault(name, []))
+
+
+@pytest.fixture
+def fake_supabase():
+    return FakeSupabase()
+
+
+class FakeOpenAI:
+    """
+    진단 프롬프트의 평가 기준을 읽어 모든 항목에 score를 매기는 가짜 AsyncOpenAI
+
+    calls에 호출마다 평가한 카테고리 이름을 기록합니다.
+    """
+
+    def __init__(self, score=70, delay=0.0):
+        self.score = score
+        self.delay = delay
+        self.calls = []
+        self.responses = self
+
+    async def create(self, model, input):
+        criteria = json.loads(input[input.index("["):input.index("\n\n제공된")])
+        self.calls.append([category["name"] for category in criteria])
+        await asyncio.sleep(self.delay)
+        categories = [
+            {"id": category["id"], "name": category["name"],
+             "items": [{"id": item["id"], "title": item["title"], "score": self.score} for item in category["items"]]}
+            for category in criteria
+        ]
+
+        class Response:
+            output_text = json.dumps({"categories": categories}, ensure_ascii=False)
+        return Response()
+
+
+@pytest.fixture
+def fake_openai():
+    return FakeOpenAI()
+
+
+KEYWORD_POOL = ["창업", "마케팅", "AI", "헬스케어", "디지털전환", "벤처캐피탈", "브랜딩", "투자", "교육", "바이오", "로봇", "제조"]
+
+
+def fake_vector(text, dim=64):
+    """텍스트별 고정 벡터 (첫 글자가 같은 텍스트끼리 유사)"""
+    own = np.random.default_rng(int(hashlib.md5(text.encode()).hexdigest()[:8], 16)).standard_normal(dim)
+    shared = np.random.default_rng(ord(text[0]) if text else 0).standard_normal(dim)
+    vector = 0.7 * shared + 0.5 * own
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+class FakeEmbeddings:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+
+    def embed_documents(self, texts):
+        return [fake_vector(text) for text in texts]
+
+    def embed_query(self, text):
+        return fake_vector(text)
+
+    async def aembed_documents(self, texts):
+        await asyncio.sleep(self.delay)
+        return self.embed_documents(texts)
+
+
+class FakeKeywordLLM:
+    """보고서 내용에 따라 KEYWORD_POOL에서 키워드 5개를 고르는 가짜 ChatOpenAI"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+
+    def invoke(self, prompt):
+        seed = int(hashlib.md5(prompt.encode()).hexdigest()[:8], 16)
+
+        class Message:
+            content = ", ".join(KEYWORD_POOL[(seed + i * 7) % len(KEYWORD_POOL)] for i in range(5))
+        return Message()
+
+    async def ainvoke(self, prompt):
+        await asyncio.sleep(self.delay)
+        return self.invoke(prompt)
+
+
+def make_experts(count):
+    return [
+        {"id": i, "name": f"전문가{i}", "career": [KEYWORD_POOL[(i * 5 + j) % len(KEYWORD_POOL)] for j in range(3)],
+         "field": {"분야": KEYWORD_POOL[i % len(KEYWORD_POOL)]}, "is_visible": True,
+         "updated_at": f"2026-01-01T00:00:{i % 60:02d}"}
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def expert_matcher(monkeypatch, tmp_path):
+    """
+    가짜 임베딩/LLM과 전문가 200명 카탈로그로 준비된 ExpertMatcher
+
+    services.expert.matcher를 교체하므로 라우터를 통한 요청도 이 매처를 사용합니다.
+    API 호출 지연은 matcher.embeddings.delay / matcher.llm.delay로 조절합니다.
+    """
+    from services import expert
+
+    monkeypatch.setattr(expert, "EXPERT_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(expert, "EXPERT_RELATED_TOP_K", 0)
+    matcher = expert.ExpertMatcher()
+    matcher.embeddings = FakeEmbeddings()
+    matcher.keyword_embeddings.embeddings = matcher.embeddings
+    matcher.llm = FakeKeywordLLM()
+    matcher._set_catalog(matcher._build_catalog(make_experts(200)), save_snapshot=False)
+    monkeypatch.setattr(expert, "matcher", matcher)
+    yield matcher
+    matcher._scoring_executor.shutdown(wait=False)
@@ -0,0 +1,114 @@
+"""
+대량 진단 테스트 (services.diagnosis_bulk)
+"""
+
+import asyncio
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from services import diagnosis, diagnosis_bulk, diagnosis_sections
+from services.diagnosis_bulk import BulkDiagnosisRequest, run_bulk_diagnosis
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def bulk(monkeypatch, fake_supabase):
+    fake_supabase.tables["report_sections"] = [
+        {"report_uuid": report_uuid, "subsection_id": "1-1", "subsection_name": "개요",
+         "content": "<p>같은 본문의 사업계획서</p>", "generation_order": 0}
+        for report_uuid in ("report-a", "report-b")
+    ]
+    for module in (diagnosis, diagnosis_sections):
+        monkeypatch.setattr(module, "get_supabase_client", lambda: fake_supabase)
+    monkeypatch.setattr(diagnosis_bulk.diagnosis_rate_limiter, "limit", 0)
+    monkeypatch.setattr(diagnosis.diagnosis_cache, "_local", type(diagnosis.diagnosis_cache._local)())
+    return fake_supabase
+
+
+def run(fake_openai, report_uuids):
+    request = BulkDiagnosisRequest(items=[{"report_uuid": report_uuid} for report_uuid in report_uuids])
+    return asyncio.run(run_bulk_diagnosis(fake_openai, request))
+
+
+def test_cache_hit_writes_row_linked_to_report(bulk, fake_openai):
+    first = run(fake_openai, ["report-a"])
+    assert first["succeeded"] == 1 and first["saved"] == 1
+    calls = len(fake_openai.calls)
+
+    # report-b는 본문이 같아 캐시 적중이지만 연결된 행이 없으므로 캐시된 결과로 행을 저장
+    second = run(fake_openai, ["report-b"])
+    assert second["success"]
+    assert second["cached"] == 1 and second["saved"] == 1
+    assert len(fake_openai.calls) == calls
+    rows = bulk.tables["diagnosis"]
+    assert [row["report_uuid"] for row in rows] == ["report-a", "report-b"]
+    assert rows[0]["diagnosis_result"]["cache_key"] == rows[1]["diagnosis_result"]["cache_key"]
+
+    # 이미 연결된 행이 있으면 다시 저장하지 않음
+    third = run(fake_openai, ["report-a", "report-b"])
+    assert third["success"] and third["cached"] == 2 and third["saved"] == 0
+    assert len(bulk.tables["diagnosis"]) == 2
+
+
+GEVENT_SCRIPT = textwrap.dedent("""
+    from gevent import monkey
+    monkey.patch_all()
+
+    import sys
+    sys.modules["trio"] = None  # httpcore의 선택적 trio 지원은 gevent가 패치한 select와 호환되지 않음
+    sys.path.insert(0, {repo!r})
+
+    import asyncio, json
+    import gevent
+    from services import diagnosis_bulk
+
+    class Responses:
+        async def create(self, model, input):
+            criteria = json.loads(input[input.index("["):input.index("\\n\\n제공된")])
+            await asyncio.sleep(0.05)
+            await asyncio.to_thread(lambda: None)
+            categories = [
+                {{"id": c["id"], "name": c["name"],
+                  "items": [{{"id": i["id"], "title": i["title"], "score": 70}} for i in c["items"]]}}
+                for c in criteria
+            ]
+            return type("Response", (), {{"output_text": json.dumps({{"categories": categories}})}})()
+
+    class Client:
+        def __init__(self, api_key):
+            self.responses = Responses()
+
+        async def close(self):
+            pass
+
+    diagnosis_bulk.AsyncOpenAI = Client
+    diagnosis_bulk.diagnosis_rate_limiter.limit = 0
+    diagnosis_bulk.insert_diagnosis_records = lambda records: True
+
+    def task(job):
+        request = diagnosis_bulk.BulkDiagnosisRequest(
+            items=[{{"contents": f"작업 {{job}} 보고서 {{i}}"}} for i in range(4)], use_cache=False
+        )
+        return diagnosis_bulk.process_bulk_diagnosis(request)["succeeded"]
+
+    greenlets = [gevent.spawn(task, job) for job in range(3)]
+    gevent.joinall(greenlets)
+    print(json.dumps([g.value if g.successful() else repr(g.exception) for g in greenlets]))
+""")
+
+
+def test_concurrent_bulk_tasks_under_gevent():
+    """gevent 풀처럼 한 스레드의 그린렛 여러 개가 동시에 대량 진단을 실행해도 모두 완료"""
+    pytest.importorskip("gevent")
+    completed = subprocess.run(
+        [sys.executable, "-c", GEVENT_SCRIPT.format(repo=str(REPO_ROOT))],
+        capture_output=True, text=True, timeout=120,
+        env={"OPENAI_API_KEY": "test", "REDIS_URL": "redis://127.0.0.1:1/0", "PATH": ""},
+    )
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.strip().splitlines()[-1] == "[4, 4, 4]"
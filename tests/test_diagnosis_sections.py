@@ -0,0 +1,84 @@
+"""
+저장된 보고서의 섹션 단위 증분 진단 테스트 (/api/diagnosis/report/{report_uuid})
+"""
+
+import asyncio
+
+import pytest
+
+from services import diagnosis, diagnosis_sections
+from services.diagnosis_sections import ReportDiagnosisRequest, combine_sections, run_report_diagnosis
+
+REPORT_UUID = "report-1"
+
+
+def make_sections():
+    names = ["문제 인식", "시장 분석", "제품 개념", "비즈니스 모델", "성장 전략", "팀 구성", "재무 계획"]
+    return [
+        {"report_uuid": REPORT_UUID, "subsection_id": f"1-{i + 1}", "subsection_name": name,
+         "content": f"<p>{name}에 대한 상세 내용입니다. {name * 4}</p>", "generation_order": i}
+        for i, name in enumerate(names)
+    ]
+
+
+@pytest.fixture
+def report(monkeypatch, fake_supabase, fake_openai):
+    sections = make_sections()
+    fake_supabase.tables["report_sections"] = sections
+    for module in (diagnosis, diagnosis_sections):
+        monkeypatch.setattr(module, "get_supabase_client", lambda: fake_supabase)
+        monkeypatch.setattr(module, "get_openai_client", lambda: fake_openai)
+    monkeypatch.setattr(diagnosis, "DIAGNOSIS_WRITE_BEHIND", False)
+    for tiered in (diagnosis.diagnosis_cache, diagnosis_sections.category_cache, diagnosis_sections.report_state_cache):
+        monkeypatch.setattr(tiered, "_local", type(tiered._local)())
+    return sections
+
+
+def diagnose():
+    return asyncio.run(run_report_diagnosis(REPORT_UUID, ReportDiagnosisRequest()))
+
+
+def test_section_scores_are_not_cached_as_whole_document_diagnosis(report, fake_supabase):
+    result = diagnose()
+    assert result.success
+
+    # 같은 텍스트의 전체 문서 진단은 캐시(메모리/DB)에서 부분 텍스트 점수를 받지 않아야 함
+    whole_key = diagnosis.diagnosis_cache_key(combine_sections(report), diagnosis.DEFAULT_EVALUATION_CRITERIA)
+    assert diagnosis.diagnosis_cache.get(whole_key) is None
+    rows = fake_supabase.tables["diagnosis"]
+    assert len(rows) == 1
+    assert rows[0]["report_uuid"] == REPORT_UUID
+    assert rows[0]["diagnosis_result"]["cache_key"] != whole_key
+    assert diagnosis.load_stored_diagnosis(whole_key) is None
+
+
+def test_unchanged_rerun_writes_no_new_row(report, fake_supabase, fake_openai):
+    first = diagnose()
+    calls = len(fake_openai.calls)
+    second = diagnose()
+
+    assert second.success and second.cached
+    assert second.reevaluated_categories == []
+    assert second.changed_sections == []
+    assert second.score_average == first.score_average
+    assert len(fake_openai.calls) == calls
+    assert len(fake_supabase.tables["diagnosis"]) == 1
+
+
+def test_edited_section_reevaluates_and_saves(report, fake_supabase):
+    diagnose()
+    report[2]["content"] = "<p>수정된 제품 개념 설명</p>"
+    result = diagnose()
+
+    assert result.changed_sections == ["1-3"]
+    assert result.reevaluated_categories
+    assert len(fake_supabase.tables["diagnosis"]) == 2
+
+
+def test_deleted_section_is_reported_as_changed(report):
+    diagnose()
+    del report[4]
+    result = diagnose()
+
+    assert result.success
+    assert result.changed_sections == ["1-5"]
@@ -0,0 +1,42 @@
+"""
+매칭 상세 개수 제한(max_details_per_expert)과 전체 상세 조회 테스트
+"""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routers import expert
+
+
+def make_client():
+    app = FastAPI()
+    app.include_router(expert.router)
+    return TestClient(app)
+
+
+def test_rerank_does_not_overwrite_original_match_details(expert_matcher):
+    client = make_client()
+    body = {"business_report": "AI 헬스케어 창업", "similarity_threshold": 0.3, "top_k": 20,
+            "similarity_floor": 0.2, "max_details_per_expert": 1}
+    matched = client.post("/api/expert/match", json=body).json()
+    result_id = matched["result_id"]
+    assert matched["details_id"] == result_id
+    original = client.get(f"/api/expert/match/{matched['details_id']}/details").json()
+    assert len(original["experts"]) == 20
+
+    reranked = client.post("/api/expert/match/rerank", json={
+        "result_id": result_id, "similarity_threshold": 0.6, "top_k": 5, "max_details_per_expert": 1
+    }).json()
+    assert reranked["result_id"] == result_id
+    assert reranked["details_id"] != result_id
+
+    # 원래 /match 응답의 상세는 그대로 남고, 재랭킹 상세는 자기 details_id로 조회됨
+    assert client.get(f"/api/expert/match/{matched['details_id']}/details").json() == original
+    rerank_details = client.get(f"/api/expert/match/{reranked['details_id']}/details").json()
+    assert [entry["이름"] for entry in rerank_details["experts"]] == [
+        entry["이름"] for entry in reranked["final_ranking"]
+    ]
+
+
+def test_details_unknown_id_returns_404(expert_matcher):
+    assert make_client().get("/api/expert/match/missing/details").status_code == 404
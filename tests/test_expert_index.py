@@ -0,0 +1,48 @@
+"""
+어휘 단위 스코어링(ExpertItemIndex) 테스트
+
+어휘 행렬 검색 후 fan_out으로 항목에 펼친 결과가 항목별 임베딩으로 직접 계산한 결과와 같은지 확인합니다.
+"""
+
+import numpy as np
+import pytest
+
+from tests.conftest import fake_vector
+
+KEYWORDS = ["AI", "헬스케어", "창업", "마케팅 전략", "로봇"]
+
+
+def score_per_item(catalog, keyword_embeddings, similarity_threshold):
+    """어휘 중복 제거 이전 방식: 전체 항목 임베딩 행렬로 직접 스코어링"""
+    item_matrix = np.asarray(catalog.index.matrix, dtype=np.float32)[catalog.index.item_vocab]
+    sims = keyword_embeddings @ item_matrix.T
+    keyword_idx, item_idx = np.nonzero(sims >= similarity_threshold)
+    return catalog.index.aggregate(keyword_idx, item_idx, sims[keyword_idx, item_idx])
+
+
+@pytest.mark.parametrize("similarity_threshold", [0.3, 0.5, 0.7])
+def test_vocabulary_fan_out_matches_per_item_scoring(expert_matcher, similarity_threshold):
+    catalog = expert_matcher.catalog
+    # 200명 카탈로그는 같은 경력/분야 문자열을 여러 전문가가 공유함
+    assert len(catalog.vocab) < len(catalog.all_items)
+    keyword_embeddings = np.asarray([fake_vector(keyword) for keyword in KEYWORDS], dtype=np.float32)
+
+    expected = score_per_item(catalog, keyword_embeddings, similarity_threshold)
+    actual = catalog.index.score(keyword_embeddings, similarity_threshold)
+
+    assert [(expert_idx, count) for expert_idx, count, _ in actual] == \
+        [(expert_idx, count) for expert_idx, count, _ in expected]
+    for (_, _, hits), (_, _, expected_hits) in zip(actual, expected):
+        assert [(k, i) for k, i, _ in hits] == [(k, i) for k, i, _ in expected_hits]
+        np.testing.assert_allclose([s for _, _, s in hits], [s for _, _, s in expected_hits], atol=1e-6)
+
+
+def test_batch_scoring_matches_single_report_scoring(expert_matcher):
+    index = expert_matcher.catalog.index
+    union = np.asarray([fake_vector(keyword) for keyword in KEYWORDS], dtype=np.float32)
+    groups = [[0, 1, 2], [3, 4], [2, 0]]
+
+    batch = index.score_batch(union, groups, 0.4)
+
+    for group, result in zip(groups, batch):
+        assert result == index.score(union[group], 0.4)
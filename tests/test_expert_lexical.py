@@ -0,0 +1,51 @@
+"""
+어휘 n-gram 역색인(LexicalIndex)과 사전 필터 테스트
+"""
+
+from services import expert
+from services.expert_lexical import LexicalIndex
+
+VOCAB = ["retail 유통 컨설팅", "Generative AI 연구", "AI 헬스케어", "디지털전환 컨설팅", "기업 디지털 전환 전략", "마케팅"]
+
+
+def matched(index, keywords):
+    keyword_idx, vocab_idx = index.match(keywords)
+    return [(keywords[k], VOCAB[v]) for k, v in zip(keyword_idx.tolist(), vocab_idx.tolist())]
+
+
+def test_ascii_keyword_matches_only_on_word_boundary():
+    index = LexicalIndex(VOCAB)
+
+    assert matched(index, ["AI"]) == [("AI", "Generative AI 연구"), ("AI", "AI 헬스케어")]
+    assert matched(index, ["tail"]) == []
+    assert matched(index, ["Retail"]) == [("Retail", "retail 유통 컨설팅")]
+
+
+def test_korean_keyword_matches_spacing_variants():
+    index = LexicalIndex(VOCAB)
+
+    expected = ["디지털전환 컨설팅", "기업 디지털 전환 전략"]
+    assert [item for _, item in matched(index, ["디지털 전환"])] == expected
+    assert [item for _, item in matched(index, ["디지털전환"])] == expected
+
+
+def test_candidates_share_an_ngram_with_a_keyword():
+    index = LexicalIndex(VOCAB)
+
+    assert [VOCAB[row] for row in index.candidates(["컨설팅"])] == ["retail 유통 컨설팅", "디지털전환 컨설팅"]
+    assert not len(index.candidates(["로봇"]))
+
+
+def test_prefilter_falls_back_to_exhaustive_when_candidates_are_few(expert_matcher, monkeypatch):
+    catalog = expert_matcher.catalog
+
+    # 카탈로그 어휘와 글자를 공유하지 않는 키워드 → 후보 부족으로 전체 검색
+    match_mode, candidates, _ = expert_matcher._plan_lexical(catalog, ["quantum"], "prefilter")
+    assert (match_mode, candidates) == ("exhaustive", None)
+
+    monkeypatch.setattr(expert, "EXPERT_PREFILTER_MIN_CANDIDATES", 1)
+    match_mode, candidates, exact_hits = expert_matcher._plan_lexical(catalog, ["헬스케어"], "prefilter")
+    assert match_mode == "prefilter"
+    assert [catalog.vocab[row] for row in candidates] == ["헬스케어"]
+    assert [catalog.vocab[row] for row in exact_hits[1]] == ["헬스케어"]
+
@@ -0,0 +1,48 @@
+"""
+전문가 카탈로그 증분 갱신(refresh_catalog) 테스트
+
+변경 감지 기준값(watermark)과 같은 시각이거나, 이전 갱신 뒤에 늦게 커밋된 행도 반영되는지 확인합니다.
+"""
+
+import pytest
+
+from services import expert
+from tests.conftest import make_experts
+
+
+@pytest.fixture
+def catalog_table(expert_matcher, fake_supabase):
+    fake_supabase.tables[expert.EXPERT_TABLE] = [dict(row) for row in make_experts(200)]
+    expert_matcher._supabase = fake_supabase
+    return fake_supabase.tables[expert.EXPERT_TABLE]
+
+
+def update_row(table, expert_id, **changes):
+    row = next(row for row in table if row["id"] == expert_id)
+    row.update(changes)
+
+
+def test_unchanged_rows_in_overlap_window_do_not_rebuild_catalog(expert_matcher, catalog_table):
+    current = expert_matcher.catalog
+
+    assert expert_matcher.refresh_catalog() is False
+    assert expert_matcher.catalog is current
+
+
+def test_row_sharing_the_watermark_timestamp_is_applied(expert_matcher, catalog_table):
+    watermark = expert_matcher.catalog.watermark
+    update_row(catalog_table, 3, career=["양자컴퓨팅"], updated_at=watermark)
+
+    assert expert_matcher.refresh_catalog() is True
+    assert expert_matcher.catalog.experts[3]["career"] == ["양자컴퓨팅"]
+
+
+def test_late_committed_row_behind_the_watermark_is_applied(expert_matcher, catalog_table):
+    # 이전 갱신 뒤에 커밋되었지만 updated_at은 watermark보다 이전인 행
+    update_row(catalog_table, 7, career=["우주항공"], updated_at="2026-01-01T00:00:01")
+    update_row(catalog_table, 8, is_visible=False, updated_at="2026-01-01T00:00:02")
+
+    assert expert_matcher.refresh_catalog() is True
+    experts = {row["id"]: row for row in expert_matcher.catalog.experts}
+    assert experts[7]["career"] == ["우주항공"]
+    assert 8 not in experts
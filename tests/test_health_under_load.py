@@ -0,0 +1,78 @@
+"""
+동시 매칭 부하 중 /health 응답성 테스트
+
+키워드 추출(LLM)과 임베딩 호출에 지연을 둔 가짜 클라이언트로 매칭 20건을 동시에 실행하면서
+/health를 반복 호출합니다. 매칭의 외부 호출 대기와 유사도 계산이 이벤트 루프를 막지 않으면
+LLM 호출이 동시에 진행되고, 그동안에도 /health가 응답합니다.
+
+실행 환경 부하에 따라 달라지는 절대 시간 대신 LLM 호출 동시 실행 수, LLM 대기 중 완료된
+/health 응답 수, LLM 지연 대비 /health 최대 지연으로 판정합니다.
+"""
+
+import asyncio
+import time
+
+import httpx
+
+from main import app
+
+PARALLEL_MATCHES = 20
+LLM_DELAY = 1.0
+EMBEDDING_DELAY = 0.1
+
+
+def test_health_stays_responsive_during_parallel_matches(expert_matcher):
+    expert_matcher.llm.delay = LLM_DELAY
+    expert_matcher.embeddings.delay = EMBEDDING_DELAY
+    llm_calls = {"in_flight": 0, "peak": 0}
+    ainvoke = expert_matcher.llm.ainvoke
+
+    async def tracked_ainvoke(prompt):
+        llm_calls["in_flight"] += 1
+        llm_calls["peak"] = max(llm_calls["peak"], llm_calls["in_flight"])
+        try:
+            return await ainvoke(prompt)
+        finally:
+            llm_calls["in_flight"] -= 1
+
+    expert_matcher.llm.ainvoke = tracked_ainvoke
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=60) as client:
+            done = asyncio.Event()
+
+            async def match(i):
+                response = await client.post("/api/expert/match", json={
+                    "business_report": f"보고서 {i}: AI 헬스케어 창업 아이템", "top_k": 5
+                })
+                return response.status_code
+
+            async def run_matches():
+                try:
+                    return await asyncio.gather(*[match(i) for i in range(PARALLEL_MATCHES)])
+                finally:
+                    done.set()
+
+            async def poll_health():
+                latencies, during_llm_calls = [], 0
+                while not done.is_set():
+                    start = time.perf_counter()
+                    response = await client.get("/health")
+                    latencies.append(time.perf_counter() - start)
+                    assert response.status_code == 200
+                    # LLM 호출을 기다리는 매칭이 있는 동안 완료된 /health 응답
+                    if llm_calls["in_flight"]:
+                        during_llm_calls += 1
+                    await asyncio.sleep(0.02)
+                return latencies, during_llm_calls
+
+            return await asyncio.gather(run_matches(), poll_health())
+
+    statuses, (latencies, health_during_llm_calls) = asyncio.run(scenario())
+
+    assert statuses == [200] * PARALLEL_MATCHES
+    # 이벤트 루프를 막으면 LLM 호출이 하나씩 진행되고 그동안 /health도 응답하지 못함
+    assert llm_calls["peak"] >= PARALLEL_MATCHES // 2
+    assert health_during_llm_calls >= 3
+    assert max(latencies) < LLM_DELAY
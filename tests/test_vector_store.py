@@ -0,0 +1,90 @@
+"""
+압축 벡터 저장소(VectorStore) 테스트
+
+- 압축 유사도 오차가 error_bounds 이내인지
+- 재채점 결과가 float32 검색과 같은지
+- 디스크 캐시 행렬이면 압축 행렬도 memory-map 캐시 파일로 공유하는지
+"""
+
+import numpy as np
+import pytest
+
+from services.expert_index import l2_normalize
+from services.vector_store import VectorStore, compressed_cache_paths
+from tests.conftest import KEYWORD_POOL, fake_vector
+
+
+DIM = 64
+
+
+def make_matrix(rows=2000):
+    """KEYWORD_POOL 키워드 벡터 주변에 모인 어휘 행렬 (키워드와 유사도가 높은 행이 섞여 있음)"""
+    rng = np.random.default_rng(0)
+    topics = make_queries()
+    noise = 0.9 / np.sqrt(DIM) * rng.standard_normal((rows, DIM))
+    return l2_normalize(topics[rng.integers(0, len(topics), rows)] + noise)
+
+
+def make_queries():
+    return l2_normalize(np.asarray([fake_vector(keyword, DIM) for keyword in KEYWORD_POOL]))
+
+
+def pairs(result):
+    return list(zip(result[0].tolist(), result[1].tolist()))
+
+
+@pytest.mark.parametrize("dtype", ["float16", "int8"])
+def test_compressed_similarity_error_within_bound(dtype):
+    matrix, queries = make_matrix(), make_queries()
+    store = VectorStore(matrix, dtype)
+
+    error = np.abs(queries @ store.rows(0, len(store)).T - queries @ matrix.T)
+
+    assert (error.max(axis=1) <= store.error_bounds(queries)).all()
+
+
+@pytest.mark.parametrize("dtype", ["float16", "int8"])
+@pytest.mark.parametrize("similarity_threshold", [0.7, 0.8])
+def test_rescored_search_matches_float32(dtype, similarity_threshold):
+    matrix, queries = make_matrix(), make_queries()
+    expected = VectorStore(matrix, "float32").search(queries, similarity_threshold)
+    assert len(expected[0])
+
+    actual = VectorStore(matrix, dtype).search(queries, similarity_threshold)
+
+    assert pairs(actual) == pairs(expected)
+    np.testing.assert_allclose(actual[2], expected[2], atol=1e-6)
+
+
+def test_candidate_search_is_full_search_restricted_to_candidates():
+    matrix, queries = make_matrix(), make_queries()
+    store = VectorStore(matrix, "int8", rescore=False)
+    candidates = np.arange(0, len(matrix), 3)
+
+    full = store.search(queries, 0.7)
+    restricted = store.search(queries, 0.7, candidates=candidates)
+
+    assert pairs(restricted) == [(q, r) for q, r in pairs(full) if r % 3 == 0]
+
+
+@pytest.mark.parametrize("dtype", ["float16", "int8"])
+def test_compressed_matrix_is_memory_mapped_from_disk_cache(tmp_path, dtype):
+    cache_path = tmp_path / "vocab_test.npy"
+    np.save(cache_path, make_matrix())
+    matrix = np.load(cache_path, mmap_mode="r")
+
+    store = VectorStore(matrix, dtype, rescore=False)
+
+    data_path, scale_path = compressed_cache_paths(cache_path, dtype)
+    assert data_path.exists() and (scale_path is None or scale_path.exists())
+    assert isinstance(store.data, np.memmap)
+    assert store.reference is None
+    footprint = store.memory_footprint()
+    assert footprint["vector_memory_mapped"] and footprint["in_memory_bytes"] == 0
+    assert footprint["reference_bytes"] == 0
+
+    # 다른 작업 프로세스는 같은 캐시 파일을 다시 열고, 재채점 시에만 float32 원본을 보관
+    reopened = VectorStore(matrix, dtype, rescore=True)
+    np.testing.assert_array_equal(reopened.data, store.data)
+    assert reopened.memory_footprint()["reference_bytes"] == matrix.nbytes
+    assert reopened.memory_footprint()["in_memory_bytes"] == 0
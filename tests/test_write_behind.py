@@ -0,0 +1,134 @@
+"""
+WriteBehindQueue 테스트
+
+DB가 계속 거부하는 레코드(예: report_uuid 외래 키 위반)가 있어도 나머지 레코드는 저장되고,
+거부된 레코드만 dead-letter로 옮겨지는지 확인합니다.
+"""
+
+import json
+import threading
+import time
+
+import pytest
+
+from services.write_behind import WriteBehindQueue
+
+
+class PermanentError(Exception):
+    """제약 조건 위반처럼 다시 보내도 실패하는 오류"""
+
+
+class FakeTable:
+    """id가 rejected에 있으면 배치 전체를 거부하고, down이면 연결 오류를 내는 저장소"""
+
+    def __init__(self, rejected=()):
+        self.rejected = set(rejected)
+        self.down = False
+        self.rows = []
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def write(self, records):
+        with self.lock:
+            self.calls += 1
+            if self.down:
+                raise ConnectionError("connection refused")
+            bad = [record["id"] for record in records if record["id"] in self.rejected]
+            if bad:
+                raise PermanentError(f"foreign key violation: {bad}")
+            self.rows.extend(record["id"] for record in records)
+
+
+def make_queue(table, tmp_path, **kwargs):
+    options = dict(
+        batch_size=50, flush_interval=0.05, max_retries=2, retry_backoff=0.01,
+        spool_retry_interval=0.2, is_transient=lambda error: not isinstance(error, PermanentError)
+    )
+    options.update(kwargs)
+    return WriteBehindQueue("test-writer", table.write, tmp_path, **options)
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def dead_letters(tmp_path):
+    return [json.loads(line) for path in tmp_path.glob("dead-*.jsonl") for line in path.read_text().splitlines()]
+
+
+def test_poison_record_is_dead_lettered_and_good_records_are_written(tmp_path):
+    table = FakeTable(rejected={"poison"})
+    queue = make_queue(table, tmp_path)
+    try:
+        queue.enqueue({"id": "poison"})
+        for i in range(20):
+            queue.enqueue({"id": f"good-{i}"})
+        assert wait_until(lambda: len(table.rows) == 20 and queue.stats()["dead_lettered"] == 1)
+
+        # 불량 레코드 이후에 들어온 레코드도 계속 저장됨
+        for i in range(20, 30):
+            queue.enqueue({"id": f"good-{i}"})
+        assert wait_until(lambda: len(table.rows) == 30)
+    finally:
+        queue.stop()
+
+    stats = queue.stats()
+    assert sorted(table.rows) == sorted(f"good-{i}" for i in range(30))
+    assert stats["available"] is True
+    assert stats["spooled"] == 0
+    assert stats["spool_files"] == 0
+    letters = dead_letters(tmp_path)
+    assert [letter["record"]["id"] for letter in letters] == ["poison"]
+    assert "foreign key violation" in letters[0]["error"]
+
+
+def test_transient_failure_spools_and_replays_after_recovery(tmp_path):
+    table = FakeTable()
+    table.down = True
+    queue = make_queue(table, tmp_path)
+    try:
+        for i in range(10):
+            queue.enqueue({"id": f"r-{i}"})
+        assert wait_until(lambda: queue.stats()["spooled"] == 10)
+        assert queue.stats()["available"] is False
+        assert queue.stats()["dead_lettered"] == 0
+
+        table.down = False
+        assert wait_until(lambda: len(table.rows) == 10 and queue.stats()["spool_files"] == 0)
+    finally:
+        queue.stop()
+
+    assert sorted(table.rows) == sorted(f"r-{i}" for i in range(10))
+    assert queue.stats()["replayed"] == 10
+
+
+def test_replay_isolates_poison_record_in_spool(tmp_path):
+    table = FakeTable(rejected={"poison"})
+    records = [{"id": f"old-{i}"} for i in range(5)] + [{"id": "poison"}] + [{"id": f"old-{i}"} for i in range(5, 10)]
+    (tmp_path / "spool-other-1.jsonl").write_text("".join(json.dumps(record) + "\n" for record in records))
+
+    queue = make_queue(table, tmp_path, batch_size=4)
+    try:
+        queue.start()
+        assert wait_until(lambda: len(table.rows) == 10 and queue.stats()["spool_files"] == 0)
+    finally:
+        queue.stop()
+
+    assert sorted(table.rows) == sorted(f"old-{i}" for i in range(10))
+    assert [letter["record"]["id"] for letter in dead_letters(tmp_path)] == ["poison"]
+    assert queue.stats()["available"] is True
+
+
+def test_diagnosis_write_error_classification():
+    exceptions = pytest.importorskip("postgrest.exceptions")
+    from services.diagnosis import is_transient_write_error
+
+    assert not is_transient_write_error(exceptions.APIError({"code": "23503", "message": "fk violation"}))
+    assert not is_transient_write_error(exceptions.APIError({"code": "PGRST204", "message": "column not found"}))
+    assert is_transient_write_error(exceptions.APIError({"code": "PGRST003", "message": "pool timeout"}))
+    assert is_transient_write_error(ConnectionError("connection refused"))